@@ -0,0 +1,81 @@
+"""What crash-safe writes cost per write in LocalJSONBackend.
+
+Each scale's milk sales file is rewritten in three ways:
+  direct  - open the file with 'w' and dump into it (the old, torn-on-power-cut write)
+  atomic  - ``_write_json``: temp file, fsync, keep a backup, rename, fsync the directory
+  group   - ``--group`` writes inside one ``group_commit()``, reported per write
+
+Run from the repository root:
+    python -m benchmarks.bench_durability [--scales small medium] [--repeat 5] [--group 10]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from benchmarks.synthetic_data import generate, write_local
+from benchmarks.bench_scale import SCALES, best_of
+
+KEY = "milk_sales"
+
+
+def write_cases(dm, group: int) -> Dict[str, tuple]:
+    """``mode -> (fn, writes per call)``."""
+    data = dm._read_json(KEY)
+    path = dm.files[KEY]
+
+    def direct():
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def grouped():
+        with dm.group_commit():
+            for _ in range(group):
+                dm._write_json(KEY, data)
+
+    return {
+        "direct": (direct, 1),
+        "atomic": (lambda: dm._write_json(KEY, data), 1),
+        "group": (grouped, group),
+    }
+
+
+def run(scales: List[str], repeat: int, group: int, seed: int = 42) -> List[Dict]:
+    results = []
+    for scale in scales:
+        data_dir = tempfile.mkdtemp(prefix=f"bench_durability_{scale}_")
+        try:
+            dm = write_local(generate(seed=seed, **SCALES[scale]), data_dir)
+            size = os.path.getsize(dm.files[KEY])
+            baseline = None
+            for mode, (fn, writes) in write_cases(dm, group).items():
+                per_write = best_of(fn, repeat) / writes
+                baseline = baseline or per_write
+                results.append({"scale": scale, "mode": mode, "bytes": size, "seconds_per_write": per_write,
+                                "overhead": per_write / baseline})
+                print(f"{scale:<7} {size / 1e6:7.1f} MB  {mode:<7} {per_write * 1000:9.2f} ms/write  x{per_write / baseline:5.2f}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--group", type=int, default=10, help="writes batched into one group commit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat, args.group, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
@@ -0,0 +1,137 @@
+"""Measure what starting the app in local mode imports, with ``python -X importtime``.
+
+The startup set is read from ``src/app.py`` itself: its top-level imports plus the
+default (first) section's tab module. Each other tab is measured as the extra
+imports paid the first time it is opened. Every target runs in a fresh interpreter
+``--repeat`` times and the fastest run counts. A target over its ``total_ms`` budget
+in ``import_budgets.json``, or one that loads a module listed under ``forbidden``,
+fails the run.
+
+Run from the repository root:
+    python -m benchmarks.bench_imports [--repeat 5] [--top 10] [--out FILE]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+APP_PATH = os.path.join(parent_dir, "src", "app.py")
+BUDGETS_PATH = os.path.join(current_dir, "import_budgets.json")
+MARKER = "--- measured imports ---"
+
+
+def _app_imports(app_path: str):
+    """Module-level imports of ``app.py`` and the tab module names in its SECTIONS."""
+    with open(app_path) as f:
+        tree = ast.parse(f.read())
+    modules, tabs = [], []
+    # Top-level statements only: imports inside functions happen on first use
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+        elif isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "SECTIONS" for t in node.targets):
+            tabs = [f"src.tabs.{name}" for name in ast.literal_eval(node.value).values()]
+    return modules, tabs
+
+
+def startup_modules(app_path: str = APP_PATH) -> List[str]:
+    """Modules ``app.py`` imports at module level, then the tab module of its first section."""
+    modules, tabs = _app_imports(app_path)
+    return modules + tabs[:1]
+
+
+def tab_modules(app_path: str = APP_PATH) -> List[str]:
+    return _app_imports(app_path)[1]
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """``-X importtime`` lines after the marker, as ``{"module", "self_us", "cumulative_us", "depth"}``."""
+    rows, measuring = [], MARKER not in stderr
+    for line in stderr.splitlines():
+        if line == MARKER:
+            measuring = True
+            continue
+        if not measuring or not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        stripped = name.lstrip()
+        rows.append({"module": stripped.rstrip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                     "depth": (len(name) - len(stripped) - 1) // 2})
+    return rows
+
+
+def measure(modules: List[str], preload: List[str] = ()) -> List[Dict]:
+    """Import ``modules`` in a fresh interpreter after ``preload``; only the former are reported."""
+    code = "; ".join([f"import {m}" for m in preload] + [f"import sys; sys.stderr.write({MARKER!r} + '\\n')"]
+                     + [f"import {m}" for m in modules])
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=parent_dir,
+                         capture_output=True, text=True)
+    if out.returncode:
+        raise RuntimeError(f"importing {modules} failed:\n{out.stderr[-2000:]}")
+    return parse_importtime(out.stderr)
+
+
+def run(repeat: int) -> Dict[str, Dict]:
+    startup = startup_modules()
+    targets = {"startup": (startup, [])}
+    for module in tab_modules():
+        if module not in startup:
+            targets[f"tab:{module.rsplit('.', 1)[1]}"] = ([module], startup)
+
+    results = {}
+    for name, (modules, preload) in targets.items():
+        best = min((measure(modules, preload) for _ in range(repeat)), key=lambda rows: sum(r["self_us"] for r in rows))
+        results[name] = {
+            "total_ms": sum(r["self_us"] for r in best) / 1000,
+            "modules": sorted(r["module"] for r in best),
+            "top": sorted(({"module": r["module"], "cumulative_ms": r["cumulative_us"] / 1000}
+                           for r in best if r["depth"] == 0), key=lambda r: -r["cumulative_ms"]),
+        }
+    return results
+
+
+def check_budgets(results: Dict[str, Dict], budgets: Dict) -> List[str]:
+    """``budgets`` maps a target (or ``default``) to ``total_ms`` and ``forbidden`` top-level packages."""
+    failures = []
+    for name, r in results.items():
+        limits = budgets.get(name, budgets.get("default", {}))
+        limit = limits.get("total_ms")
+        if limit is not None and r["total_ms"] > limit:
+            failures.append(f"{name}: {r['total_ms']:.1f} ms > budget {limit} ms")
+        for package in limits.get("forbidden", []):
+            hits = sorted(m for m in r["modules"] if m == package or m.startswith(package + "."))
+            if hits:
+                failures.append(f"{name}: imports {package} ({', '.join(hits[:3])})")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list per target")
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    for name, r in results.items():
+        print(f"{name:<16} {r['total_ms']:8.1f} ms  {len(r['modules']):4d} modules")
+        for row in r["top"][:args.top]:
+            print(f"    {row['module']:<40} {row['cumulative_ms']:8.1f} ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+    with open(args.budgets) as f:
+        failures = check_budgets(results, json.load(f))
+    for failure in failures:
+        print(f"OVER BUDGET  {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,87 @@
+"""Time the reports engine at 10k, 100k and 1M rows.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports_engine [--rows 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src import reports_engine
+
+
+def make_frames(rows: int, seed: int = 42):
+    """Columnar sales/expenses/yields/events with ``rows`` sales over ~5 years."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2020-01-01", periods=5 * 365, freq="D").strftime("%Y-%m-%d").to_numpy()
+    buyers = np.array([f"Buyer {i:03d}" for i in range(200)])
+    cows = np.array([f"Cow {i:02d}" for i in range(40)])
+
+    quantity = rng.gamma(4.0, 1.0, rows).round(1)
+    rate = rng.choice([45.0, 48.0, 50.0, 55.0], rows)
+    sales = pd.DataFrame({
+        "date": rng.choice(days, rows),
+        "buyer_name": rng.choice(buyers, rows),
+        "quantity": quantity,
+        "rate": rate,
+        "total_amount": quantity * rate,
+    })
+    n_small = max(rows // 10, 1)
+    expenses = pd.DataFrame({
+        "date": rng.choice(days, n_small),
+        "amount": rng.uniform(50, 5000, n_small).round(2),
+        "cow_id": np.where(rng.random(n_small) < 0.3, rng.choice(cows, n_small), None),
+    })
+    yields = pd.DataFrame({
+        "date": rng.choice(days, n_small),
+        "quantity": rng.uniform(50, 150, n_small).round(1),
+    })
+    events = pd.DataFrame({
+        "date": rng.choice(days, n_small),
+        "cow_id": rng.choice(cows, n_small),
+        "event_type": rng.choice(["Yield", "Vaccination", "Doctor Visit"], n_small, p=[0.8, 0.1, 0.1]),
+        "value": [f"{v:.1f}L" for v in rng.uniform(5, 20, n_small)],
+    })
+    return sales, expenses, yields, events
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows_list, repeat: int):
+    results = []
+    for rows in rows_list:
+        sales, expenses, yields, events = make_frames(rows)
+        start, end = "2022-01-01", "2022-12-31"
+        cases = {
+            "daily_summary": lambda: reports_engine.daily_summary(sales, expenses, yields, start, end),
+            "monthly_summary": lambda: reports_engine.monthly_summary(sales, expenses, yields),
+            "buyer_summary": lambda: reports_engine.buyer_summary(sales, start, end),
+            "cow_summary": lambda: reports_engine.cow_summary(events, expenses, start, end),
+        }
+        for name, fn in cases.items():
+            seconds = best_of(fn, repeat)
+            results.append({"rows": rows, "report": name, "seconds": seconds})
+            print(f"{rows:>9,} rows  {name:<16} {seconds * 1000:9.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,233 @@
+"""Time every DataManager operation and report computation on synthetic data at several scales.
+
+Run from the repository root:
+    python -m benchmarks.bench_scale [--scales small medium large] [--repeat 3] [--layout partitioned] [--out FILE]
+    python -m benchmarks.bench_scale --compare OLD.json NEW.json [--threshold 1.25]
+
+Results are written as JSON (by default to ``benchmarks/results/``) so runs can be
+compared; ``--compare`` lists operations that got slower and exits non-zero if any did.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from benchmarks.synthetic_data import generate, write_local
+from src import reports_engine
+from src.dashboard_metrics import compute_dashboard_metrics
+from src.partitioned_backend import PartitionedJSONBackend
+from src.models import Expense, Buyer, MilkSale, Payment, Cow, CowEvent, DailyYield
+from src.unit_of_work import METHOD_SUFFIX
+
+SCALES = {
+    "small": dict(years=1, buyers=20, cows=10),
+    "medium": dict(years=2, buyers=60, cows=20),
+    "large": dict(years=5, buyers=200, cows=40),
+}
+RESULTS_DIR = os.path.join(current_dir, "results")
+# Ignore slowdowns smaller than this; they are timer noise on fast operations
+MIN_DELTA_SECONDS = 0.0005
+
+PROBES = {
+    "expenses": Expense(date="2021-06-01", name="Bench", description="", amount=1.0, id="bench"),
+    "milk_sales": MilkSale(date="2021-06-01", buyer_name="Buyer 000", quantity=1.0, rate=50.0, total_amount=50.0, id="bench"),
+    "daily_yields": DailyYield(date="2021-06-01", quantity=1.0, notes="", id="bench"),
+    "payments": Payment(date="2021-06-01", buyer_name="Buyer 000", entry_type="Payment", amount=1.0, notes="", id="bench"),
+    "cows": Cow(name="Bench", breed="HF", notes="", id="bench"),
+    "cow_events": CowEvent(date="2021-06-01", cow_id="Cow 00", event_type="Other", value="x", id="bench"),
+}
+
+
+def best_of(fn: Callable, repeat: int, setup: Optional[Callable] = None, teardown: Optional[Callable] = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        if teardown:
+            teardown()
+    return min(timings)
+
+
+def case(fn: Callable, setup: Optional[Callable] = None, teardown: Optional[Callable] = None) -> tuple:
+    return fn, setup, teardown
+
+
+def operation_cases(dm, day: str) -> Dict[str, tuple]:
+    """``name -> (fn, setup, teardown)``; write cases leave the data as they found it."""
+    cases = {}
+    for collection, suffix in METHOD_SUFFIX.items():
+        probe = PROBES[collection]
+        add, update, delete = (getattr(dm, f"{kind}_{suffix}") for kind in ("add", "update", "delete"))
+        cases[f"get_{collection}"] = case(getattr(dm, f"get_{collection}"))
+        cases[f"add_{suffix}"] = case(lambda add=add, p=probe: add(p), teardown=lambda delete=delete: delete("bench"))
+        cases[f"update_{suffix}"] = case(lambda update=update, p=probe: update(p), lambda add=add, p=probe: add(p),
+                                         lambda delete=delete: delete("bench"))
+        cases[f"delete_{suffix}"] = case(lambda delete=delete: delete("bench"), lambda add=add, p=probe: add(p))
+
+    bench_buyer = Buyer(name="Bench Buyer", default_rate=50.0)
+    cases["get_buyers"] = case(dm.get_buyers)
+    cases["add_buyer"] = case(lambda: dm.add_buyer(bench_buyer), teardown=lambda: dm.delete_buyer(bench_buyer.name))
+    cases["update_buyer"] = case(lambda: dm.update_buyer(bench_buyer.name, 51.0), lambda: dm.add_buyer(bench_buyer),
+                                 lambda: dm.delete_buyer(bench_buyer.name))
+    cases["delete_buyer"] = case(lambda: dm.delete_buyer(bench_buyer.name), lambda: dm.add_buyer(bench_buyer))
+
+    def delete_all(collection, ids):
+        def run():
+            with dm.unit_of_work() as uow:
+                for record_id in ids:
+                    uow.delete(collection, record_id)
+        return run
+
+    # A whole day of sales, and a cow event with its expense, each as one write
+    day_sales = [MilkSale(date=day, buyer_name=b.name, quantity=2.0, rate=b.default_rate,
+                          total_amount=2.0 * b.default_rate, id=f"bench-{i}") for i, b in enumerate(dm.get_buyers())]
+    cases["add_milk_sales_day"] = case(lambda: dm.add_milk_sales(day_sales),
+                                       teardown=delete_all("milk_sales", [s.id for s in day_sales]))
+
+    def event_with_expense():
+        with dm.unit_of_work() as uow:
+            uow.add("cow_events", PROBES["cow_events"])
+            uow.add("expenses", PROBES["expenses"])
+
+    def clear_probes():
+        with dm.unit_of_work() as uow:
+            uow.delete("cow_events", "bench")
+            uow.delete("expenses", "bench")
+    cases["unit_of_work_event_expense"] = case(event_with_expense, teardown=clear_probes)
+
+    def cold():
+        # Forget derived indexes and memos so the next call rebuilds them
+        dm._derived.clear()
+        dm._memos.clear()
+    cases["build_balance_ledger"] = case(dm.get_balance_ledger, cold)
+    cases["build_statement_index"] = case(dm.get_statement_index, cold)
+    cases["build_due_date_index"] = case(dm.get_due_date_index, cold)
+    cases["build_date_presence"] = case(lambda: dm.get_date_presence_index().get("milk_sales"), cold)
+    cases["build_buyer_search"] = case(dm.get_buyer_search_index, cold)
+
+    # A month of sales, as the reports read for their default range
+    cases["get_range_month"] = case(lambda: dm.get_range("milk_sales", day[:8] + "01", day))
+    cases["get_month_totals"] = case(lambda: dm.get_month_totals("milk_sales"))
+    # Month totals in a new session: the numeric history is reopened from its file, not rebuilt
+    cases["get_month_totals_reopen"] = case(lambda: dm.get_month_totals("milk_sales"), cold)
+    return cases
+
+
+def report_cases(dm, start: str, end: str, today: date) -> Dict[str, tuple]:
+    sales, expenses, yields, events = dm.get_milk_sales(), dm.get_expenses(), dm.get_daily_yields(), dm.get_cow_events()
+    frames = {
+        "sales": reports_engine.sales_frame(sales),
+        "expenses": reports_engine.expenses_frame(expenses),
+        "yields": reports_engine.yields_frame(yields),
+        "events": reports_engine.events_frame(events),
+    }
+    due = dm.get_due_date_index().due_on_or_before(today.isoformat())
+    statement = dm.get_statement_index().get("Buyer 000")
+    return {
+        "sales_frame": case(lambda: reports_engine.sales_frame(sales)),
+        "events_frame": case(lambda: reports_engine.events_frame(events)),
+        "daily_summary": case(lambda: reports_engine.daily_summary(frames["sales"], frames["expenses"], frames["yields"], start, end)),
+        "monthly_summary": case(lambda: reports_engine.monthly_summary(frames["sales"], frames["expenses"], frames["yields"])),
+        "buyer_summary": case(lambda: reports_engine.buyer_summary(frames["sales"], start, end)),
+        "cow_summary": case(lambda: reports_engine.cow_summary(frames["events"], frames["expenses"], start, end)),
+        "dashboard_metrics": case(lambda: compute_dashboard_metrics(expenses, sales, yields, events, due, today)),
+        "buyer_statement_period": case(lambda: statement.period(start, end)),
+    }
+
+
+def run(scales: List[str], repeat: int, seed: int = 42, layout: str = "flat") -> List[Dict]:
+    results = []
+    for scale in scales:
+        data = generate(seed=seed, **SCALES[scale])
+        counts = {name: len(records) for name, records in data.items()}
+        last = data["daily_yields"][-1].date
+        year_start = f"{last[:4]}-01-01"
+        data_dir = tempfile.mkdtemp(prefix=f"bench_{scale}_")
+        try:
+            dm = write_local(data, data_dir)
+            if layout == "partitioned":
+                dm = PartitionedJSONBackend(data_dir=data_dir)
+            groups = [("operation", operation_cases(dm, last)),
+                      ("report", report_cases(dm, year_start, last, date.fromisoformat(last)))]
+            for kind, cases in groups:
+                for name, (fn, setup, teardown) in cases.items():
+                    seconds = best_of(fn, repeat, setup, teardown)
+                    results.append({"scale": scale, "kind": kind, "name": name, "seconds": seconds, "records": counts})
+                    print(f"{scale:<7} {kind:<9} {name:<28} {seconds * 1000:10.2f} ms")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=parent_dir, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def save(results: List[Dict], path: Optional[str], repeat: int, seed: int, layout: str = "flat") -> str:
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"scale-{datetime.now():%Y%m%d-%H%M%S}.json")
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "layout": layout,
+        "scales": {name: SCALES[name] for name in sorted({r["scale"] for r in results})},
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    return path
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> List[Dict]:
+    """Cases present in both runs that are more than ``threshold`` times slower in the new one."""
+    with open(old_path) as f:
+        old = {(r["scale"], r["name"]): r["seconds"] for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {(r["scale"], r["name"]): r["seconds"] for r in json.load(f)["results"]}
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        ratio = after / before if before else float("inf")
+        flag = ratio > threshold and after - before > MIN_DELTA_SECONDS
+        print(f"{key[0]:<7} {key[1]:<28} {before * 1000:10.2f} -> {after * 1000:10.2f} ms  x{ratio:5.2f}{'  REGRESSION' if flag else ''}")
+        if flag:
+            regressions.append({"scale": key[0], "name": key[1], "before": before, "after": after, "ratio": ratio})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--layout", choices=["flat", "partitioned"], default="flat", help="local storage layout to measure")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/scale-<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files instead of running")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    results = run(args.scales, args.repeat, args.seed, args.layout)
+    print(f"Results written to {save(results, args.out, args.repeat, args.seed, args.layout)}")
@@ -0,0 +1,79 @@
+"""Loading sales for analysis: the live JSON store vs an analytics Parquet snapshot.
+
+For each scale:
+  json_full      - ``get_milk_sales()`` into ``sales_frame`` (what a notebook does today via the live store)
+  parquet_full   - ``report_frame`` of every sale from the snapshot
+  json_month     - the full read filtered to one month
+  parquet_month  - ``report_frame`` for that month (skips row groups outside it)
+
+Run from the repository root:
+    python -m benchmarks.bench_snapshot [--scales small medium] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from benchmarks.synthetic_data import generate, write_local
+from benchmarks.bench_scale import SCALES, best_of
+from src import analytics_snapshot, reports_engine
+from src.partitions import in_date_range
+
+
+def read_cases(dm, snapshot: str) -> Dict[str, callable]:
+    sales = dm.get_milk_sales()
+    day = sales[len(sales) // 2].date
+    start, end = day[:8] + "01", day[:8] + "31"
+
+    def live():
+        dm._derived.clear()
+        return dm.get_milk_sales()
+
+    return {
+        "json_full": lambda: reports_engine.sales_frame(live()),
+        "parquet_full": lambda: analytics_snapshot.report_frame(snapshot, "milk_sales"),
+        "json_month": lambda: reports_engine.sales_frame(in_date_range(live(), start, end)),
+        "parquet_month": lambda: analytics_snapshot.report_frame(snapshot, "milk_sales", start, end),
+    }
+
+
+def run(scales: List[str], repeat: int, seed: int = 42) -> List[Dict]:
+    results = []
+    for scale in scales:
+        work_dir = tempfile.mkdtemp(prefix=f"bench_snapshot_{scale}_")
+        try:
+            dm = write_local(generate(seed=seed, **SCALES[scale]), os.path.join(work_dir, "data"))
+            snapshot = os.path.join(work_dir, "snapshot")
+            analytics_snapshot.write_snapshot(dm, snapshot)
+            json_bytes = os.path.getsize(dm.files["milk_sales"])
+            parquet_bytes = os.path.getsize(os.path.join(snapshot, "milk_sales.parquet"))
+            print(f"{scale:<7} milk_sales  json {json_bytes / 1e6:7.2f} MB  parquet {parquet_bytes / 1e6:7.2f} MB")
+            for name, fn in read_cases(dm, snapshot).items():
+                seconds = best_of(fn, repeat)
+                results.append({"scale": scale, "name": name, "seconds": seconds,
+                                "json_bytes": json_bytes, "parquet_bytes": parquet_bytes})
+                print(f"{scale:<7} {name:<14} {seconds * 1000:9.2f} ms")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
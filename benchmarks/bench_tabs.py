@@ -0,0 +1,152 @@
+"""Render every tab headlessly with Streamlit's AppTest against synthetic data.
+
+For each tab and scale this records, per rerun (a cold first run, then a warm rerun
+with no interaction): wall time, DataManager calls made by the tab, JSON file reads
+underneath them, and the number of elements emitted. Any figure over its budget in
+``tab_budgets.json`` (or the file given with ``--budgets``) fails the run.
+
+Run from the repository root:
+    python -m benchmarks.bench_tabs [--scales small medium] [--tabs dashboard reports] [--out FILE]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from streamlit.testing.v1 import AppTest
+from benchmarks.synthetic_data import generate, write_local
+from benchmarks.bench_scale import SCALES
+from src.data_manager import LocalJSONBackend
+
+TABS = ["dashboard", "expenses", "milk_sales", "cows", "reports"]
+RERUNS = ["cold", "warm"]
+BUDGETS_PATH = os.path.join(current_dir, "tab_budgets.json")
+METRICS = ["seconds", "backend_calls", "file_reads", "elements"]
+
+
+class CountingBackend:
+    """Passes everything through to a DataManager, counting the public methods called on it."""
+
+    def __init__(self, dm):
+        self.dm = dm
+        self.calls = Counter()
+        self.reads = Counter()
+        read_json = dm._read_json
+
+        def counted_read(key):
+            self.reads[key] += 1
+            return read_json(key)
+        dm._read_json = counted_read
+
+    def reset(self):
+        self.calls.clear()
+        self.reads.clear()
+
+    def __getattr__(self, name):
+        attr = getattr(self.dm, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+def tab_script(tab, dm):
+    # Runs inside AppTest: mirrors app.py for a single section
+    from src.data_snapshot import DataSnapshot
+    from src.tabs import dashboard, expenses, milk_sales, cows, reports
+    from src.ui_components import StyleRegistry
+    StyleRegistry.inject()
+    sections = {"dashboard": dashboard, "expenses": expenses, "milk_sales": milk_sales, "cows": cows, "reports": reports}
+    sections[tab].render(DataSnapshot(dm))
+
+
+def count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if children is None:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def render_tab(tab: str, dm: CountingBackend) -> List[Dict]:
+    at = AppTest.from_function(tab_script, args=(tab, dm), default_timeout=600)
+    runs = []
+    for rerun in RERUNS:
+        dm.reset()
+        start = time.perf_counter()
+        at.run()
+        seconds = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{tab} ({rerun}) raised: {at.exception[0].value}")
+        runs.append({
+            "tab": tab, "rerun": rerun, "seconds": seconds,
+            "backend_calls": sum(dm.calls.values()), "file_reads": sum(dm.reads.values()),
+            "elements": count_elements(at._tree), "calls": dict(dm.calls),
+        })
+    return runs
+
+
+def run(scales: List[str], tabs: List[str], seed: int = 42) -> List[Dict]:
+    results = []
+    for scale in scales:
+        params = SCALES[scale]
+        # End the data today so the "today" and "this month" views have something to show
+        start = (date.today() - timedelta(days=365 * params["years"] - 1)).isoformat()
+        data_dir = tempfile.mkdtemp(prefix=f"bench_tabs_{scale}_")
+        try:
+            write_local(generate(seed=seed, start=start, **params), data_dir)
+            for tab in tabs:
+                dm = CountingBackend(LocalJSONBackend(data_dir=data_dir))
+                for r in render_tab(tab, dm):
+                    r["scale"] = scale
+                    results.append(r)
+                    print(f"{scale:<7} {tab:<11} {r['rerun']:<5} {r['seconds'] * 1000:9.1f} ms  "
+                          f"{r['backend_calls']:4d} calls  {r['file_reads']:3d} reads  {r['elements']:5d} elements")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def check_budgets(results: List[Dict], budgets: Dict) -> List[str]:
+    """Budget lookups go scale -> tab -> rerun -> metric, with ``default`` standing in for a missing tab."""
+    failures = []
+    for r in results:
+        by_tab = budgets.get(r["scale"], {})
+        limits = by_tab.get(r["tab"], by_tab.get("default", {})).get(r["rerun"], {})
+        for metric in METRICS:
+            limit = limits.get(metric)
+            if limit is not None and r[metric] > limit:
+                failures.append(f"{r['scale']}/{r['tab']}/{r['rerun']}: {metric} {r[metric]:.4g} > budget {limit}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--tabs", nargs="+", choices=TABS, default=TABS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.tabs, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+    with open(args.budgets) as f:
+        failures = check_budgets(results, json.load(f))
+    for failure in failures:
+        print(f"OVER BUDGET  {failure}")
+    sys.exit(1 if failures else 0)
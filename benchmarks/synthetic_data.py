@@ -0,0 +1,149 @@
+"""Seeded synthetic dairy data for all seven collections.
+
+The same arguments always produce the same records, so benchmark runs are comparable.
+Distributions follow a small dairy: buyers take a roughly constant daily quantity and
+skip the odd day, settle their bill early the following month, cows yield with a
+seasonal swing, and expenses mix recurring bills, weekly feed and vet costs.
+
+    python -m benchmarks.synthetic_data DATA_DIR [--years 5] [--buyers 200] [--cows 40] [--seed 42]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Dict, List
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.models import Expense, Buyer, MilkSale, Payment, Cow, CowEvent, DailyYield
+
+COLLECTIONS = ["expenses", "buyers", "milk_sales", "daily_yields", "payments", "cows", "cow_events"]
+BUYER_RATES = [45.0, 48.0, 50.0, 52.0, 55.0]
+BREEDS = ["HF", "Jersey", "Gir", "Sahiwal"]
+RECURRING_BILLS = [("Labour", "Monthly", 12000.0), ("Shed Rent", "Monthly", 5000.0), ("Insurance", "Yearly", 8000.0)]
+VACCINATION_INTERVAL = 180
+
+
+def _next_month(d: date) -> date:
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def generate(years: int = 1, buyers: int = 20, cows: int = 10, seed: int = 42,
+             start: str = "2020-01-01") -> Dict[str, List]:
+    """Records for ``years`` of trading with ``buyers`` buyers and ``cows`` cows, keyed by collection."""
+    rng = random.Random(seed)
+    counter = itertools.count(1)
+
+    def new_id(prefix: str) -> str:
+        return f"{prefix}{next(counter):08d}"
+
+    first = date.fromisoformat(start)
+    days = [first + timedelta(days=i) for i in range(365 * years)]
+    last = days[-1]
+    data: Dict[str, List] = {name: [] for name in COLLECTIONS}
+
+    # Buyers: a usual quantity, a habit of skipping some days, a rate raised every January
+    profiles = []
+    for i in range(buyers):
+        base = max(0.5, round(rng.lognormvariate(math.log(2.5), 0.5) * 2) / 2)
+        rate = rng.choice(BUYER_RATES)
+        profiles.append((f"Buyer {i:03d}", base, rng.uniform(0.85, 1.0), rate))
+        data["buyers"].append(Buyer(name=profiles[-1][0], default_rate=rate + 2.0 * (years - 1), id=new_id("B")))
+
+    herd = []
+    for i in range(cows):
+        name = f"Cow {i:02d}"
+        bought = first - timedelta(days=rng.randint(30, 1500))
+        data["cows"].append(Cow(name=name, breed=rng.choice(BREEDS), notes="", bought_date=bought.isoformat(),
+                                bought_from=rng.choice(["Local fair", "Neighbour", "Breeder"]), id=new_id("C")))
+        herd.append((name, rng.uniform(6.0, 16.0), rng.randint(0, VACCINATION_INTERVAL - 1)))
+
+    bills: Dict[str, float] = {}
+    for n, day in enumerate(days):
+        iso = day.isoformat()
+
+        if day.day == 1 and n:
+            # Settle last month's bill in the first days of this month, sometimes short
+            for name, _, _, _ in profiles:
+                owed = bills.pop(name, 0.0)
+                if owed > 0:
+                    paid_on = day + timedelta(days=rng.randint(0, 9))
+                    if paid_on <= last:
+                        amount = round(owed * rng.choice([1.0, 1.0, 1.0, 0.9, 0.8]), -1)
+                        data["payments"].append(Payment(date=paid_on.isoformat(), buyer_name=name, entry_type="Payment",
+                                                        amount=amount, notes=rng.choice(["Cash", "UPI", ""]), id=new_id("P")))
+                if rng.random() < 0.03:
+                    data["payments"].append(Payment(date=iso, buyer_name=name, entry_type="Advance",
+                                                    amount=float(rng.randrange(500, 3000, 100)), notes="", id=new_id("P")))
+        if day.day == 1:
+            for bill, recurrence, amount in RECURRING_BILLS:
+                if recurrence == "Monthly" or day.month == first.month:
+                    data["expenses"].append(Expense(date=iso, name=bill, description="", amount=amount, id=new_id("E")))
+
+        hike = 2.0 * (day.year - first.year)
+        for name, base, attendance, rate in profiles:
+            if rng.random() < attendance:
+                quantity = max(0.5, round(base * rng.gauss(1.0, 0.1) * 2) / 2)
+                total = round(quantity * (rate + hike), 2)
+                data["milk_sales"].append(MilkSale(date=iso, buyer_name=name, quantity=quantity, rate=rate + hike,
+                                                   total_amount=total, id=new_id("S")))
+                bills[name] = bills.get(name, 0.0) + total
+
+        season = 1.0 + 0.15 * math.sin(2 * math.pi * day.timetuple().tm_yday / 365)
+        produced = 0.0
+        for name, litres, vaccine_offset in herd:
+            today = round(litres * season * rng.gauss(1.0, 0.08), 1)
+            produced += today
+            data["cow_events"].append(CowEvent(date=iso, cow_id=name, event_type="Yield", value=f"{today}L", id=new_id("V")))
+            if (n + vaccine_offset) % VACCINATION_INTERVAL == 0:
+                cost = float(rng.randrange(300, 800, 50))
+                due = (day + timedelta(days=VACCINATION_INTERVAL)).isoformat()
+                data["cow_events"].append(CowEvent(date=iso, cow_id=name, event_type="Vaccination", value="FMD",
+                                                   cost=cost, next_due_date=due, id=new_id("V")))
+                data["expenses"].append(Expense(date=iso, name="Cow Expense - Vaccination", description=f"Cow {name} - Vaccination: FMD",
+                                                amount=cost, cow_id=name, id=new_id("E")))
+            elif rng.random() < 0.005:
+                cost = float(rng.randrange(500, 3000, 100))
+                data["cow_events"].append(CowEvent(date=iso, cow_id=name, event_type="Doctor Visit", value="Checkup",
+                                                   cost=cost, id=new_id("V")))
+                data["expenses"].append(Expense(date=iso, name="Cow Expense - Doctor Visit", description=f"Cow {name} - Doctor Visit: Checkup",
+                                                amount=cost, cow_id=name, id=new_id("E")))
+        data["daily_yields"].append(DailyYield(date=iso, quantity=round(produced, 1), notes="", id=new_id("Y")))
+
+        if day.weekday() == 0:
+            data["expenses"].append(Expense(date=iso, name="Feed", description="Cattle feed and fodder",
+                                            amount=round(rng.uniform(300, 600) * max(cows, 1), -1), id=new_id("E")))
+
+    # Recurring templates whose next occurrence falls just after the generated window
+    for bill, recurrence, amount in RECURRING_BILLS:
+        due = _next_month(last) if recurrence == "Monthly" else date(last.year + 1, first.month, 1)
+        data["expenses"].append(Expense(date=start, name=bill, description="", amount=amount, is_recurring=True,
+                                        recurrence_type=recurrence, next_due_date=due.isoformat(), id=new_id("E")))
+    return data
+
+
+def write_local(data: Dict[str, List], data_dir: str):
+    """Write ``data`` as a ``LocalJSONBackend`` directory and return the backend."""
+    from src.data_manager import LocalJSONBackend
+    dm = LocalJSONBackend(data_dir=data_dir)
+    dm._write_many({name: [r.__dict__ for r in records] for name, records in data.items()})
+    return dm
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data_dir")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--cows", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generated = generate(args.years, args.buyers, args.cows, args.seed)
+    write_local(generated, args.data_dir)
+    for name, records in generated.items():
+        print(f"{name:<13} {len(records):>9,}")
@@ -0,0 +1,177 @@
+"""Typed, compressed Parquet snapshots of every collection, and a column/row-group read path for analysis.
+
+A snapshot is a folder with one ``<collection>.parquet`` per collection plus ``manifest.json``.
+Rows are sorted by date and written in fixed-size row groups whose min/max date statistics let
+``read_collection`` skip the groups outside a range; only the requested columns are decoded.
+Dates are stored as ``date32`` (unparseable dates become null) and read back as ISO strings, so
+the frames feed ``reports_engine`` unchanged. Snapshots are read through the DataManager once
+and never touch the live store afterwards.
+"""
+import io
+import json
+import os
+import shutil
+import typing
+import zipfile
+from dataclasses import fields
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from src.models import Buyer
+from src.reports_engine import FRAME_COLUMNS
+from src.unit_of_work import RECORD_TYPES
+
+# Collection -> record type; buyers are snapshotted alongside the unit-of-work collections
+COLLECTIONS = {"buyers": Buyer, **RECORD_TYPES}
+MANIFEST = "manifest.json"
+ROW_GROUP_SIZE = 65536
+COMPRESSION = "zstd"
+
+
+def _is_date(name: str) -> bool:
+    return name == "date" or name.endswith("_date")
+
+
+def _arrow_type(name: str, hint) -> pa.DataType:
+    if _is_date(name):
+        return pa.date32()
+    args = [a for a in typing.get_args(hint) if a is not type(None)]
+    if typing.get_origin(hint) is typing.Union and len(args) == 1:
+        hint = args[0]  # Optional[X]
+    return {float: pa.float64(), bool: pa.bool_()}.get(hint, pa.string())
+
+
+def schema(model: type) -> pa.Schema:
+    """Arrow schema for a model: dates as date32, floats and bools typed, everything else string."""
+    hints = typing.get_type_hints(model)
+    return pa.schema([pa.field(f.name, _arrow_type(f.name, hints[f.name])) for f in fields(model)])
+
+
+def _column(values: List, kind: pa.DataType) -> pa.Array:
+    if kind == pa.date32():
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601", errors="coerce")
+        return pa.Array.from_pandas(parsed).cast(pa.date32())
+    if kind == pa.float64():
+        return pa.Array.from_pandas(pd.to_numeric(pd.Series(values, dtype=object), errors="coerce"), type=kind)
+    if kind == pa.bool_():
+        return pa.array([None if v is None else bool(v) for v in values], type=kind)
+    return pa.array([None if v is None else str(v) for v in values], type=kind)
+
+
+def records_table(records: List, model: type) -> pa.Table:
+    """Typed table from model instances, sorted by date when the model has one."""
+    table_schema = schema(model)
+    table = pa.Table.from_arrays(
+        [_column([getattr(r, f.name) for r in records], f.type) for f in table_schema], schema=table_schema)
+    return table.sort_by("date") if "date" in table_schema.names else table
+
+
+def snapshot_tables(dm) -> Dict[str, pa.Table]:
+    """Every collection read once through ``dm``."""
+    tables = {}
+    for collection, model in COLLECTIONS.items():
+        read = "get_buyers" if collection == "buyers" else f"get_{collection}"
+        tables[collection] = records_table(getattr(dm, read)(), model)
+    return tables
+
+
+def _manifest(tables: Dict[str, pa.Table], row_group_size: int) -> Dict:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "row_group_size": row_group_size,
+        "collections": {name: table.num_rows for name, table in tables.items()},
+    }
+
+
+def write_snapshot(dm, directory: str, row_group_size: int = ROW_GROUP_SIZE) -> Dict[str, int]:
+    """Write a snapshot folder at ``directory`` (which must not exist yet); returns rows per collection.
+
+    The files are written to ``<directory>.tmp`` and renamed into place, so a snapshot that exists is complete.
+    """
+    if os.path.exists(directory):
+        raise FileExistsError(f"Snapshot {directory} already exists")
+    tables = snapshot_tables(dm)
+    staging = directory + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, table in tables.items():
+        pq.write_table(table, os.path.join(staging, f"{name}.parquet"), row_group_size=row_group_size,
+                       compression=COMPRESSION)
+    manifest = _manifest(tables, row_group_size)
+    with open(os.path.join(staging, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, directory)
+    return manifest["collections"]
+
+
+def snapshot_zip(dm, row_group_size: int = ROW_GROUP_SIZE) -> bytes:
+    """The same snapshot as one zip archive, for downloading."""
+    tables = snapshot_tables(dm)
+    buffer = io.BytesIO()
+    # Parquet pages are already compressed, so the archive only stores them
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for name, table in tables.items():
+            part = io.BytesIO()
+            pq.write_table(table, part, row_group_size=row_group_size, compression=COMPRESSION)
+            archive.writestr(f"{name}.parquet", part.getvalue())
+        archive.writestr(MANIFEST, json.dumps(_manifest(tables, row_group_size), indent=2))
+    return buffer.getvalue()
+
+
+def row_groups(parquet: pq.ParquetFile, start: Optional[str] = None, end: Optional[str] = None) -> List[int]:
+    """Row groups whose date statistics overlap ``start``..``end`` (all of them without a date column or range).
+
+    Bounds are compared as ISO strings, as everywhere else, so ``"2024-02-31"`` is a valid end.
+    """
+    groups = list(range(parquet.metadata.num_row_groups))
+    names = parquet.schema_arrow.names
+    if (start is None and end is None) or "date" not in names:
+        return groups
+    column = names.index("date")
+    keep = []
+    for i in groups:
+        stats = parquet.metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            keep.append(i)  # all-null dates or no statistics: cannot rule the group out
+        elif (start is None or stats.max.isoformat() >= start) and (end is None or stats.min.isoformat() <= end):
+            keep.append(i)
+    return keep
+
+
+def read_collection(directory: str, collection: str, columns: Optional[List[str]] = None,
+                    start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """A snapshot collection as a DataFrame: only ``columns``, and only rows dated ``start``..``end``.
+
+    Date columns come back as ISO strings (NaN where the live record's date did not parse).
+    """
+    parquet = pq.ParquetFile(os.path.join(directory, f"{collection}.parquet"))
+    ranged = start is not None or end is not None
+    wanted = list(columns) if columns is not None else parquet.schema_arrow.names
+    # The date column is needed to filter the rows inside the kept groups
+    read = wanted + ["date"] if ranged and "date" not in wanted else wanted
+    table = parquet.read_row_groups(row_groups(parquet, start, end), columns=read)
+    if ranged:
+        dates = table.column("date").cast(pa.string())
+        mask = pc.is_valid(dates)
+        if start is not None:
+            mask = pc.and_(mask, pc.greater_equal(dates, start))
+        if end is not None:
+            mask = pc.and_(mask, pc.less_equal(dates, end))
+        table = table.filter(mask).select(wanted)
+    for i, name in enumerate(table.column_names):
+        if _is_date(name):
+            table = table.set_column(i, name, table.column(name).cast(pa.string()))
+    return table.to_pandas()
+
+
+def report_frame(directory: str, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """The frame ``reports_engine`` expects for ``collection`` (as ``sales_frame`` etc. build), from a snapshot."""
+    return read_collection(directory, collection, FRAME_COLUMNS[collection], start, end)
+
+
+def read_manifest(directory: str) -> Dict:
+    with open(os.path.join(directory, MANIFEST), 'r') as f:
+        return json.load(f)
@@ -2,6 +2,7 @@ import streamlit as st
 import sys
 import os
 import json
+import importlib
 
 # Fix Python Path to allow importing from src when running from root or src
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,17 +10,40 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from src.data_manager import LocalJSONBackend
-from src.google_sheets_backend import GoogleSheetsBackend
-from src.tabs import dashboard, expenses, milk_sales, cows, reports
+from src.data_snapshot import DataSnapshot
+from src.instrumentation import span
+from src.metrics import exporter_from_env
+
+# Sidebar sections -> tab module (under src.tabs) with render(dm), imported the first time it is shown
+SECTIONS = {
+    "Dashboard": "dashboard",
+    "Expenses": "expenses",
+    "Milk Sales": "milk_sales",
+    "Cows": "cows",
+    "Reports": "reports",
+}
 
 # Page Config
 st.set_page_config(page_title="Dairy Manager", layout="wide", page_icon="🐄")
 
-# Apply global button styles for consistent UI
-from src.ui_components.enhanced_data_table import EnhancedDataTable
-EnhancedDataTable.apply_global_button_styles()
+# Inject every registered component stylesheet once, at page level
+from src.ui_components import StyleRegistry, DiagnosticsPanel
+StyleRegistry.inject()
 
 # --- Backend Initialization Logic ---
+def local_backend():
+    data_dir = os.path.join(parent_dir, "local_data")
+    # Month-partitioned files: opt in with DAIRY_LOCAL_LAYOUT=partitioned, kept once the data has been split
+    if os.environ.get("DAIRY_LOCAL_LAYOUT") == "partitioned" or os.path.isdir(os.path.join(data_dir, "milk_sales")):
+        from src.partitioned_backend import PartitionedJSONBackend
+        return PartitionedJSONBackend(data_dir=data_dir)
+    return LocalJSONBackend(data_dir=data_dir)
+
+def sheets_backend(creds_dict):
+    # gspread and google-auth are only imported once credentials turn up
+    from src.google_sheets_backend import GoogleSheetsBackend
+    return GoogleSheetsBackend(creds_dict)
+
 def get_backend():
     creds_found = None
     
@@ -28,11 +52,11 @@ def get_backend():
         if "gcp_service_account" in st.secrets:
             creds_dict = dict(st.secrets["gcp_service_account"])
             creds_found = creds_dict
-            return GoogleSheetsBackend(creds_dict), "Cloud (Google Sheets)"
+            return sheets_backend(creds_dict), "Cloud (Google Sheets)"
     except Exception as e:
         # Save exception to report if credentials were found but connection failed
         if creds_found:
-             return LocalJSONBackend(data_dir=os.path.join(parent_dir, "local_data")), f"Local (Connection Error: {e})"
+             return local_backend(), f"Local (Connection Error: {e})"
         pass
 
     # 2. Check for local credentials.json file
@@ -44,7 +68,7 @@ def get_backend():
                 with open(path, "r") as f:
                     creds_dict = json.load(f)
                 creds_found = creds_dict
-                return GoogleSheetsBackend(creds_dict), "Cloud (Google Sheets - Local Key)"
+                return sheets_backend(creds_dict), "Cloud (Google Sheets - Local Key)"
             except Exception as e:
                 # Return Local Backend but with error info + extracted email
                 client_email = "Unknown"
@@ -53,11 +77,10 @@ def get_backend():
                 
                 # Store email in session state for UI display
                 st.session_state.service_account_email = client_email
-                return LocalJSONBackend(data_dir=os.path.join(parent_dir, "local_data")), f"Local (Error: {e})"
+                return local_backend(), f"Local (Error: {e})"
 
     # 3. Fallback to Local JSON
-    data_dir = os.path.join(parent_dir, "local_data")
-    return LocalJSONBackend(data_dir=data_dir), "Local Mode (No Credentials Found)"
+    return local_backend(), "Local Mode (No Credentials Found)"
 
 if 'data_manager' not in st.session_state:
     dm, mode_name = get_backend()
@@ -90,23 +113,31 @@ with st.sidebar:
     
     st.divider()
     st.caption("Navigation")
-
-# Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Dashboard", "Expenses", "Milk Sales", "Cows", "Reports"
-])
-
-with tab1:
-    dashboard.render(st.session_state.data_manager)
-
-with tab2:
-    expenses.render(st.session_state.data_manager)
-
-with tab3:
-    milk_sales.render(st.session_state.data_manager)
-
-with tab4:
-    cows.render(st.session_state.data_manager)
-
-with tab5:
-    reports.render(st.session_state.data_manager)
+    # Only the selected section runs on each rerun; the others keep their session state.
+    active_section = st.radio("Section", list(SECTIONS), key="nav_section", label_visibility="collapsed")
+    render_all_tabs = st.toggle("Show all sections as tabs", key="nav_all_tabs",
+                                help="Slower: every section is rendered on every rerun")
+
+# Opt-in profiling from the sidebar diagnostics panel, and Prometheus metrics when configured
+profiler = DiagnosticsPanel.profiler(st.session_state.data_manager)
+exporter = exporter_from_env()
+if exporter:
+    exporter.track(st.session_state.data_manager)
+observers = [o for o in (profiler, exporter) if o]
+
+# One read snapshot per run, shared by every section rendered in it
+dm = DataSnapshot(st.session_state.data_manager)
+
+def render_section(name):
+    with span(observers, "render", name):
+        importlib.import_module(f"src.tabs.{SECTIONS[name]}").render(dm)
+
+if render_all_tabs:
+    for tab, name in zip(st.tabs(list(SECTIONS)), SECTIONS):
+        with tab:
+            render_section(name)
+else:
+    render_section(active_section)
+
+# Rendered last so it shows this run's timings
+DiagnosticsPanel.render(st.session_state.data_manager, profiler)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from src.models import MilkSale, Payment
+
+
+@dataclass
+class BuyerBalance:
+    """Running totals for one buyer."""
+    buyer_name: str
+    sales_amount: float = 0.0
+    sales_quantity: float = 0.0
+    sale_count: int = 0
+    payments: float = 0.0
+    advances: float = 0.0
+
+    @property
+    def received(self) -> float:
+        return self.payments + self.advances
+
+    @property
+    def balance(self) -> float:
+        """Amount still owed by the buyer (sales minus payments and advances)."""
+        return self.sales_amount - self.received
+
+
+class BalanceLedger:
+    """Per-buyer running totals of sales, payments and advances with O(1) lookups."""
+    collections = ("milk_sales", "payments")
+
+    def __init__(self):
+        self._balances: Dict[str, BuyerBalance] = {}
+
+    @classmethod
+    def build(cls, sales: Iterable[MilkSale], payments: Iterable[Payment]) -> "BalanceLedger":
+        """Build a ledger from full sale and payment lists."""
+        ledger = cls()
+        for s in sales:
+            ledger._apply_sale(s, 1)
+        for p in payments:
+            ledger._apply_payment(p, 1)
+        return ledger
+
+    def _entry(self, buyer_name: str) -> BuyerBalance:
+        entry = self._balances.get(buyer_name)
+        if entry is None:
+            entry = self._balances[buyer_name] = BuyerBalance(buyer_name)
+        return entry
+
+    def _apply_sale(self, sale: MilkSale, sign: int):
+        entry = self._entry(sale.buyer_name)
+        entry.sales_amount += sign * sale.total_amount
+        entry.sales_quantity += sign * sale.quantity
+        entry.sale_count += sign
+
+    def _apply_payment(self, payment: Payment, sign: int):
+        entry = self._entry(payment.buyer_name)
+        if payment.entry_type == 'Advance':
+            entry.advances += sign * payment.amount
+        else:
+            entry.payments += sign * payment.amount
+
+    def apply(self, collection: str, old=None, new=None):
+        """Replace ``old`` with ``new`` (either may be None) in the running totals."""
+        if collection == "milk_sales":
+            if old is not None:
+                self._apply_sale(old, -1)
+            if new is not None:
+                self._apply_sale(new, 1)
+        elif collection == "payments":
+            if old is not None:
+                self._apply_payment(old, -1)
+            if new is not None:
+                self._apply_payment(new, 1)
+
+    def get(self, buyer_name: str) -> BuyerBalance:
+        """Totals for a buyer; buyers without records get an all-zero entry."""
+        return self._balances.get(buyer_name) or BuyerBalance(buyer_name)
+
+    def balance(self, buyer_name: str) -> float:
+        return self.get(buyer_name).balance
+
+    def buyers(self) -> Dict[str, BuyerBalance]:
+        return dict(self._balances)
@@ -0,0 +1,101 @@
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set
+
+MAX_GRAM = 3
+FUZZY_CUTOFF = 0.6
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[int] = []  # every name in this subtree, in input order
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class BuyerSearchIndex:
+    """Ranked case-insensitive buyer name search: exact, then prefix, then substring, then (optionally) fuzzy.
+
+    Prefixes come from a lowercase trie and substrings from an n-gram map, so a keystroke
+    touches only the matching names instead of scanning and lowercasing the whole list.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        self._lower = [n.lower().strip() for n in self.names]
+        self._exact: Dict[str, List[int]] = {}
+        self._root = _TrieNode()
+        self._grams: Dict[int, Dict[str, Set[int]]] = {n: {} for n in range(1, MAX_GRAM + 1)}
+        for i, name in enumerate(self._lower):
+            self._exact.setdefault(name, []).append(i)
+            node = self._root
+            node.ids.append(i)
+            for ch in name:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.ids.append(i)
+            for n in self._grams:
+                for gram in _grams(name, n):
+                    self._grams[n].setdefault(gram, set()).add(i)
+
+    def _prefix_ids(self, query: str) -> List[int]:
+        node = self._root
+        for ch in query:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+    def _substring_ids(self, query: str) -> List[int]:
+        n = min(len(query), MAX_GRAM)
+        postings = [self._grams[n].get(g) for g in _grams(query, n)]
+        if not postings or any(p is None for p in postings):
+            return []
+        candidates = set.intersection(*sorted(postings, key=len))
+        # n-grams only narrow the candidates; longer queries still need a real substring check
+        return sorted(i for i in candidates if query in self._lower[i])
+
+    def _fuzzy_ids(self, query: str, exclude: Set[int]) -> List[int]:
+        n = min(len(query), MAX_GRAM)
+        shared: Dict[int, int] = {}
+        for gram in _grams(query, n):
+            for i in self._grams[n].get(gram, ()):
+                if i not in exclude:
+                    shared[i] = shared.get(i, 0) + 1
+        scored = []
+        for i in shared:
+            ratio = SequenceMatcher(None, query, self._lower[i]).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                scored.append((-ratio, i))
+        return [i for _, i in sorted(scored)]
+
+    def search(self, query: str, k: Optional[int] = None, fuzzy: bool = False) -> List[str]:
+        """Names matching ``query``, best first; at most ``k`` when given. An empty query returns every name."""
+        query = (query or "").lower().strip()
+        if not query:
+            return self.names[:k] if k is not None else list(self.names)
+
+        ranked: List[int] = []
+        seen: Set[int] = set()
+
+        def take(ids: Iterable[int]) -> bool:
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+                    if k is not None and len(ranked) >= k:
+                        return True
+            return False
+
+        if not (take(self._exact.get(query, ())) or take(self._prefix_ids(query))
+                or take(self._substring_ids(query))) and fuzzy:
+            take(self._fuzzy_ids(query, seen))
+        return [self.names[i] for i in ranked]
+
+    def count(self, query: str) -> int:
+        """Number of exact, prefix and substring matches (fuzzy matches are not counted)."""
+        query = (query or "").lower().strip()
+        return len(self._substring_ids(query)) if query else len(self.names)
@@ -0,0 +1,183 @@
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models import MilkSale, Payment
+
+# Same-day ordering: sales are posted before money received
+_KIND_ORDER = {'Sale': 0, 'Payment': 1, 'Advance': 1}
+
+
+@dataclass
+class StatementEntry:
+    """One sale or payment on a buyer statement. ``amount`` is signed: sales add to the balance."""
+    date: str
+    kind: str
+    amount: float
+    quantity: float
+    record_id: str
+    notes: str = ""
+
+    @property
+    def key(self) -> Tuple[str, int, str]:
+        return (self.date, _KIND_ORDER.get(self.kind, 1), self.record_id or "")
+
+
+@dataclass
+class StatementPeriod:
+    """Totals and entries of a statement between two dates (inclusive)."""
+    buyer_name: str
+    start_date: str
+    end_date: str
+    opening_balance: float
+    sales_amount: float
+    sales_quantity: float
+    received: float
+    closing_balance: float
+    entries: List[StatementEntry]
+    running_balances: List[float]
+
+
+class BuyerStatement:
+    """Date-sorted sales and payments of one buyer with cumulative prefix sums."""
+
+    def __init__(self, buyer_name: str):
+        self.buyer_name = buyer_name
+        self._keys: List[Tuple[str, int, str]] = []
+        self._entries: List[StatementEntry] = []
+        # _balance[i] / _sales[i] / _qty[i] are totals of the first i entries
+        self._balance: List[float] = [0.0]
+        self._sales: List[float] = [0.0]
+        self._qty: List[float] = [0.0]
+        self._dirty_from: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def insert(self, entry: StatementEntry):
+        idx = bisect_left(self._keys, entry.key)
+        self._keys.insert(idx, entry.key)
+        self._entries.insert(idx, entry)
+        self._mark_dirty(idx)
+
+    def remove(self, entry: StatementEntry):
+        # Entries without ids can share a key, so the entry itself decides which one goes
+        idx = bisect_left(self._keys, entry.key)
+        while idx < len(self._keys) and self._keys[idx] == entry.key:
+            if self._entries[idx] == entry:
+                del self._keys[idx]
+                del self._entries[idx]
+                self._mark_dirty(idx)
+                return
+            idx += 1
+
+    def _mark_dirty(self, idx: int):
+        if self._dirty_from is None or idx < self._dirty_from:
+            self._dirty_from = idx
+
+    def _prefix(self):
+        """Recompute prefix sums from the first changed entry onwards."""
+        start = self._dirty_from
+        if start is None:
+            return
+        del self._balance[start + 1:], self._sales[start + 1:], self._qty[start + 1:]
+        for e in self._entries[start:]:
+            is_sale = e.kind == 'Sale'
+            self._balance.append(self._balance[-1] + e.amount)
+            self._sales.append(self._sales[-1] + (e.amount if is_sale else 0.0))
+            self._qty.append(self._qty[-1] + (e.quantity if is_sale else 0.0))
+        self._dirty_from = None
+
+    def balance_as_of(self, as_of: str) -> float:
+        """Balance after every entry dated on or before ``as_of`` (YYYY-MM-DD)."""
+        self._prefix()
+        return self._balance[bisect_right(self._keys, (as_of, 2, ""))]
+
+    def opening_balance(self, start: str) -> float:
+        """Balance carried into ``start``, i.e. before any entry on that date."""
+        self._prefix()
+        return self._balance[bisect_left(self._keys, (start,))]
+
+    def sales_quantity_on(self, day: str) -> float:
+        """Litres sold on ``day``."""
+        self._prefix()
+        return self._qty[bisect_right(self._keys, (day, 2, ""))] - self._qty[bisect_left(self._keys, (day,))]
+
+    def last_sale_day(self, before: str) -> Optional[str]:
+        """Date of the latest sale strictly before ``before``, or None."""
+        i = bisect_left(self._keys, (before,)) - 1
+        while i >= 0 and self._entries[i].kind != 'Sale':
+            i -= 1
+        return self._entries[i].date if i >= 0 else None
+
+    def period(self, start: str, end: str) -> StatementPeriod:
+        """Opening/closing balance, period totals and entries for ``start``..``end``."""
+        self._prefix()
+        i = bisect_left(self._keys, (start,))
+        j = bisect_right(self._keys, (end, 2, ""))
+        j = max(i, j)
+        sales = self._sales[j] - self._sales[i]
+        change = self._balance[j] - self._balance[i]
+        return StatementPeriod(
+            buyer_name=self.buyer_name,
+            start_date=start,
+            end_date=end,
+            opening_balance=self._balance[i],
+            sales_amount=sales,
+            sales_quantity=self._qty[j] - self._qty[i],
+            received=sales - change,
+            closing_balance=self._balance[j],
+            entries=self._entries[i:j],
+            running_balances=self._balance[i + 1:j + 1],
+        )
+
+
+def _sale_entry(sale: MilkSale) -> StatementEntry:
+    return StatementEntry(sale.date, 'Sale', sale.total_amount, sale.quantity, sale.id,
+                          f"{sale.quantity}L @ ₹{sale.rate}/L")
+
+
+def _payment_entry(payment: Payment) -> StatementEntry:
+    return StatementEntry(payment.date, payment.entry_type, -payment.amount, 0.0, payment.id,
+                          payment.notes or "")
+
+
+class StatementIndex:
+    """Per-buyer statements, kept in step with sale and payment mutations."""
+    collections = ("milk_sales", "payments")
+
+    def __init__(self):
+        self._statements: Dict[str, BuyerStatement] = {}
+
+    @classmethod
+    def build(cls, sales: Iterable[MilkSale], payments: Iterable[Payment]) -> "StatementIndex":
+        index = cls()
+        grouped: Dict[str, List[StatementEntry]] = {}
+        for s in sales:
+            grouped.setdefault(s.buyer_name, []).append(_sale_entry(s))
+        for p in payments:
+            grouped.setdefault(p.buyer_name, []).append(_payment_entry(p))
+        for buyer_name, entries in grouped.items():
+            entries.sort(key=lambda e: e.key)
+            statement = BuyerStatement(buyer_name)
+            statement._entries = entries
+            statement._keys = [e.key for e in entries]
+            statement._dirty_from = 0
+            index._statements[buyer_name] = statement
+        return index
+
+    def _statement(self, buyer_name: str) -> BuyerStatement:
+        statement = self._statements.get(buyer_name)
+        if statement is None:
+            statement = self._statements[buyer_name] = BuyerStatement(buyer_name)
+        return statement
+
+    def apply(self, collection: str, old=None, new=None):
+        to_entry = _sale_entry if collection == "milk_sales" else _payment_entry
+        if old is not None:
+            self._statement(old.buyer_name).remove(to_entry(old))
+        if new is not None:
+            self._statement(new.buyer_name).insert(to_entry(new))
+
+    def get(self, buyer_name: str) -> BuyerStatement:
+        """Statement for a buyer; unknown buyers get an empty statement."""
+        return self._statements.get(buyer_name) or BuyerStatement(buyer_name)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, List, Optional
+from src.models import Expense, MilkSale, DailyYield, CowEvent
+
+METRIC_COLLECTIONS = ["expenses", "milk_sales", "daily_yields", "cow_events"]
+
+
+@dataclass
+class DashboardMetrics:
+    """All dashboard KPIs for one day."""
+    month_opex: float = 0.0
+    month_produced: float = 0.0
+    month_sold: float = 0.0
+    month_revenue: float = 0.0
+    ytd_opex: float = 0.0
+    ytd_revenue: float = 0.0
+    notifications: List[str] = field(default_factory=list)
+    schedulable_expenses: int = 0
+
+    @property
+    def realized_rate(self) -> float:
+        """Month revenue per litre sold."""
+        return self.month_revenue / self.month_sold if self.month_sold > 0 else 0.0
+
+    @property
+    def net_profit(self) -> float:
+        return self.ytd_revenue - self.ytd_opex
+
+
+def _yield_litres(value: str) -> Optional[float]:
+    try:
+        return float(value.lower().replace('l', '').replace('litres', '').strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def compute_dashboard_metrics(expenses: Iterable[Expense], sales: Iterable[MilkSale],
+                              yields: Iterable[DailyYield], events: Iterable[CowEvent],
+                              due_items, today: date) -> DashboardMetrics:
+    """Compute month/YTD figures in a single pass over each collection.
+
+    Dates are ISO strings, so month and year membership is a prefix comparison.
+    """
+    month = today.strftime("%Y-%m")
+    year = month[:4]
+    m = DashboardMetrics()
+
+    for e in expenses:
+        d = e.date or ""
+        if d[:4] == year:
+            m.ytd_opex += e.amount
+            if d[:7] == month:
+                m.month_opex += e.amount
+
+    for s in sales:
+        d = s.date or ""
+        if d[:4] == year:
+            m.ytd_revenue += s.total_amount
+            if d[:7] == month:
+                m.month_sold += s.quantity
+                m.month_revenue += s.total_amount
+
+    for y in yields:
+        if (y.date or "")[:7] == month:
+            m.month_produced += y.quantity
+
+    for ev in events:
+        if ev.event_type == 'Yield' and (ev.date or "")[:7] == month:
+            litres = _yield_litres(ev.value)
+            if litres is not None:
+                m.month_produced += litres
+
+    for collection, item in due_items:
+        if collection == "expenses":
+            m.notifications.append(f"Expense '{item.name}' due on {item.next_due_date}")
+            if (item.recurrence_type or "").lower() in ("monthly", "yearly"):
+                m.schedulable_expenses += 1
+        else:
+            m.notifications.append(f"Cow {item.cow_id}: {item.event_type} due on {item.next_due_date}")
+    return m
+
+
+def get_dashboard_metrics(dm, today: Optional[date] = None) -> DashboardMetrics:
+    """Dashboard metrics, recomputed only when the data or the date changes."""
+    today = today or date.today()
+
+    def build():
+        return compute_dashboard_metrics(
+            dm.get_expenses(), dm.get_milk_sales(), dm.get_daily_yields(), dm.get_cow_events(),
+            dm.get_due_date_index().due_on_or_before(today.isoformat()), today
+        )
+
+    return dm.memoize("dashboard_metrics", METRIC_COLLECTIONS, build, today)
@@ -1,12 +1,140 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager
+import functools
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import json
 import os
-import pandas as pd
+import shutil
 from datetime import datetime
 from src.models import Expense, Buyer, MilkSale, Payment, Cow, CowEvent, DailyYield
+from src.balance_ledger import BalanceLedger
+from src.buyer_statements import StatementIndex
+from src.due_dates import DueDateIndex
+from src.date_presence import DatePresenceIndex
+from src.buyer_search import BuyerSearchIndex
+from src.unit_of_work import UnitOfWork, Mutation, RECORD_TYPES, METHOD_SUFFIX
+from src.file_lock import directory_lock
+from src.partitions import TOTAL_FIELDS, in_date_range, month_totals
 
 class DataManager(ABC):
+    # Collections whose get_range() reads only the matching part of the store
+    PARTITIONED: Tuple[str, ...] = ()
+    # Collections with a binary numeric history (numeric_store), which month totals are read from
+    NUMERIC: Tuple[str, ...] = ("milk_sales", "daily_yields")
+
+    def __init__(self):
+        # Per-collection change counters and lazily built derived indexes keyed by index class.
+        self._versions: Dict[str, int] = {}
+        self._derived: Dict[type, Any] = {}
+        self._memos: Dict[str, Tuple[Any, Any]] = {}
+
+    # --- Derived indexes ---
+    def _on_change(self, collection: str, old=None, new=None) -> None:
+        """Called by backends after a mutation so derived indexes stay in step."""
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        for index in self._derived.values():
+            if collection in index.collections:
+                index.apply(collection, old, new)
+
+    def _reset_derived(self, collection: str) -> None:
+        """Drop indexes built from ``collection`` after it changed outside this instance."""
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        for cls in [c for c, index in self._derived.items() if collection in index.collections]:
+            del self._derived[cls]
+
+    def _check_external_changes(self, collections: List[str]) -> None:
+        """Hook for backends that can detect writes made by other sessions."""
+        pass
+
+    def data_version(self, *collections: str) -> Tuple[int, ...]:
+        """Change counters for ``collections``; equal tuples mean unchanged data."""
+        self._check_external_changes(list(collections))
+        return tuple(self._versions.get(c, 0) for c in collections)
+
+    def memoize(self, name: str, collections: List[str], build: Callable[[], Any], *key: Any):
+        """Return ``build()``, reusing the last result while ``collections`` and ``key`` are unchanged."""
+        full_key = (self.data_version(*collections), key)
+        hit = self._memos.get(name)
+        if hit is not None and hit[0] == full_key:
+            return hit[1]
+        value = build()
+        self._memos[name] = (full_key, value)
+        return value
+
+    def _derived_index(self, cls: type, build: Callable[[], Any]):
+        self._check_external_changes(list(cls.collections))
+        index = self._derived.get(cls)
+        if index is None:
+            index = self._derived[cls] = build()
+        return index
+
+    def get_balance_ledger(self) -> BalanceLedger:
+        return self._derived_index(BalanceLedger, lambda: BalanceLedger.build(self.get_milk_sales(), self.get_payments()))
+
+    def get_statement_index(self) -> StatementIndex:
+        return self._derived_index(StatementIndex, lambda: StatementIndex.build(self.get_milk_sales(), self.get_payments()))
+
+    def get_due_date_index(self) -> DueDateIndex:
+        return self._derived_index(DueDateIndex, lambda: DueDateIndex.build(self.get_expenses(), self.get_cow_events()))
+
+    def get_date_presence_index(self) -> DatePresenceIndex:
+        return self._derived_index(DatePresenceIndex, lambda: DatePresenceIndex({
+            "milk_sales": self.get_milk_sales,
+            "payments": self.get_payments,
+            "daily_yields": self.get_daily_yields,
+            "expenses": self.get_expenses,
+            "cow_events": self.get_cow_events,
+        }))
+
+    def get_buyer_search_index(self) -> BuyerSearchIndex:
+        """Search index over buyer names, rebuilt only when the buyer list changes."""
+        return self.memoize("buyer_search", ["buyers"], lambda: BuyerSearchIndex(b.name for b in self.get_buyers()))
+
+    def get_numeric_history(self, collection: str):
+        """Fixed-width numeric copy of ``collection`` (one of ``NUMERIC``), patched as records change."""
+        from src.numeric_store import HISTORIES  # keeps numpy out of app startup
+        cls = HISTORIES[collection]
+        return self._derived_index(cls, lambda: self._numeric_history(cls))
+
+    def _numeric_history(self, cls):
+        """Build a history over this backend's records; backends with a data directory keep it on disk."""
+        return cls.build(getattr(self, f"get_{cls.collections[0]}"))
+
+    # --- Date-range reads ---
+    def get_range(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Any]:
+        """Records of ``collection`` dated ``start``..``end`` inclusive; either bound may be None."""
+        return in_date_range(getattr(self, f"get_{collection}")(), start, end)
+
+    def get_month_totals(self, collection: str) -> Dict[str, Dict[str, float]]:
+        """``month -> {"count": n, field: total}`` for the fields in ``partitions.TOTAL_FIELDS``."""
+        if collection in self.NUMERIC:
+            return self.get_numeric_history(collection).month_totals()
+        return month_totals(getattr(self, f"get_{collection}")(), TOTAL_FIELDS[collection])
+
+    # --- Unit of work ---
+    @contextmanager
+    def unit_of_work(self):
+        """Collect mutations on the yielded ``UnitOfWork`` and commit them together when the block exits."""
+        uow = UnitOfWork()
+        yield uow
+        if uow.mutations:
+            self._commit(uow.mutations)
+
+    @contextmanager
+    def group_commit(self):
+        """Let the backend hold back writes made in the block and make them durable together when it exits.
+
+        Unlike a unit of work this is not all-or-nothing: each call takes effect as it returns.
+        Backends without a cheaper batched write run the block unchanged.
+        """
+        yield
+
+    def _commit(self, mutations: List[Mutation]) -> None:
+        """Apply mutations one at a time; backends override this with a single atomic write."""
+        for m in mutations:
+            method = getattr(self, f"{m.kind}_{METHOD_SUFFIX[m.collection]}")
+            method(m.record_id if m.kind == "delete" else m.record)
+
     @abstractmethod
     def get_expenses(self) -> List[Expense]: pass
     @abstractmethod
@@ -24,11 +152,19 @@ class DataManager(ABC):
     def update_buyer(self, buyer_name: str, new_rate: float) -> None: pass
     @abstractmethod
     def delete_buyer(self, buyer_name: str) -> None: pass
+    def delete_buyers(self, buyer_names: List[str]) -> None:
+        """Delete several buyers; backends override this to write the batch in one go."""
+        for name in buyer_names:
+            self.delete_buyer(name)
 
     @abstractmethod
     def get_milk_sales(self) -> List[MilkSale]: pass
     @abstractmethod
     def add_milk_sale(self, sale: MilkSale) -> None: pass
+    def add_milk_sales(self, sales: List[MilkSale]) -> None:
+        """Record several sales; backends override this to write the batch in one go."""
+        for sale in sales:
+            self.add_milk_sale(sale)
     @abstractmethod
     def update_milk_sale(self, sale: MilkSale) -> None: pass
     @abstractmethod
@@ -70,8 +206,32 @@ class DataManager(ABC):
     @abstractmethod
     def delete_cow_event(self, event_id: str) -> None: pass
 
+def _split_by(data: List[Dict], field: str, value: Any) -> Tuple[List[Dict], List[Dict]]:
+    """Split raw records into (kept, removed) on ``record[field] == value``."""
+    kept, removed = [], []
+    for d in data:
+        (removed if d.get(field) == value else kept).append(d)
+    return kept, removed
+
+def _exclusive(method):
+    """Run a LocalJSONBackend mutation under the store's write lock, so its read-modify-write sees the latest data."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.exclusive():
+            return method(self, *args, **kwargs)
+    return locked
+
 class LocalJSONBackend(DataManager):
+    JOURNAL = "commit.journal"
+    # Readers take it shared and writers exclusive, across threads and processes (see src.file_lock)
+    LOCK = "store.lock"
+
     def __init__(self, data_dir: str = "local_data"):
+        super().__init__()
+        self._file_sigs: Dict[str, Tuple[int, int, int]] = {}
+        # Writes held back by group_commit(), keyed by collection
+        self._pending: Dict[str, List[Dict]] = {}
+        self._group_depth = 0
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         self.files = {
@@ -83,7 +243,11 @@ class LocalJSONBackend(DataManager):
             "cows": os.path.join(data_dir, "cows.json"),
             "cow_events": os.path.join(data_dir, "cow_events.json"),
         }
-        self._init_files()
+        self._lock = directory_lock(os.path.join(data_dir, self.LOCK))
+        # Exclusive: another process may be between staging and committing its files
+        with self._lock.exclusive():
+            self._init_files()
+            self._recover_commit()
 
     def _init_files(self):
         for fpath in self.files.values():
@@ -91,174 +255,453 @@ class LocalJSONBackend(DataManager):
                 with open(fpath, 'w') as f:
                     json.dump([], f)
 
-    def _read_json(self, key: str) -> List[Dict]:
+    @staticmethod
+    def _dump_synced(path: str, data: Any, indent=None):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _sync_dir(self):
+        """Make renames in the data directory durable; not every platform can open a directory."""
+        try:
+            fd = os.open(self.data_dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _install(self, key: str):
+        """Move ``<file>.tmp`` over the live file, keeping the version it replaces as ``<file>.bak``."""
+        fpath = self.files[key]
+        backup = fpath + ".bak"
+        if os.path.exists(fpath):
+            if os.path.exists(backup):
+                os.remove(backup)
+            try:
+                os.link(fpath, backup)
+            except OSError:
+                shutil.copyfile(fpath, backup)  # no hard links on this filesystem
+        os.replace(fpath + ".tmp", fpath)
+
+    def _recover_commit(self):
+        """Finish a multi-file commit whose journal was written, or drop one that never got that far."""
+        journal = os.path.join(self.data_dir, self.JOURNAL)
+        try:
+            with open(journal, 'r') as f:
+                keys = json.load(f)
+        except FileNotFoundError:
+            keys = []
+        except ValueError:
+            keys = []  # torn journal: the commit never happened
+        for key, fpath in self.files.items():
+            staged = fpath + ".tmp"
+            if os.path.exists(staged):
+                if key in keys:
+                    self._install(key)
+                else:
+                    os.remove(staged)
+        for leftover in (journal, journal + ".tmp"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        self._sync_dir()
+
+    def _write_many(self, updates: Dict[str, List[Dict]]):
+        """Replace collection files durably, several of them all-or-nothing.
+
+        Each file is staged as ``<file>.tmp`` and fsynced, so a crash leaves either the old
+        or the new contents, never a torn file. With more than one file the journal naming
+        them is the commit point, after which the staged files are renamed into place (and
+        rolled forward on restart). Inside ``group_commit()`` the write is only queued.
+        """
+        if self._group_depth:
+            # Private copies: callers may go on mutating the records they passed in
+            self._pending.update((key, [dict(d) for d in data]) for key, data in updates.items())
+            return
+        with self._lock.exclusive():
+            for key, data in updates.items():
+                self._dump_synced(self.files[key] + ".tmp", data, indent=2)
+            if len(updates) == 1:
+                self._install(next(iter(updates)))
+                self._sync_dir()
+            else:
+                journal = os.path.join(self.data_dir, self.JOURNAL)
+                self._dump_synced(journal + ".tmp", list(updates))
+                os.replace(journal + ".tmp", journal)
+                self._recover_commit()
+            for key in updates:
+                self._file_sigs[key] = self._file_sig(key)
+
+    @contextmanager
+    def group_commit(self):
+        """Queue the block's writes and flush them in one durable commit when it exits.
+
+        Reads in the block see the queued data. Repeated writes to a collection cost one
+        file write, and several collections share a single journaled commit. The write
+        lock is held throughout, so keep the block short.
+        """
+        with self._lock.exclusive():
+            self._group_depth += 1
+            try:
+                yield
+            finally:
+                self._group_depth -= 1
+                if not self._group_depth and self._pending:
+                    pending, self._pending = self._pending, {}
+                    try:
+                        self._write_many(pending)
+                    except Exception:
+                        # Indexes already reflect writes that never reached disk
+                        for key in pending:
+                            self._reset_derived(key)
+                        raise
+
+    @_exclusive
+    def _commit(self, mutations: List[Mutation]) -> None:
+        updates, changes = self._stage(mutations)
+        if updates:
+            self._write_many(updates)
+        for collection, old, new in changes:
+            self._on_change(collection, old, new)
+
+    def _stage(self, mutations: List[Mutation]) -> Tuple[Dict[str, List[Dict]], List[Tuple[str, Any, Any]]]:
+        """Apply mutations to freshly read files: ``(file key -> new contents, [(collection, old, new)])``."""
+        touched: Dict[str, List[Dict]] = {}
+        changes = []
+        for m in mutations:
+            if m.collection not in touched:
+                touched[m.collection] = self._read_json(m.collection)
+            data = touched[m.collection]
+            model = RECORD_TYPES[m.collection]
+            if m.kind == "add":
+                data.append(m.record.__dict__)
+                changes.append((m.collection, None, m.record))
+            elif m.kind == "update":
+                i = next((i for i, d in enumerate(data) if d.get('id') == m.id), None)
+                if i is not None:
+                    changes.append((m.collection, model(**data[i]), m.record))
+                    data[i] = m.record.__dict__
+            else:
+                data[:], removed = _split_by(data, 'id', m.id)
+                changes.extend((m.collection, model(**d), None) for d in removed)
+        return touched, changes
+
+    def _file_sig(self, key: str) -> Tuple[int, int, int]:
+        # Every write renames a new file into place, so the inode changes even when mtime and size do not
+        st = os.stat(self.files[key])
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _sig_key(self, key: str):
+        """File whose signature stands for ``key`` in change detection; None to skip the check."""
+        return key
+
+    def _check_external_changes(self, collections: List[str]) -> None:
+        # Another session or process rewrote the file since we last saw it.
+        for key in collections:
+            sig_key = self._sig_key(key)
+            if sig_key is None:
+                continue
+            sig = self._file_sig(sig_key)
+            if self._file_sigs.get(sig_key) != sig:
+                if sig_key in self._file_sigs:
+                    self._reset_derived(key)
+                self._file_sigs[sig_key] = sig
+
+    def _numeric_history(self, cls):
+        collection = cls.collections[0]
+        return cls.build(lambda: self._read_json(collection),
+                         path=os.path.join(self.data_dir, "numeric", f"{collection}.bin"),
+                         lock=self._lock, source=lambda: self._numeric_source(collection))
+
+    def _numeric_source(self, collection: str):
+        """Signature the numeric history of ``collection`` must match; None while a write is only queued."""
+        sig_key = self._sig_key(collection)
+        return None if sig_key in self._pending else self._file_sig(sig_key)
+
+    def _load(self, key: str) -> List[Dict]:
+        self._check_external_changes([key])
         with open(self.files[key], 'r') as f:
             return json.load(f)
 
+    def _read_json(self, key: str) -> List[Dict]:
+        if key in self._pending:
+            return list(self._pending[key])
+        with self._lock.shared():
+            try:
+                return self._load(key)
+            except ValueError:
+                pass
+        with self._lock.exclusive():
+            # Another writer may have repaired it while we waited
+            try:
+                return self._load(key)
+            except ValueError:
+                data = self._restore_backup(key)
+                if data is None:
+                    raise
+                return data
+
+    def _restore_backup(self, key: str):
+        """Put ``<file>.bak`` back after the live file turned out unreadable; None if there is no usable one."""
+        fpath = self.files[key]
+        try:
+            with open(fpath + ".bak", 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        print(f"Warning: {fpath} was unreadable, restored the last good snapshot")
+        self._dump_synced(fpath + ".tmp", data, indent=2)
+        os.replace(fpath + ".tmp", fpath)
+        self._sync_dir()
+        self._reset_derived(key)
+        self._file_sigs[key] = self._file_sig(key)
+        return data
+
     def _write_json(self, key: str, data: List[Dict]):
-        with open(self.files[key], 'w') as f:
-            json.dump(data, f, indent=2)
+        self._write_many({key: data})
 
     # Expenses
     def get_expenses(self) -> List[Expense]:
         data = self._read_json("expenses")
         return [Expense(**d) for d in data]
 
+    @_exclusive
     def add_expense(self, expense: Expense) -> None:
         data = self._read_json("expenses")
         data.append(expense.__dict__)
         self._write_json("expenses", data)
+        self._on_change("expenses", new=expense)
 
+    @_exclusive
     def update_expense(self, expense: Expense) -> None:
         data = self._read_json("expenses")
+        old = None
         for i, d in enumerate(data):
             if d.get('id') == expense.id:
+                old = Expense(**d)
                 data[i] = expense.__dict__
                 break
         self._write_json("expenses", data)
+        if old is not None:
+            self._on_change("expenses", old, expense)
 
+    @_exclusive
     def delete_expense(self, expense_id: str) -> None:
-        data = self._read_json("expenses")
-        data = [d for d in data if d.get('id') != expense_id]
+        data, removed = _split_by(self._read_json("expenses"), 'id', expense_id)
         self._write_json("expenses", data)
+        for d in removed:
+            self._on_change("expenses", old=Expense(**d))
 
     # Buyers
     def get_buyers(self) -> List[Buyer]:
         data = self._read_json("buyers")
         return [Buyer(**d) for d in data]
 
+    @_exclusive
     def add_buyer(self, buyer: Buyer) -> None:
         data = self._read_json("buyers")
         if not any(b['name'] == buyer.name for b in data):
             data.append(buyer.__dict__)
             self._write_json("buyers", data)
+            self._on_change("buyers", new=buyer)
 
+    @_exclusive
     def update_buyer(self, buyer_name: str, new_rate: float) -> None:
         data = self._read_json("buyers")
         for b in data:
             if b['name'] == buyer_name:
+                old = Buyer(**b)
                 b['default_rate'] = new_rate
+                self._on_change("buyers", old, Buyer(**b))
         self._write_json("buyers", data)
     
+    @_exclusive
     def delete_buyer(self, buyer_name: str) -> None:
-        data = self._read_json("buyers")
-        data = [d for d in data if d.get('name') != buyer_name]
+        data, removed = _split_by(self._read_json("buyers"), 'name', buyer_name)
         self._write_json("buyers", data)
+        for d in removed:
+            self._on_change("buyers", old=Buyer(**d))
+
+    @_exclusive
+    def delete_buyers(self, buyer_names: List[str]) -> None:
+        names = set(buyer_names)
+        data = self._read_json("buyers")
+        removed = [d for d in data if d.get('name') in names]
+        self._write_json("buyers", [d for d in data if d.get('name') not in names])
+        for d in removed:
+            self._on_change("buyers", old=Buyer(**d))
 
     # Milk Sales
     def get_milk_sales(self) -> List[MilkSale]:
         data = self._read_json("milk_sales")
         return [MilkSale(**d) for d in data]
 
+    @_exclusive
     def add_milk_sale(self, sale: MilkSale) -> None:
         data = self._read_json("milk_sales")
         data.append(sale.__dict__)
         self._write_json("milk_sales", data)
+        self._on_change("milk_sales", new=sale)
 
+    @_exclusive
+    def add_milk_sales(self, sales: List[MilkSale]) -> None:
+        data = self._read_json("milk_sales")
+        data.extend(s.__dict__ for s in sales)
+        self._write_json("milk_sales", data)
+        for sale in sales:
+            self._on_change("milk_sales", new=sale)
+
+    @_exclusive
     def update_milk_sale(self, sale: MilkSale) -> None:
         data = self._read_json("milk_sales")
+        old = None
         for i, d in enumerate(data):
             if d.get('id') == sale.id:
+                old = MilkSale(**d)
                 data[i] = sale.__dict__
                 break
         self._write_json("milk_sales", data)
+        if old is not None:
+            self._on_change("milk_sales", old, sale)
 
+    @_exclusive
     def delete_milk_sale(self, sale_id: str) -> None:
-        data = self._read_json("milk_sales")
-        data = [d for d in data if d.get('id') != sale_id]
+        data, removed = _split_by(self._read_json("milk_sales"), 'id', sale_id)
         self._write_json("milk_sales", data)
+        for d in removed:
+            self._on_change("milk_sales", old=MilkSale(**d))
 
     # Daily Yields
     def get_daily_yields(self) -> List[DailyYield]:
         data = self._read_json("daily_yields")
         return [DailyYield(**d) for d in data]
 
+    @_exclusive
     def add_daily_yield(self, yield_record: DailyYield) -> None:
         data = self._read_json("daily_yields")
         data.append(yield_record.__dict__)
         self._write_json("daily_yields", data)
+        self._on_change("daily_yields", new=yield_record)
 
+    @_exclusive
     def update_daily_yield(self, yield_record: DailyYield) -> None:
         data = self._read_json("daily_yields")
+        old = None
         for i, d in enumerate(data):
             if d.get('id') == yield_record.id:
+                old = DailyYield(**d)
                 data[i] = yield_record.__dict__
                 break
         self._write_json("daily_yields", data)
+        if old is not None:
+            self._on_change("daily_yields", old, yield_record)
 
+    @_exclusive
     def delete_daily_yield(self, yield_id: str) -> None:
-        data = self._read_json("daily_yields")
-        data = [d for d in data if d.get('id') != yield_id]
+        data, removed = _split_by(self._read_json("daily_yields"), 'id', yield_id)
         self._write_json("daily_yields", data)
+        for d in removed:
+            self._on_change("daily_yields", old=DailyYield(**d))
 
     # Payments
     def get_payments(self) -> List[Payment]:
         data = self._read_json("payments")
         return [Payment(**d) for d in data]
 
+    @_exclusive
     def add_payment(self, payment: Payment) -> None:
         data = self._read_json("payments")
         data.append(payment.__dict__)
         self._write_json("payments", data)
+        self._on_change("payments", new=payment)
 
+    @_exclusive
     def update_payment(self, payment: Payment) -> None:
         data = self._read_json("payments")
+        old = None
         for i, d in enumerate(data):
             if d.get('id') == payment.id:
+                old = Payment(**d)
                 data[i] = payment.__dict__
                 break
         self._write_json("payments", data)
+        if old is not None:
+            self._on_change("payments", old, payment)
 
+    @_exclusive
     def delete_payment(self, payment_id: str) -> None:
-        data = self._read_json("payments")
-        data = [d for d in data if d.get('id') != payment_id]
+        data, removed = _split_by(self._read_json("payments"), 'id', payment_id)
         self._write_json("payments", data)
+        for d in removed:
+            self._on_change("payments", old=Payment(**d))
 
     # Cows
     def get_cows(self) -> List[Cow]:
         data = self._read_json("cows")
         return [Cow(**d) for d in data]
 
+    @_exclusive
     def add_cow(self, cow: Cow) -> None:
         data = self._read_json("cows")
         if not any(c['name'] == cow.name for c in data):
              data.append(cow.__dict__)
              self._write_json("cows", data)
+             self._on_change("cows", new=cow)
     
+    @_exclusive
     def update_cow(self, cow: Cow) -> None:
         data = self._read_json("cows")
+        old = None
         for i, c in enumerate(data):
             # Identifying by name/id since id is often name. 
             # If id is unique UUID, better. Here model uses 'id' which might be name.
             if c.get('id') == cow.id:
+                 old = Cow(**c)
                  data[i] = cow.__dict__
                  break
         self._write_json("cows", data)
+        if old is not None:
+            self._on_change("cows", old, cow)
 
+    @_exclusive
     def delete_cow(self, cow_id: str) -> None:
-        data = self._read_json("cows")
-        data = [c for c in data if c.get('id') != cow_id]
+        data, removed = _split_by(self._read_json("cows"), 'id', cow_id)
         self._write_json("cows", data)
+        for d in removed:
+            self._on_change("cows", old=Cow(**d))
 
     # Cow Events
     def get_cow_events(self) -> List[CowEvent]:
         data = self._read_json("cow_events")
         return [CowEvent(**d) for d in data]
 
+    @_exclusive
     def add_cow_event(self, event: CowEvent) -> None:
         data = self._read_json("cow_events")
         data.append(event.__dict__)
         self._write_json("cow_events", data)
+        self._on_change("cow_events", new=event)
 
+    @_exclusive
     def update_cow_event(self, event: CowEvent) -> None:
         data = self._read_json("cow_events")
+        old = None
         for i, d in enumerate(data):
             if d.get('id') == event.id:
+                old = CowEvent(**d)
                 data[i] = event.__dict__
                 break
         self._write_json("cow_events", data)
+        if old is not None:
+            self._on_change("cow_events", old, event)
 
+    @_exclusive
     def delete_cow_event(self, event_id: str) -> None:
-        data = self._read_json("cow_events")
-        data = [d for d in data if d.get('id') != event_id]
+        data, removed = _split_by(self._read_json("cow_events"), 'id', event_id)
         self._write_json("cow_events", data)
+        for d in removed:
+            self._on_change("cow_events", old=CowEvent(**d))
\ No newline at end of file
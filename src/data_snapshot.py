@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional, Tuple
+from src.partitions import TOTAL_FIELDS, in_date_range, month_totals
+
+# Read methods memoized by the snapshot -> the collection each one reads
+READERS = {
+    "get_expenses": "expenses",
+    "get_buyers": "buyers",
+    "get_milk_sales": "milk_sales",
+    "get_daily_yields": "daily_yields",
+    "get_payments": "payments",
+    "get_cows": "cows",
+    "get_cow_events": "cow_events",
+}
+
+
+class DataSnapshot:
+    """Wraps a DataManager for one script run so each collection is read at most once.
+
+    A collection's ``get_*`` result is kept until ``data_version`` for it changes, which
+    happens on any write through this snapshot (or the wrapped manager) and on changes the
+    backend detects from other sessions. Every other attribute is passed straight through.
+    """
+
+    def __init__(self, dm):
+        self.dm = dm
+        self._reads: Dict[str, Tuple[Tuple[int, ...], List[Any]]] = {}
+
+    def _read(self, method: str) -> List[Any]:
+        collection = READERS[method]
+        version = self.dm.data_version(collection)
+        hit = self._reads.get(collection)
+        if hit is None or hit[0] != version:
+            hit = self._reads[collection] = (version, getattr(self.dm, method)())
+        # Callers may sort or filter in place; hand out a fresh list each time
+        return list(hit[1])
+
+    def get_range(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Any]:
+        # A partitioned backend opens only the overlapping months; otherwise filter the snapshot's read
+        if collection in self.dm.PARTITIONED:
+            return self.dm.get_range(collection, start, end)
+        return in_date_range(self._read(f"get_{collection}"), start, end)
+
+    def get_month_totals(self, collection: str) -> Dict[str, Dict[str, float]]:
+        # Partition manifests and numeric histories answer without building records
+        if collection in self.dm.PARTITIONED or collection in self.dm.NUMERIC:
+            return self.dm.get_month_totals(collection)
+        return month_totals(self._read(f"get_{collection}"), TOTAL_FIELDS[collection])
+
+    def __getattr__(self, name: str):
+        if name in READERS:
+            return lambda: self._read(name)
+        return getattr(self.dm, name)
@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+ALL = None  # buyer key for the whole collection
+
+
+def _ymd(value) -> Optional[Tuple[int, int, int]]:
+    """``(year, month, day)`` of an ISO date string (a time part is ignored); None if malformed."""
+    if not isinstance(value, str) or len(value) < 10 or value[4] != '-' or value[7] != '-':
+        return None
+    try:
+        y, m, d = int(value[:4]), int(value[5:7]), int(value[8:10])
+    except ValueError:
+        return None
+    return (y, m, d) if 1 <= m <= 12 and 1 <= d <= 31 else None
+
+
+class MonthPresence:
+    """Days of one month that have records: bit ``d`` of ``bitmap`` is set for day ``d``, with per-day counts."""
+    __slots__ = ("bitmap", "counts")
+
+    def __init__(self):
+        self.bitmap = 0
+        self.counts: Dict[int, int] = {}
+
+    def add(self, day: int, sign: int = 1):
+        count = self.counts.get(day, 0) + sign
+        if count > 0:
+            self.counts[day] = count
+            self.bitmap |= 1 << day
+        else:
+            self.counts.pop(day, None)
+            self.bitmap &= ~(1 << day)
+
+    def has(self, day: int) -> bool:
+        return bool(self.bitmap >> day & 1)
+
+    def count(self, day: int) -> int:
+        return self.counts.get(day, 0)
+
+    def days(self) -> List[int]:
+        """Days with at least one record, ascending."""
+        return [d for d in range(1, 32) if self.bitmap >> d & 1]
+
+    def __bool__(self) -> bool:
+        return self.bitmap != 0
+
+
+_EMPTY_MONTH = MonthPresence()
+
+
+class DatePresence:
+    """``(year, month) -> MonthPresence`` for one stream of dated records."""
+
+    def __init__(self):
+        self._months: Dict[Tuple[int, int], MonthPresence] = {}
+
+    def add(self, date_str, sign: int = 1):
+        ymd = _ymd(date_str)
+        if ymd is None:
+            return
+        key = ymd[:2]
+        month = self._months.get(key)
+        if month is None:
+            month = self._months[key] = MonthPresence()
+        month.add(ymd[2], sign)
+        if not month:
+            del self._months[key]
+
+    def month(self, year: int, month: int) -> MonthPresence:
+        """Presence for one month; an empty (shared, read-only) month when nothing was recorded."""
+        return self._months.get((year, month), _EMPTY_MONTH)
+
+    def years(self) -> List[int]:
+        return sorted({y for y, _ in self._months})
+
+    def count(self, date_str) -> int:
+        """Number of records on ``date_str``."""
+        ymd = _ymd(date_str)
+        return self.month(ymd[0], ymd[1]).count(ymd[2]) if ymd else 0
+
+
+class DatePresenceIndex:
+    """Date presence per collection and per buyer.
+
+    A collection's presence is built on first use, a buyer's on first request for that buyer;
+    both are then kept current through ``apply``.
+    """
+    collections = ("milk_sales", "payments", "daily_yields", "expenses", "cow_events")
+
+    def __init__(self, loaders: Dict[str, Callable[[], Iterable]]):
+        self._loaders = loaders
+        self._by_collection: Dict[str, Dict[Optional[str], DatePresence]] = {}
+
+    @staticmethod
+    def _build(dates: Iterable) -> DatePresence:
+        # Records cluster on a few thousand distinct dates; count those first
+        presence = DatePresence()
+        for date_str, count in Counter(dates).items():
+            presence.add(date_str, count)
+        return presence
+
+    def _collection(self, collection: str) -> Dict[Optional[str], DatePresence]:
+        presences = self._by_collection.get(collection)
+        if presences is None:
+            dates = (r.date for r in self._loaders[collection]())
+            presences = self._by_collection[collection] = {ALL: self._build(dates)}
+        return presences
+
+    def apply(self, collection: str, old=None, new=None):
+        """Replace ``old`` with ``new`` (either may be None) in every presence built so far."""
+        presences = self._by_collection.get(collection)
+        if presences is None:
+            return
+        for record, sign in ((old, -1), (new, 1)):
+            if record is None:
+                continue
+            presences[ALL].add(record.date, sign)
+            buyer = getattr(record, "buyer_name", ALL)
+            if buyer is not ALL and buyer in presences:
+                presences[buyer].add(record.date, sign)
+
+    def get(self, collection: str, buyer: Optional[str] = ALL) -> DatePresence:
+        """Presence for a whole collection, or for one buyer's records in it."""
+        presences = self._collection(collection)
+        presence = presences.get(buyer)
+        if presence is None:
+            dates = (r.date for r in self._loaders[collection]() if getattr(r, "buyer_name", ALL) == buyer)
+            presence = presences[buyer] = self._build(dates)
+        return presence
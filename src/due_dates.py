@@ -0,0 +1,136 @@
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import date
+from typing import Iterable, List, Optional, Tuple, Union
+import uuid
+from src.models import Expense, CowEvent
+
+DueRecord = Union[Expense, CowEvent]
+_MAX = "\uffff"  # sorts after any collection name
+
+
+def _due_key(collection: str, record: DueRecord) -> Optional[Tuple[str, str, str]]:
+    """Index key for a record, or None when it has nothing due."""
+    if not record.next_due_date:
+        return None
+    if collection == "expenses" and not record.is_recurring:
+        return None
+    return (record.next_due_date, collection, record.id or "")
+
+
+class DueDateIndex:
+    """Recurring expenses and cow events sorted by ``next_due_date`` for range lookups."""
+    collections = ("expenses", "cow_events")
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []
+        self._records: List[DueRecord] = []
+
+    @classmethod
+    def build(cls, expenses: Iterable[Expense], events: Iterable[CowEvent]) -> "DueDateIndex":
+        index = cls()
+        pairs = [(k, r) for c, records in (("expenses", expenses), ("cow_events", events))
+                 for r in records for k in [_due_key(c, r)] if k is not None]
+        pairs.sort(key=lambda p: p[0])
+        index._keys = [k for k, _ in pairs]
+        index._records = [r for _, r in pairs]
+        return index
+
+    def _insert(self, key, record):
+        idx = bisect_right(self._keys, key)
+        self._keys.insert(idx, key)
+        self._records.insert(idx, record)
+
+    def _remove(self, key, record):
+        idx = bisect_left(self._keys, key)
+        while idx < len(self._keys) and self._keys[idx] == key:
+            if self._records[idx] == record:
+                del self._keys[idx]
+                del self._records[idx]
+                return
+            idx += 1
+
+    def apply(self, collection: str, old=None, new=None):
+        if old is not None:
+            key = _due_key(collection, old)
+            if key is not None:
+                self._remove(key, old)
+        if new is not None:
+            key = _due_key(collection, new)
+            if key is not None:
+                self._insert(key, new)
+
+    def due_on_or_before(self, as_of: str) -> List[Tuple[str, DueRecord]]:
+        """(collection, record) pairs with ``next_due_date <= as_of``, earliest first."""
+        end = bisect_right(self._keys, (as_of, _MAX))
+        return [(k[1], r) for k, r in zip(self._keys[:end], self._records[:end])]
+
+    def due_between(self, start: str, end: str) -> List[Tuple[str, DueRecord]]:
+        """(collection, record) pairs due from ``start`` to ``end`` inclusive."""
+        i = bisect_left(self._keys, (start,))
+        j = bisect_right(self._keys, (end, _MAX))
+        return [(k[1], r) for k, r in zip(self._keys[i:j], self._records[i:j])]
+
+
+def next_occurrence(due: date, recurrence_type: Optional[str], day: Optional[int] = None) -> Optional[date]:
+    """Due date after ``due`` for monthly/yearly recurrence; None for custom schedules.
+
+    ``day`` is the schedule's own day of the month (defaults to ``due.day``). Only the
+    result is clamped, so a Jan 31 schedule falls on Feb 29 and then Mar 31 again.
+    """
+    kind = (recurrence_type or "").lower()
+    if kind == "monthly":
+        year, month = (due.year + 1, 1) if due.month == 12 else (due.year, due.month + 1)
+    elif kind == "yearly":
+        year, month = due.year + 1, due.month
+    else:
+        return None
+    # Clamp e.g. Jan 31 -> Feb 28
+    return date(year, month, min(day or due.day, monthrange(year, month)[1]))
+
+
+def _schedule_day(template: Expense, due: date) -> int:
+    """Day of the month a template recurs on: that of its start ``date``, else of ``due``."""
+    try:
+        return date.fromisoformat(template.date).day
+    except (TypeError, ValueError):
+        return due.day
+
+
+def post_due_recurring_expenses(dm, today: Optional[date] = None) -> List[Expense]:
+    """Record each due occurrence of monthly/yearly expenses and roll ``next_due_date`` forward.
+
+    Occurrences are added as plain (non-recurring) expenses dated on their due date;
+    custom schedules are left for the user to handle.
+    """
+    today = today or date.today()
+    posted = []
+    # Every occurrence and roll-forward reaches disk in one commit
+    with dm.group_commit():
+        for collection, template in dm.get_due_date_index().due_on_or_before(today.isoformat()):
+            if collection != "expenses":
+                continue
+            try:
+                due = date.fromisoformat(template.next_due_date)
+            except ValueError:
+                continue
+            if next_occurrence(due, template.recurrence_type) is None:
+                continue
+            # Each step starts from the schedule's day, so a clamped month does not shift the rest
+            day = _schedule_day(template, due)
+            while due <= today:
+                occurrence = Expense(
+                    id=str(uuid.uuid4()),
+                    date=due.isoformat(),
+                    name=template.name,
+                    description=template.description,
+                    amount=template.amount,
+                    is_recurring=False,
+                    cow_id=template.cow_id
+                )
+                dm.add_expense(occurrence)
+                posted.append(occurrence)
+                due = next_occurrence(due, template.recurrence_type, day)
+            updated = Expense(**{**template.__dict__, "next_due_date": due.isoformat()})
+            dm.update_expense(updated)
+    return posted
@@ -0,0 +1,135 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: threads in this process are still serialized
+    fcntl = None
+
+
+class RWLock:
+    """Many readers or one writer, between threads.
+
+    Waiting writers hold back new readers so a stream of reads cannot starve them.
+    A thread may nest reads, and may read or write again while it holds the write
+    lock; ``read()`` and ``write()`` yield True only when the call actually took the lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = None  # ident of the thread holding the write lock
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        depth = getattr(self._local, "reads", 0)
+        if self._writer == me or depth:
+            self._local.reads = depth + 1
+            try:
+                yield False
+            finally:
+                self._local.reads = depth
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.reads = 1
+        try:
+            yield True
+        finally:
+            self._local.reads = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            try:
+                yield False
+            finally:
+                self._write_depth -= 1
+            return
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("cannot take the write lock while holding a read lock")
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+        try:
+            yield True
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class DirectoryLock:
+    """Reader-writer lock over a data directory, across threads and (where fcntl exists) processes.
+
+    Threads coordinate through an ``RWLock``; the thread that takes it then takes a
+    shared or exclusive ``flock`` on the lock file so other processes are excluded too.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._threads = RWLock()
+
+    @contextmanager
+    def _flock(self, mode: int):
+        if fcntl is None:
+            yield
+            return
+        # A descriptor per acquisition: closing it releases the lock
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, mode)
+            yield
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def shared(self):
+        with self._threads.read() as acquired:
+            if not acquired:
+                yield
+                return
+            with self._flock(fcntl.LOCK_SH if fcntl else 0):
+                yield
+
+    @contextmanager
+    def exclusive(self):
+        with self._threads.write() as acquired:
+            if not acquired:
+                yield
+                return
+            with self._flock(fcntl.LOCK_EX if fcntl else 0):
+                yield
+
+
+_locks: Dict[str, DirectoryLock] = {}
+_locks_guard = threading.Lock()
+
+
+def directory_lock(path: str) -> DirectoryLock:
+    """The process-wide lock for the lock file at ``path``, shared by every backend using it."""
+    key = os.path.realpath(path)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = DirectoryLock(key)
+        return lock
@@ -1,14 +1,26 @@
 from src.data_manager import DataManager
 from src.models import Expense, Buyer, MilkSale, Payment, Cow, CowEvent, DailyYield
+from src.unit_of_work import Mutation
 from typing import List, Dict, Any
 import gspread
 from google.oauth2.service_account import Credentials
-import pandas as pd
 import json
 import time
+from collections import Counter
+
+HEADERS = {
+    "expenses": ["id", "date", "name", "description", "amount", "is_recurring", "recurrence_type", "next_due_date", "cow_id"],
+    "buyers": ["id", "name", "default_rate"],
+    "milk_sales": ["id", "date", "buyer_name", "quantity", "rate", "total_amount"],
+    "daily_yields": ["id", "date", "quantity", "notes"],
+    "payments": ["id", "date", "buyer_name", "entry_type", "amount", "notes"],
+    "cows": ["id", "name", "breed", "notes", "bought_date", "bought_from", "calf_birth_date"],
+    "cow_events": ["id", "date", "cow_id", "event_type", "value", "cost", "next_due_date", "notes"],
+}
 
 class GoogleSheetsBackend(DataManager):
     def __init__(self, credentials_info: Dict[str, Any], sheet_name: str = "DairyManagerDB"):
+        super().__init__()
         self.scope = [
             "https://www.googleapis.com/auth/spreadsheets",
             "https://www.googleapis.com/auth/drive"
@@ -20,16 +32,13 @@ class GoogleSheetsBackend(DataManager):
         
         self._cache = {}
         self.CACHE_TTL = 300  # Increase cache to 5 minutes to reduce API calls
+        # Cache hits/misses per worksheet and API calls/failures per operation, for diagnostics and metrics
+        self.cache_hits = Counter()
+        self.cache_misses = Counter()
+        self.api_calls = Counter()
+        self.api_errors = Counter()
         
-        self.worksheets = {
-            "expenses": self._get_or_create_worksheet("expenses", ["id", "date", "name", "description", "amount", "is_recurring", "recurrence_type", "next_due_date", "cow_id"]),
-            "buyers": self._get_or_create_worksheet("buyers", ["id", "name", "default_rate"]),
-            "milk_sales": self._get_or_create_worksheet("milk_sales", ["id", "date", "buyer_name", "quantity", "rate", "total_amount"]),
-            "daily_yields": self._get_or_create_worksheet("daily_yields", ["id", "date", "quantity", "notes"]),
-            "payments": self._get_or_create_worksheet("payments", ["id", "date", "buyer_name", "entry_type", "amount", "notes"]),
-            "cows": self._get_or_create_worksheet("cows", ["id", "name", "breed", "notes", "bought_date", "bought_from", "calf_birth_date"]),
-            "cow_events": self._get_or_create_worksheet("cow_events", ["id", "date", "cow_id", "event_type", "value", "cost", "next_due_date", "notes"])
-        }
+        self.worksheets = {name: self._get_or_create_worksheet(name, headers) for name, headers in HEADERS.items()}
 
     def _get_or_create_spreadsheet(self):
         try:
@@ -54,19 +63,41 @@ class GoogleSheetsBackend(DataManager):
             ws.append_row(headers)
         return ws
 
+    def _api(self, operation: str, call, *args, **kwargs):
+        """Make one Sheets API call, counting it (and any failure) per operation."""
+        self.api_calls[operation] += 1
+        try:
+            return call(*args, **kwargs)
+        except Exception:
+            self.api_errors[operation] += 1
+            raise
+
+    def _expired(self, ws_name: str) -> bool:
+        cached = self._cache.get(ws_name)
+        return cached is not None and time.time() - cached['timestamp'] >= self.CACHE_TTL
+
+    def _check_external_changes(self, collections: List[str]) -> None:
+        # An expired cache entry may hide edits made directly in the sheet or by other sessions.
+        for ws_name in collections:
+            if self._expired(ws_name):
+                self._reset_derived(ws_name)
+
     def _get_all_records(self, ws_name: str):
         now = time.time()
         if ws_name in self._cache:
             cached = self._cache[ws_name]
             if now - cached['timestamp'] < self.CACHE_TTL:
+                self.cache_hits[ws_name] += 1
                 return cached['data']
+            self._reset_derived(ws_name)
+        self.cache_misses[ws_name] += 1
         
         # Add rate limiting
         time.sleep(0.1)  # 100ms delay between requests
         
         try:
             ws = self.worksheets[ws_name]
-            rows = ws.get_all_values()
+            rows = self._api("get_all_values", ws.get_all_values)
             if len(rows) < 2:
                 records = []
             else:
@@ -96,6 +127,7 @@ class GoogleSheetsBackend(DataManager):
             if ws_name in self._cache:
                 cached = self._cache[ws_name]
                 if now - cached['timestamp'] < self.CACHE_TTL:
+                    self.cache_hits[ws_name] += 1
                     results[ws_name] = cached['data']
                     continue
             to_fetch.append(ws_name)
@@ -107,11 +139,26 @@ class GoogleSheetsBackend(DataManager):
         
         return results
 
+    def _cached_record(self, ws_name: str, getter, record_id: str):
+        """Current version of a record if its worksheet is cached, else None."""
+        if ws_name in self._cache and not self._expired(ws_name):
+            return next((r for r in getter() if r.id == record_id), None)
+        return None
+
+    def _record_replace(self, ws_name: str, old, new=None):
+        """Report an update (or a delete when ``new`` is None) to the derived indexes."""
+        if old is not None:
+            self._on_change(ws_name, old, new)
+        else:
+            # Previous state unknown: rebuild derived indexes on next use.
+            self._reset_derived(ws_name)
+
     def _invalidate_cache(self, ws_name: str):
         if ws_name in self._cache:
             del self._cache[ws_name]
 
-    def _append_row(self, ws_name: str, data: Dict[str, Any], headers: List[str]):
+    @staticmethod
+    def _row_values(data: Dict[str, Any], headers: List[str]) -> List[Any]:
         row = [data.get(h, "") for h in headers]
         processed_row = []
         for item in row:
@@ -121,15 +168,106 @@ class GoogleSheetsBackend(DataManager):
                 processed_row.append("")
             else:
                 processed_row.append(item)
-        self.worksheets[ws_name].append_row(processed_row)
+        return processed_row
+
+    def _append_row(self, ws_name: str, data: Dict[str, Any], headers: List[str]):
+        self._api("append_row", self.worksheets[ws_name].append_row, self._row_values(data, headers))
+        self._invalidate_cache(ws_name)
+
+    def _append_rows(self, ws_name: str, records: List[Dict[str, Any]], headers: List[str]):
+        """Append several rows with a single API call."""
+        self._api("append_rows", self.worksheets[ws_name].append_rows, [self._row_values(d, headers) for d in records])
         self._invalidate_cache(ws_name)
     
+    @classmethod
+    def _cells(cls, data: Dict[str, Any], headers: List[str]) -> Dict[str, Any]:
+        """A row in the Sheets API ``RowData`` shape, keeping numbers numeric as ``append_row`` does."""
+        values = []
+        for item in cls._row_values(data, headers):
+            if isinstance(item, (int, float)):
+                values.append({"userEnteredValue": {"numberValue": item}})
+            else:
+                values.append({"userEnteredValue": {"stringValue": str(item)}})
+        return {"values": values}
+
+    def _find_row(self, ws_name: str, record_id: str):
+        try:
+            cell = self._api("find", self.worksheets[ws_name].find, record_id)
+        except gspread.CellNotFound:
+            return None
+        return cell.row if cell else None
+
+    def _commit(self, mutations: List[Mutation]) -> None:
+        """Send every mutation in a single spreadsheet ``batch_update``."""
+        appends: Dict[tuple, Any] = {}  # (collection, id) -> record added in this unit
+        updates: Dict[tuple, Any] = {}
+        deletes = set()
+        for m in mutations:
+            key = (m.collection, m.id)
+            if m.kind == "add":
+                appends[key] = m.record
+            elif key in appends:
+                # Touches a record added in this same unit: fold into the pending append
+                if m.kind == "update":
+                    appends[key] = m.record
+                else:
+                    del appends[key]
+            elif m.kind == "update":
+                updates[key] = m.record
+            else:
+                updates.pop(key, None)
+                deletes.add(key)
+
+        olds = {key: self._cached_record(key[0], getattr(self, f"get_{key[0]}"), key[1])
+                for key in list(updates) + list(deletes)}
+        rows = {key: self._find_row(*key) for key in olds}
+
+        requests = []
+        for (collection, record_id), record in updates.items():
+            row = rows[(collection, record_id)]
+            if row is None:
+                continue
+            headers = HEADERS[collection]
+            requests.append({"updateCells": {
+                "range": {"sheetId": self.worksheets[collection].id, "startRowIndex": row - 1, "endRowIndex": row,
+                          "startColumnIndex": 0, "endColumnIndex": len(headers)},
+                "rows": [self._cells(record.__dict__, headers)],
+                "fields": "userEnteredValue",
+            }})
+        # Delete bottom-up so earlier deletions do not shift the rows of later ones
+        doomed = sorted({(key[0], rows[key]) for key in deletes if rows[key] is not None}, key=lambda k: -k[1])
+        for collection, row in doomed:
+            requests.append({"deleteDimension": {"range": {
+                "sheetId": self.worksheets[collection].id, "dimension": "ROWS", "startIndex": row - 1, "endIndex": row}}})
+        by_sheet: Dict[str, List[Any]] = {}
+        for (collection, _), record in appends.items():
+            by_sheet.setdefault(collection, []).append(record)
+        for collection, records in by_sheet.items():
+            requests.append({"appendCells": {
+                "sheetId": self.worksheets[collection].id,
+                "rows": [self._cells(r.__dict__, HEADERS[collection]) for r in records],
+                "fields": "userEnteredValue",
+            }})
+
+        if requests:
+            self._api("batch_update", self.spreadsheet.batch_update, {"requests": requests})
+        for collection in {m.collection for m in mutations}:
+            self._invalidate_cache(collection)
+        for (collection, _), record in appends.items():
+            self._on_change(collection, new=record)
+        for key, record in updates.items():
+            if rows[key] is not None:
+                self._record_replace(key[0], olds[key], record)
+        for key in deletes:
+            if rows[key] is not None:
+                self._record_replace(key[0], olds[key])
+
     def _delete_row_by_id(self, ws_name: str, record_id: str):
         ws = self.worksheets[ws_name]
         try:
-            cell = ws.find(record_id)
+            cell = self._api("find", ws.find, record_id)
             if cell:
-                ws.delete_rows(cell.row)
+                self._api("delete_rows", ws.delete_rows, cell.row)
                 self._invalidate_cache(ws_name)
         except gspread.CellNotFound:
             pass
@@ -137,7 +275,7 @@ class GoogleSheetsBackend(DataManager):
     def _update_row_by_id(self, ws_name: str, record_id: str, data: Dict[str, Any], headers: List[str]):
         ws = self.worksheets[ws_name]
         try:
-            cell = ws.find(record_id)
+            cell = self._api("find", ws.find, record_id)
             if cell:
                 row = [data.get(h, "") for h in headers]
                 processed_row = []
@@ -149,10 +287,10 @@ class GoogleSheetsBackend(DataManager):
                     else:
                         processed_row.append(item)
                 
-                cell_list = ws.range(cell.row, 1, cell.row, len(headers))
+                cell_list = self._api("range", ws.range, cell.row, 1, cell.row, len(headers))
                 for i, c in enumerate(cell_list):
                     c.value = processed_row[i]
-                ws.update_cells(cell_list)
+                self._api("update_cells", ws.update_cells, cell_list)
                 self._invalidate_cache(ws_name)
 
         except gspread.CellNotFound:
@@ -196,13 +334,18 @@ class GoogleSheetsBackend(DataManager):
     def add_expense(self, expense: Expense) -> None:
         headers = ["id", "date", "name", "description", "amount", "is_recurring", "recurrence_type", "next_due_date", "cow_id"]
         self._append_row("expenses", expense.__dict__, headers)
+        self._on_change("expenses", new=expense)
 
     def update_expense(self, expense: Expense) -> None:
         headers = ["id", "date", "name", "description", "amount", "is_recurring", "recurrence_type", "next_due_date", "cow_id"]
+        old = self._cached_record("expenses", self.get_expenses, expense.id)
         self._update_row_by_id("expenses", expense.id, expense.__dict__, headers)
+        self._record_replace("expenses", old, expense)
 
     def delete_expense(self, expense_id: str) -> None:
+        old = self._cached_record("expenses", self.get_expenses, expense_id)
         self._delete_row_by_id("expenses", expense_id)
+        self._record_replace("expenses", old)
 
     # Buyers
     def get_buyers(self) -> List[Buyer]:
@@ -216,21 +359,24 @@ class GoogleSheetsBackend(DataManager):
     def add_buyer(self, buyer: Buyer) -> None:
         headers = ["id", "name", "default_rate"]
         self._append_row("buyers", buyer.__dict__, headers)
+        self._on_change("buyers", new=buyer)
 
     def update_buyer(self, buyer_name: str, new_rate: float) -> None:
         ws = self.worksheets["buyers"]
-        cell = ws.find(buyer_name)
+        cell = self._api("find", ws.find, buyer_name)
         if cell:
-            ws.update_cell(cell.row, 3, new_rate)
+            self._api("update_cell", ws.update_cell, cell.row, 3, new_rate)
             self._invalidate_cache("buyers")
+            self._reset_derived("buyers")
     
     def delete_buyer(self, buyer_name: str) -> None:
         ws = self.worksheets["buyers"]
         try:
-            cell = ws.find(buyer_name)
+            cell = self._api("find", ws.find, buyer_name)
             if cell:
-                ws.delete_rows(cell.row)
+                self._api("delete_rows", ws.delete_rows, cell.row)
                 self._invalidate_cache("buyers")
+                self._reset_derived("buyers")
         except gspread.CellNotFound:
             pass
 
@@ -259,13 +405,26 @@ class GoogleSheetsBackend(DataManager):
     def add_milk_sale(self, sale: MilkSale) -> None:
         headers = ["id", "date", "buyer_name", "quantity", "rate", "total_amount"]
         self._append_row("milk_sales", sale.__dict__, headers)
+        self._on_change("milk_sales", new=sale)
+
+    def add_milk_sales(self, sales: List[MilkSale]) -> None:
+        if not sales:
+            return
+        headers = ["id", "date", "buyer_name", "quantity", "rate", "total_amount"]
+        self._append_rows("milk_sales", [s.__dict__ for s in sales], headers)
+        for sale in sales:
+            self._on_change("milk_sales", new=sale)
 
     def update_milk_sale(self, sale: MilkSale) -> None:
         headers = ["id", "date", "buyer_name", "quantity", "rate", "total_amount"]
+        old = self._cached_record("milk_sales", self.get_milk_sales, sale.id)
         self._update_row_by_id("milk_sales", sale.id, sale.__dict__, headers)
+        self._record_replace("milk_sales", old, sale)
 
     def delete_milk_sale(self, sale_id: str) -> None:
+        old = self._cached_record("milk_sales", self.get_milk_sales, sale_id)
         self._delete_row_by_id("milk_sales", sale_id)
+        self._record_replace("milk_sales", old)
 
     # Daily Yields
     def get_daily_yields(self) -> List[DailyYield]:
@@ -290,13 +449,18 @@ class GoogleSheetsBackend(DataManager):
     def add_daily_yield(self, yield_record: DailyYield) -> None:
         headers = ["id", "date", "quantity", "notes"]
         self._append_row("daily_yields", yield_record.__dict__, headers)
+        self._on_change("daily_yields", new=yield_record)
 
     def update_daily_yield(self, yield_record: DailyYield) -> None:
         headers = ["id", "date", "quantity", "notes"]
+        old = self._cached_record("daily_yields", self.get_daily_yields, yield_record.id)
         self._update_row_by_id("daily_yields", yield_record.id, yield_record.__dict__, headers)
+        self._record_replace("daily_yields", old, yield_record)
 
     def delete_daily_yield(self, yield_id: str) -> None:
+        old = self._cached_record("daily_yields", self.get_daily_yields, yield_id)
         self._delete_row_by_id("daily_yields", yield_id)
+        self._record_replace("daily_yields", old)
 
     # Payments
     def get_payments(self) -> List[Payment]:
@@ -335,13 +499,18 @@ class GoogleSheetsBackend(DataManager):
     def add_payment(self, payment: Payment) -> None:
         headers = ["id", "date", "buyer_name", "entry_type", "amount", "notes"]
         self._append_row("payments", payment.__dict__, headers)
+        self._on_change("payments", new=payment)
 
     def update_payment(self, payment: Payment) -> None:
         headers = ["id", "date", "buyer_name", "entry_type", "amount", "notes"]
+        old = self._cached_record("payments", self.get_payments, payment.id)
         self._update_row_by_id("payments", payment.id, payment.__dict__, headers)
+        self._record_replace("payments", old, payment)
 
     def delete_payment(self, payment_id: str) -> None:
+        old = self._cached_record("payments", self.get_payments, payment_id)
         self._delete_row_by_id("payments", payment_id)
+        self._record_replace("payments", old)
 
     # Cows
     def get_cows(self) -> List[Cow]:
@@ -359,13 +528,18 @@ class GoogleSheetsBackend(DataManager):
     def add_cow(self, cow: Cow) -> None:
         headers = ["id", "name", "breed", "notes", "bought_date", "bought_from", "calf_birth_date"]
         self._append_row("cows", cow.__dict__, headers)
+        self._on_change("cows", new=cow)
     
     def update_cow(self, cow: Cow) -> None:
         headers = ["id", "name", "breed", "notes", "bought_date", "bought_from", "calf_birth_date"]
+        old = self._cached_record("cows", self.get_cows, cow.id)
         self._update_row_by_id("cows", cow.id, cow.__dict__, headers)
+        self._record_replace("cows", old, cow)
 
     def delete_cow(self, cow_id: str) -> None:
+        old = self._cached_record("cows", self.get_cows, cow_id)
         self._delete_row_by_id("cows", cow_id)
+        self._record_replace("cows", old)
 
     # Cow Events
     def get_cow_events(self) -> List[CowEvent]:
@@ -394,10 +568,15 @@ class GoogleSheetsBackend(DataManager):
     def add_cow_event(self, event: CowEvent) -> None:
         headers = ["id", "date", "cow_id", "event_type", "value", "cost", "next_due_date", "notes"]
         self._append_row("cow_events", event.__dict__, headers)
+        self._on_change("cow_events", new=event)
 
     def update_cow_event(self, event: CowEvent) -> None:
         headers = ["id", "date", "cow_id", "event_type", "value", "cost", "next_due_date", "notes"]
+        old = self._cached_record("cow_events", self.get_cow_events, event.id)
         self._update_row_by_id("cow_events", event.id, event.__dict__, headers)
+        self._record_replace("cow_events", old, event)
 
     def delete_cow_event(self, event_id: str) -> None:
+        old = self._cached_record("cow_events", self.get_cow_events, event_id)
         self._delete_row_by_id("cow_events", event_id)
+        self._record_replace("cow_events", old)
@@ -0,0 +1,138 @@
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List
+
+# Backend internals worth timing alongside the public DataManager API
+IO_METHODS = ("_read_json", "_write_json", "_write_many", "_get_all_records", "_append_row", "_append_rows",
+              "_update_row_by_id", "_delete_row_by_id", "_commit")
+# Context managers: timing them would only time creating the manager
+UNTIMED = ("unit_of_work", "group_commit")
+MAX_TRACE_EVENTS = 20000
+
+
+@dataclass
+class CallStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@contextmanager
+def span(observers, category: str, name: str, *args):
+    """Time the block and report it to each observer's ``record``, even if it raises."""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        for observer in observers:
+            observer.record(category, name, start, seconds, args=args, error=error)
+
+
+class Profiler:
+    """Timings for backend calls and tab renders, plus a bounded trace in Chrome trace-event format."""
+
+    def __init__(self, max_events: int = MAX_TRACE_EVENTS):
+        self.stats: Dict[str, Dict[str, CallStats]] = {}  # category -> name -> stats
+        self.last_run: Dict[str, float] = {}  # render timings of the latest full run
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+
+    def record(self, category: str, name: str, start: float, seconds: float, **_):
+        self.stats.setdefault(category, {}).setdefault(name, CallStats()).add(seconds)
+        self.events.append({"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+                            "ts": round((start - self._origin) * 1e6), "dur": round(seconds * 1e6)})
+        if category == "render":
+            self.last_run[name] = seconds
+
+    def span(self, category: str, name: str):
+        return span([self], category, name)
+
+    def rows(self, category: str) -> List[Dict[str, Any]]:
+        """Per-name stats for one category, slowest total first."""
+        return [{"Name": name, "Calls": s.count, "Total (ms)": s.total * 1000, "Mean (ms)": s.mean * 1000, "Max (ms)": s.max * 1000}
+                for name, s in sorted(self.stats.get(category, {}).items(), key=lambda kv: -kv[1].total)]
+
+    def reset(self):
+        self.stats.clear()
+        self.last_run.clear()
+        self.events.clear()
+
+    def trace_json(self) -> str:
+        """The recorded spans as a Chrome/Perfetto trace file."""
+        return json.dumps({"traceEvents": list(self.events), "displayTimeUnit": "ms"})
+
+
+def _wrap(observers: List[Any], category: str, name: str, fn):
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        if not observers:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = fn(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            for observer in list(observers):
+                observer.record(category, name, start, seconds, args=args, result=result, error=error)
+    return timed
+
+
+def instrument(dm, observer) -> None:
+    """Report every public DataManager method and the backend's I/O helpers on this instance to ``observer``.
+
+    Observers have ``record(category, name, start, seconds, args=..., result=..., error=...)``; several
+    can watch one backend. Methods are replaced on the instance itself, so calls the backend
+    makes internally (an index build reading a collection, say) are reported too.
+    """
+    observers = dm.__dict__.get("_observers")
+    if observers is None:
+        observers = dm._observers = []
+        names = [n for n in dir(type(dm)) if (not n.startswith("_") or n in IO_METHODS) and n not in UNTIMED]
+        for name in names:
+            attr = getattr(dm, name, None)
+            if callable(attr) and not isinstance(attr, type):
+                category = "io" if name.startswith("_") else "backend"
+                setattr(dm, name, _wrap(observers, category, name, attr))
+        dm._instrumented = names
+    if observer not in observers:
+        observers.append(observer)
+
+
+def uninstrument(dm, observer) -> None:
+    """Stop reporting to ``observer``; the original methods come back once no observer is left."""
+    observers = dm.__dict__.get("_observers")
+    if observers is None:
+        return
+    if observer in observers:
+        observers.remove(observer)
+    if not observers:
+        for name in dm.__dict__.pop("_instrumented", []):
+            dm.__dict__.pop(name, None)
+        del dm._observers
+
+
+def is_instrumented(dm, observer) -> bool:
+    return observer in dm.__dict__.get("_observers", ())
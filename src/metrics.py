@@ -0,0 +1,225 @@
+"""Prometheus text-format metrics for backend latency, Sheets API use, cache efficiency and tab reruns.
+
+Nothing external is needed: set ``DAIRY_METRICS_PORT`` to serve ``/metrics`` over HTTP from
+inside the app process, and/or ``DAIRY_METRICS_TEXTFILE`` to have the metrics rewritten
+every ``DAIRY_METRICS_INTERVAL`` seconds (default 15) for node_exporter's textfile collector.
+"""
+import os
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from src.instrumentation import instrument
+from src.unit_of_work import METHOD_SUFFIX
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+COLLECTIONS = ("expenses", "buyers", "milk_sales", "daily_yields", "payments", "cows", "cow_events")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_SINGULAR = {**{suffix: c for c, suffix in METHOD_SUFFIX.items()}, "buyer": "buyers"}
+
+Labels = Tuple[str, ...]
+
+
+def collection_of(name: str, args: tuple = ()) -> str:
+    """Collection a DataManager method works on, or '' for methods that span several."""
+    if name.startswith("_"):
+        # Storage helpers take the collection key first
+        return args[0] if args and args[0] in COLLECTIONS else ""
+    for prefix in ("get_", "add_", "update_", "delete_"):
+        if name.startswith(prefix):
+            rest = name[len(prefix):]
+            return rest if rest in COLLECTIONS else _SINGULAR.get(rest, "")
+    return ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: List[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.series: Dict[Labels, List] = {}  # labels -> [per-bucket counts, sum, count]
+
+    def observe(self, labels: Labels, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def lines(self, name: str, label_names: List[str]) -> List[str]:
+        out = []
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            for bound, c in zip(self.buckets, counts):
+                le = 'le="%s"' % _num(bound)
+                out.append(f"{name}_bucket{_labels(label_names, labels, le)} {c}")
+            le = 'le="+Inf"'
+            out.append(f"{name}_bucket{_labels(label_names, labels, le)} {count}")
+            out.append(f"{name}_sum{_labels(label_names, labels)} {total!r}")
+            out.append(f"{name}_count{_labels(label_names, labels)} {count}")
+        return out
+
+
+class MetricsExporter:
+    """Collects metrics from every backend it tracks and renders them in Prometheus text format.
+
+    It is an instrumentation observer (see ``src.instrumentation``), so it sees each
+    DataManager call with its latency, result and any error. Sheets API and cache counters
+    are read from the tracked backends when rendering.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.call_seconds = Histogram(LATENCY_BUCKETS)  # (method, collection)
+        self.call_errors: Dict[Labels, int] = {}
+        self.render_seconds = Histogram(RENDER_BUCKETS)  # (tab,)
+        self.records: Dict[Labels, int] = {}  # (collection,) -> size at the last full read
+        self._backends = weakref.WeakSet()
+
+    def track(self, dm) -> None:
+        """Start collecting from ``dm``; safe to call on every rerun."""
+        with self._lock:
+            if dm in self._backends:
+                return
+            self._backends.add(dm)
+        instrument(dm, self)
+
+    def record(self, category: str, name: str, start: float, seconds: float,
+               args: tuple = (), result=None, error=None, **_):
+        with self._lock:
+            if category == "render":
+                self.render_seconds.observe((name,), seconds)
+                return
+            labels = (name, collection_of(name, args))
+            self.call_seconds.observe(labels, seconds)
+            if error is not None:
+                self.call_errors[labels] = self.call_errors.get(labels, 0) + 1
+            elif category == "backend" and labels[1] and name == f"get_{labels[1]}" and isinstance(result, list):
+                self.records[(labels[1],)] = len(result)
+
+    def _backend_counters(self, attr: str) -> Dict[str, int]:
+        total: Dict[str, int] = {}
+        with self._lock:
+            backends = list(self._backends)
+        for dm in backends:
+            for key, value in getattr(dm, attr, {}).items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def render(self) -> str:
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, lines: List[str]):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+
+        with self._lock:
+            family("dairy_backend_call_seconds", "histogram", "DataManager call latency by method and collection.",
+                   self.call_seconds.lines("dairy_backend_call_seconds", ["method", "collection"]))
+            family("dairy_backend_call_errors_total", "counter", "DataManager calls that raised.",
+                   [f"dairy_backend_call_errors_total{_labels(['method', 'collection'], k)} {v}"
+                    for k, v in sorted(self.call_errors.items())])
+            family("dairy_records", "gauge", "Records per collection at the last full read.",
+                   [f"dairy_records{_labels(['collection'], k)} {v}" for k, v in sorted(self.records.items())])
+            family("dairy_tab_rerun_seconds", "histogram", "Time to render one tab in a script rerun.",
+                   self.render_seconds.lines("dairy_tab_rerun_seconds", ["tab"]))
+
+        calls, errors = self._backend_counters("api_calls"), self._backend_counters("api_errors")
+        family("dairy_sheets_api_calls_total", "counter", "Google Sheets API calls by operation.",
+               [f"dairy_sheets_api_calls_total{_labels(['operation'], (k,))} {v}" for k, v in sorted(calls.items())])
+        family("dairy_sheets_api_errors_total", "counter", "Google Sheets API calls that failed.",
+               [f"dairy_sheets_api_errors_total{_labels(['operation'], (k,))} {v}" for k, v in sorted(errors.items())])
+
+        hits, misses = self._backend_counters("cache_hits"), self._backend_counters("cache_misses")
+        sheets = sorted(set(hits) | set(misses))
+        family("dairy_cache_requests_total", "counter", "Worksheet reads served from (hit) or missing (miss) the cache.",
+               [f"dairy_cache_requests_total{_labels(['collection', 'result'], (s, r))} {n.get(s, 0)}"
+                for s in sheets for r, n in (("hit", hits), ("miss", misses))])
+        family("dairy_cache_hit_ratio", "gauge", "Share of worksheet reads served from the cache.",
+               [f"dairy_cache_hit_ratio{_labels(['collection'], (s,))} {hits.get(s, 0) / (hits.get(s, 0) + misses.get(s, 0))!r}"
+                for s in sheets])
+        return "\n".join(out) + "\n"
+
+
+def serve(exporter: MetricsExporter, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a daemon thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = exporter.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_textfile(exporter: MetricsExporter, path: str) -> None:
+    """Replace ``path`` with the current metrics; readers never see a half-written file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(exporter.render())
+    os.replace(tmp, path)
+
+
+def start_textfile_writer(exporter: MetricsExporter, path: str, interval: float) -> threading.Thread:
+    def loop():
+        while True:
+            try:
+                write_textfile(exporter, path)
+            except OSError as e:
+                print(f"Error writing metrics to {path}: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="metrics-textfile", daemon=True)
+    thread.start()
+    return thread
+
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def exporter_from_env() -> Optional[MetricsExporter]:
+    """The process-wide exporter, started on first use; None unless a metrics env var is set."""
+    global _exporter
+    port, textfile = os.environ.get("DAIRY_METRICS_PORT"), os.environ.get("DAIRY_METRICS_TEXTFILE")
+    if not port and not textfile:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            exporter = MetricsExporter()
+            if port:
+                serve(exporter, int(port), os.environ.get("DAIRY_METRICS_HOST", "127.0.0.1"))
+            if textfile:
+                start_textfile_writer(exporter, textfile, float(os.environ.get("DAIRY_METRICS_INTERVAL", "15")))
+            _exporter = exporter
+    return _exporter
@@ -0,0 +1,292 @@
+"""Fixed-width binary copies of the numeric history of milk sales and daily yields, read through ``numpy.memmap``.
+
+Each record becomes one fixed-width row: a date ordinal (days since 1970-01-01), a buyer code, a hash
+of the record id and the record's numbers. Aggregations run over memory-mapped columns instead of one
+Python object per field. The JSON or Sheets store stays the source of truth: a history is a derived
+index, patched row by row as records change (an add appends a row, an update overwrites one, a delete
+marks it ``DELETED``) and rebuilt in full only when its file no longer matches the store.
+
+A file-backed history lives in ``<collection>.bin`` with ``<collection>.bin.json`` beside it, holding
+the row count, buyer names (by code), the signature of the source file it matches and a token naming
+the instance that wrote it last. The files are a cache, so they are not fsynced; anything that does not
+check out on open is rebuilt.
+"""
+import hashlib
+import json
+import os
+from contextlib import nullcontext
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.partitions import TOTAL_FIELDS, UNDATED as UNDATED_MONTH, _MONTH, _number
+
+FORMAT_VERSION = 1
+DELETED = np.iinfo(np.int32).min  # date of a deleted row; such rows are dropped by the next rebuild
+UNDATED = DELETED + 1  # date of a record whose date does not parse
+NO_BUYER = -1
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+class _NoLock:
+    """Stands in for a ``DirectoryLock`` when the rows live only in memory."""
+    shared = exclusive = staticmethod(nullcontext)
+
+
+def _field(record, name: str):
+    return record.get(name) if isinstance(record, dict) else getattr(record, name, None)
+
+
+def id_hash(record_id) -> int:
+    """Stable 64-bit hash of a record id (0 for records without one)."""
+    if record_id is None:
+        return 0
+    return int.from_bytes(hashlib.blake2b(str(record_id).encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def _ordinal(value) -> int:
+    """Days since 1970-01-01; a bad day in a good month counts as the 1st, anything else is UNDATED."""
+    text = str(value or "")
+    try:
+        return date.fromisoformat(text[:10]).toordinal() - _EPOCH
+    except ValueError:
+        pass
+    try:
+        return date(int(text[:4]), int(text[5:7]), 1).toordinal() - _EPOCH if _MONTH.match(text) else UNDATED
+    except ValueError:
+        return UNDATED
+
+
+class NumericHistory:
+    """Binary history of one collection; see the module docstring.
+
+    ``path`` of None keeps the rows in memory (for backends without a data directory). ``lock`` guards
+    the files like the store's ``DirectoryLock``: reads share it and take it exclusively only to reload
+    or write, and changes take it exclusively. ``source`` returns the signature of the store the
+    rows must match, or None while the store has writes that are not on disk yet.
+    """
+    collections: Tuple[str, ...] = ()
+    NUMBERS: Tuple[str, ...] = ()  # numeric fields, copied as float64
+    BUYERS = False  # whether records carry a buyer_name
+
+    def __init__(self, records: Callable[[], Iterable], path: Optional[str] = None,
+                 lock=_NoLock, source: Callable[[], Any] = lambda: None):
+        self.dtype = np.dtype([("date", "<i4"), ("buyer", "<i4"), ("id", "<i8")] + [(f, "<f8") for f in self.NUMBERS])
+        self._records = records
+        self.path = path
+        self._lock = lock
+        self._source = source
+        self.buyers: List[str] = []  # buyer code -> name
+        self._codes: Dict[str, int] = {}
+        self._dates: Dict[Any, int] = {}
+        self._rows = np.zeros(0, self.dtype)
+        self._appends: List[tuple] = []  # added rows not yet written
+        self._dirty = False  # the files changed since the meta file last named a source
+        self._token = None  # written into every meta file; another one there means another instance wrote it
+
+    @classmethod
+    def build(cls, records: Callable[[], Iterable], path: Optional[str] = None,
+              lock=_NoLock, source: Callable[[], Any] = lambda: None) -> "NumericHistory":
+        """Open the history at ``path`` if it matches ``source()``, else rebuild it from ``records()``."""
+        history = cls(records, path, lock, source)
+        with lock.exclusive():
+            history._load()
+        return history
+
+    # --- Rows ---
+    def _code(self, name) -> int:
+        if not self.BUYERS or name is None:
+            return NO_BUYER
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.buyers)
+            self.buyers.append(name)
+        return code
+
+    def _row(self, record) -> tuple:
+        day = _field(record, "date")
+        ordinal = self._dates.get(day)
+        if ordinal is None:
+            ordinal = self._dates[day] = _ordinal(day)
+        return (ordinal, self._code(_field(record, "buyer_name")), id_hash(_field(record, "id")),
+                *(_number(_field(record, f)) for f in self.NUMBERS))
+
+    # --- Files ---
+    @property
+    def _meta_path(self) -> str:
+        return self.path + ".json"
+
+    def _write_meta(self, source):
+        self._token = os.urandom(8).hex()
+        meta = {"version": FORMAT_VERSION, "rows": len(self._rows), "buyers": self.buyers,
+                "source": list(source) if source is not None else None, "token": self._token}
+        with open(self._meta_path + ".tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(self._meta_path + ".tmp", self._meta_path)
+
+    def _read_meta(self) -> Dict:
+        with open(self._meta_path, 'r') as f:
+            return json.load(f)
+
+    def _map(self, rows: int):
+        # numpy cannot map an empty file
+        self._rows = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(rows,)) if rows else np.zeros(0, self.dtype)
+
+    def _open(self, source) -> bool:
+        try:
+            meta = self._read_meta()
+            size = os.path.getsize(self.path)
+        except (OSError, ValueError):
+            return False
+        if (source is None or meta.get("version") != FORMAT_VERSION or meta.get("source") != list(source)
+                or size != meta.get("rows", -1) * self.dtype.itemsize):
+            return False
+        self.buyers = list(meta["buyers"])
+        self._codes = {name: code for code, name in enumerate(self.buyers)}
+        self._map(meta["rows"])
+        self._token = meta.get("token")
+        return True
+
+    def _load(self):
+        """Open the files if they match the source, else rebuild everything from its records."""
+        self.buyers, self._codes, self._appends, self._dirty = [], {}, [], False
+        source = self._source()
+        if self.path is not None and self._open(source):
+            return
+        rows = np.array([self._row(r) for r in self._records()], dtype=self.dtype)
+        if self.path is None:
+            self._rows = rows
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._write_meta(None)  # until both files are replaced, they match nothing
+        rows.tofile(self.path + ".tmp")
+        os.replace(self.path + ".tmp", self.path)
+        self._map(len(rows))
+        self._write_meta(source)
+        self._dirty = source is None
+
+    def _unchanged(self) -> bool:
+        """Whether the files are as this instance left them.
+
+        Every change starts by rewriting the meta file with a new token, which is what gives another instance's away.
+        """
+        if self.path is None:
+            return True
+        try:
+            return self._read_meta().get("token") == self._token
+        except (OSError, ValueError):
+            return False
+
+    def _current(self) -> bool:
+        """False after another backend instance changed the files; the history has then been reloaded."""
+        if self._unchanged():
+            return True
+        self._load()
+        return False
+
+    def _touch(self):
+        # Before the first change after a sync, so a crash mid-change cannot leave files that claim to match
+        if self.path is not None and not self._dirty:
+            self._write_meta(None)
+            self._dirty = True
+
+    def _flush(self):
+        """Write buffered rows, and name the source in the meta file once the store has settled."""
+        if self._appends:
+            self._touch()
+            rows = np.array(self._appends, dtype=self.dtype)
+            self._appends = []
+            if self.path is None:
+                self._rows = np.concatenate([self._rows, rows])
+            else:
+                with open(self.path, 'ab') as f:
+                    f.write(rows.tobytes())
+                self._map(len(self._rows) + len(rows))
+        if self._dirty:
+            source = self._source()
+            if source is not None:
+                self._write_meta(source)
+                self._dirty = False
+
+    # --- Derived index protocol ---
+    def apply(self, collection: str, old=None, new=None) -> None:
+        with self._lock.exclusive():
+            if not self._current():
+                return  # reloaded from the store, which already has this change
+            if old is None:
+                if new is not None:
+                    self._appends.append(self._row(new))
+                return
+            self._flush()
+            rows = self._rows
+            if old.id is None:
+                # Every id-less record hashes to 0, so only the row equal to the old record is its own
+                match = np.flatnonzero(rows == np.array(self._row(old), dtype=self.dtype))[:1]
+            else:
+                match = np.flatnonzero((rows["id"] == id_hash(old.id)) & (rows["date"] != DELETED))
+            if not len(match):
+                return
+            self._touch()
+            if new is None:
+                rows["date"][match] = DELETED
+            else:
+                rows[match[0]] = self._row(new)
+            if isinstance(rows, np.memmap):
+                rows.flush()
+
+    # --- Aggregations ---
+    def read(self, fn: Callable[[np.ndarray], Any]) -> Any:
+        """``fn(rows)`` over every row, deleted ones included, with the files locked and up to date.
+
+        Reads share the lock unless rows must be reloaded or written first. The exclusive lock is
+        taken after the shared one is released, as a shared lock cannot be upgraded.
+        """
+        with self._lock.shared():
+            if not self._appends and not self._dirty and self._unchanged():
+                return fn(self._rows)
+        with self._lock.exclusive():
+            self._current()
+            self._flush()
+            return fn(self._rows)
+
+    def live(self) -> np.ndarray:
+        """A copy of the rows that are not deleted."""
+        return self.read(lambda rows: np.array(rows[rows["date"] != DELETED]))
+
+    def month_totals(self) -> Dict[str, Dict[str, float]]:
+        """``month -> {"count": n, field: total}`` as ``DataManager.get_month_totals`` returns it."""
+        fields = TOTAL_FIELDS[self.collections[0]]
+
+        def totals(rows: np.ndarray) -> Dict[str, Dict[str, float]]:
+            dates = rows["date"]
+            result: Dict[str, Dict[str, float]] = {}
+            dated = dates > UNDATED
+            if dated.any():
+                months = dates[dated].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+                first = months.min()
+                slots = months - first
+                counts = np.bincount(slots)
+                sums = {f: np.bincount(slots, weights=rows[f][dated]) for f in fields}
+                for slot in np.flatnonzero(counts):
+                    month = str(np.datetime64(int(first + slot), "M"))
+                    result[month] = {"count": int(counts[slot]), **{f: float(sums[f][slot]) for f in fields}}
+            undated = dates == UNDATED
+            if undated.any():
+                result[UNDATED_MONTH] = {"count": int(undated.sum()), **{f: float(rows[f][undated].sum()) for f in fields}}
+            return result
+
+        return self.read(totals)
+
+
+class SalesHistory(NumericHistory):
+    collections = ("milk_sales",)
+    NUMBERS = ("quantity", "rate", "total_amount")
+    BUYERS = True
+
+
+class YieldHistory(NumericHistory):
+    collections = ("daily_yields",)
+    NUMBERS = ("quantity",)
+
+
+# Collection -> its history class
+HISTORIES = {cls.collections[0]: cls for cls in (SalesHistory, YieldHistory)}
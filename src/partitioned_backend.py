@@ -0,0 +1,255 @@
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from src.data_manager import LocalJSONBackend, _split_by
+from src.models import MilkSale, DailyYield, CowEvent
+from src.partitions import TOTAL_FIELDS, month_of, summarize, overlaps, in_date_range
+from src.unit_of_work import Mutation, RECORD_TYPES
+
+MANIFEST = "manifest"
+
+
+class PartitionedJSONBackend(LocalJSONBackend):
+    """LocalJSONBackend that keeps high-volume, dated collections as one file per month.
+
+    ``<data_dir>/<collection>/<YYYY-MM>.json`` holds a month's records, and
+    ``<collection>/manifest.json`` lists each non-empty month with its first and last date,
+    record count and totals. Date-range reads open only the months that overlap the range,
+    month totals come from the manifest alone, and a write rewrites just the months it
+    touches plus the manifest, in one journaled commit. Other collections stay single files.
+
+    A flat ``<collection>.json`` found on open is split into months and kept as
+    ``<collection>.json.migrated``. Full reads return records month by month.
+    """
+
+    PARTITIONED = tuple(TOTAL_FIELDS)
+
+    def __init__(self, data_dir: str = "local_data"):
+        self._id_months: Dict[str, Dict[str, str]] = {}  # collection -> record id -> month, built on demand
+        self._emptied: Set[str] = set()  # month keys staged empty, removed once a commit drops them
+        super().__init__(data_dir)
+        with self._lock.exclusive():
+            for collection in self.PARTITIONED:
+                self._migrate_flat_file(collection)
+            # Months left behind by a crash between a commit and the removal that follows it
+            self._remove_unlisted([k for k in self.files if "/" in k and not k.endswith("/" + MANIFEST)])
+
+    # --- Layout ---
+    def _partition_key(self, collection: str, month: str) -> str:
+        key = f"{collection}/{month}"
+        if key not in self.files:
+            self.files[key] = os.path.join(self.data_dir, collection, f"{month}.json")
+        return key
+
+    def _init_files(self):
+        for collection in self.PARTITIONED:
+            self.files.pop(collection)
+            folder = os.path.join(self.data_dir, collection)
+            os.makedirs(folder, exist_ok=True)
+            self._partition_key(collection, MANIFEST)
+            # Register staged files too, so recovery can finish or drop an interrupted commit
+            for name in os.listdir(folder):
+                if name.endswith(".json") or name.endswith(".json.tmp"):
+                    self._partition_key(collection, name.split(".", 1)[0])
+        super()._init_files()
+
+    def _migrate_flat_file(self, collection: str):
+        flat = os.path.join(self.data_dir, f"{collection}.json")
+        if not os.path.exists(flat):
+            return
+        with open(flat, 'r') as f:
+            records = json.load(f)
+        # Records already in a partition (the move was interrupted after committing) are skipped
+        known = {d.get('id') for d in self._read_json(collection)}
+        model = RECORD_TYPES[collection]
+        missing = [Mutation("add", collection, model(**d)) for d in records if d.get('id') is None or d.get('id') not in known]
+        if missing:
+            updates, _ = self._stage(missing)
+            self._write_many(updates)
+        os.replace(flat, flat + ".migrated")
+        self._reset_derived(collection)
+
+    def _remove_unlisted(self, keys):
+        """Delete the month files (and backups) among ``keys`` that their committed manifest no longer lists."""
+        listed = {}
+        for key in keys:
+            collection, month = key.split("/", 1)
+            if collection not in listed:
+                listed[collection] = {e["month"] for e in super()._read_json(self._partition_key(collection, MANIFEST))}
+            if month in listed[collection]:
+                continue
+            fpath = self.files.pop(key)
+            self._file_sigs.pop(key, None)
+            for leftover in (fpath, fpath + ".bak"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+    def _write_many(self, updates: Dict[str, List[Dict]]):
+        super()._write_many(updates)
+        if not self._group_depth and self._emptied:
+            emptied, self._emptied = self._emptied, set()
+            with self._lock.exclusive():
+                self._remove_unlisted(sorted(emptied))
+
+    def _sig_key(self, key: str):
+        # Every commit rewrites the manifest, so it stands for the whole collection
+        if key in self.PARTITIONED:
+            return self._partition_key(key, MANIFEST)
+        return None if "/" in key else key
+
+    def _reset_derived(self, collection: str) -> None:
+        collection = collection.split("/", 1)[0]
+        self._id_months.pop(collection, None)
+        super()._reset_derived(collection)
+
+    # --- Reads ---
+    def _manifest(self, collection: str, read: Callable[[str], List[Dict]]) -> List[Dict]:
+        return read(self._partition_key(collection, MANIFEST))
+
+    def _fast_read(self, key: str) -> List[Dict]:
+        # No backup restore: that needs the exclusive lock, so callers retry under it instead
+        return list(self._pending[key]) if key in self._pending else self._load(key)
+
+    def _gather(self, collection: str, start: Optional[str], end: Optional[str]) -> List[Dict]:
+        """Raw records from the months overlapping ``start``..``end``, read as one consistent view."""
+        def collect(read):
+            data = []
+            for entry in self._manifest(collection, read):
+                if overlaps(entry, start, end):
+                    data.extend(read(self._partition_key(collection, entry["month"])))
+            return data
+
+        self._check_external_changes([collection])
+        try:
+            with self._lock.shared():
+                return collect(self._fast_read)
+        except ValueError:
+            with self._lock.exclusive():
+                return collect(super()._read_json)
+
+    def _read_json(self, key: str) -> List[Dict]:
+        if key in self.PARTITIONED:
+            return self._gather(key, None, None)
+        return super()._read_json(key)
+
+    def get_range(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Any]:
+        if collection not in self.PARTITIONED:
+            return super().get_range(collection, start, end)
+        model = RECORD_TYPES[collection]
+        return [model(**d) for d in in_date_range(self._gather(collection, start, end), start, end)]
+
+    def get_month_totals(self, collection: str) -> Dict[str, Dict[str, float]]:
+        if collection not in self.PARTITIONED:
+            return super().get_month_totals(collection)
+        self._check_external_changes([collection])
+        return {e["month"]: {"count": e["count"], **e["totals"]} for e in self._manifest(collection, self._read_json)}
+
+    # --- Writes ---
+    def _month_ids(self, collection: str) -> Dict[str, str]:
+        ids = self._id_months.get(collection)
+        if ids is None:
+            ids = self._id_months[collection] = {}
+            for entry in self._manifest(collection, self._read_json):
+                for d in self._read_json(self._partition_key(collection, entry["month"])):
+                    ids[d.get('id')] = entry["month"]
+        return ids
+
+    def _locate(self, collection: str, record_id: str, parts: Dict[str, List[Dict]], load: Callable[[str], List[Dict]],
+                hint: Optional[str] = None) -> Optional[str]:
+        """Month holding ``record_id``: among the months loaded so far, else from the id map (rebuilt once if stale)."""
+        if hint is not None:
+            load(hint)
+        for month, data in parts.items():
+            if any(d.get('id') == record_id for d in data):
+                return month
+        for rebuild in (False, True):
+            if rebuild:
+                self._id_months.pop(collection, None)
+            month = self._month_ids(collection).get(record_id)
+            if month is not None and any(d.get('id') == record_id for d in load(month)):
+                return month
+        return None
+
+    def _stage(self, mutations: List[Mutation]) -> Tuple[Dict[str, List[Dict]], List[Tuple[str, Any, Any]]]:
+        updates, changes = super()._stage([m for m in mutations if m.collection not in self.PARTITIONED])
+        touched: Dict[str, Dict[str, List[Dict]]] = {}  # collection -> month -> records
+        for m in mutations:
+            if m.collection not in self.PARTITIONED:
+                continue
+            parts = touched.setdefault(m.collection, {})
+
+            def load(month, collection=m.collection, parts=parts):
+                if month not in parts:
+                    key = self._partition_key(collection, month)
+                    parts[month] = self._read_json(key) if os.path.exists(self.files[key]) else []
+                return parts[month]
+
+            model = RECORD_TYPES[m.collection]
+            if m.kind == "add":
+                load(month_of(m.record)).append(m.record.__dict__)
+                changes.append((m.collection, None, m.record))
+                continue
+            new_month = month_of(m.record) if m.kind == "update" else None
+            month = self._locate(m.collection, m.id, parts, load, hint=new_month)
+            if month is None:
+                continue
+            if m.kind == "update":
+                data = parts[month]
+                i = next(i for i, d in enumerate(data) if d.get('id') == m.id)
+                changes.append((m.collection, model(**data[i]), m.record))
+                if month == new_month:
+                    data[i] = m.record.__dict__
+                else:
+                    del data[i]
+                    load(new_month).append(m.record.__dict__)
+            else:
+                parts[month], removed = _split_by(parts[month], 'id', m.id)
+                changes.extend((m.collection, model(**d), None) for d in removed)
+
+        for collection, parts in touched.items():
+            entries = {e["month"]: e for e in self._manifest(collection, self._read_json)}
+            for month, data in parts.items():
+                updates[self._partition_key(collection, month)] = data
+                entry = summarize(month, data, TOTAL_FIELDS[collection])
+                if entry["count"]:
+                    entries[month] = entry
+                else:
+                    # Still written empty, so later reads in a group commit see it; removed once committed
+                    entries.pop(month, None)
+                    self._emptied.add(self._partition_key(collection, month))
+            updates[self._partition_key(collection, MANIFEST)] = [entries[k] for k in sorted(entries)]
+            ids = self._id_months.get(collection)
+            if ids is not None:
+                ids.update((d.get('id'), month) for month, data in parts.items() for d in data)
+        return updates, changes
+
+    # Partitioned collections go through _commit, so each write touches only its months
+    def add_milk_sale(self, sale: MilkSale) -> None:
+        self._commit([Mutation("add", "milk_sales", sale)])
+
+    def add_milk_sales(self, sales: List[MilkSale]) -> None:
+        self._commit([Mutation("add", "milk_sales", s) for s in sales])
+
+    def update_milk_sale(self, sale: MilkSale) -> None:
+        self._commit([Mutation("update", "milk_sales", sale)])
+
+    def delete_milk_sale(self, sale_id: str) -> None:
+        self._commit([Mutation("delete", "milk_sales", record_id=sale_id)])
+
+    def add_daily_yield(self, yield_record: DailyYield) -> None:
+        self._commit([Mutation("add", "daily_yields", yield_record)])
+
+    def update_daily_yield(self, yield_record: DailyYield) -> None:
+        self._commit([Mutation("update", "daily_yields", yield_record)])
+
+    def delete_daily_yield(self, yield_id: str) -> None:
+        self._commit([Mutation("delete", "daily_yields", record_id=yield_id)])
+
+    def add_cow_event(self, event: CowEvent) -> None:
+        self._commit([Mutation("add", "cow_events", event)])
+
+    def update_cow_event(self, event: CowEvent) -> None:
+        self._commit([Mutation("update", "cow_events", event)])
+
+    def delete_cow_event(self, event_id: str) -> None:
+        self._commit([Mutation("delete", "cow_events", record_id=event_id)])
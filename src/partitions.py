@@ -0,0 +1,64 @@
+"""Month partitions for date-keyed collections: partition names, per-month summaries and date-range tests."""
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Collection -> numeric fields totalled per month (in partition manifests and month totals)
+TOTAL_FIELDS = {
+    "milk_sales": ("quantity", "total_amount"),
+    "daily_yields": ("quantity",),
+    "cow_events": ("cost",),
+}
+# Partition for records whose date has no YYYY-MM prefix
+UNDATED = "undated"
+_MONTH = re.compile(r"\d{4}-\d{2}")
+
+
+def _date(record) -> str:
+    value = record.get("date") if isinstance(record, dict) else getattr(record, "date", None)
+    return str(value or "")
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def month_of(record) -> str:
+    """``YYYY-MM`` partition of a record (model or raw dict)."""
+    day = _date(record)
+    return day[:7] if _MONTH.match(day) else UNDATED
+
+
+def summarize(month: str, records: List[Dict], fields: Iterable[str]) -> Dict[str, Any]:
+    """Manifest entry for one partition's raw records."""
+    dates = [_date(d) for d in records]
+    return {
+        "month": month,
+        "min_date": min(dates, default=""),
+        "max_date": max(dates, default=""),
+        "count": len(records),
+        "totals": {f: sum(_number(d.get(f)) for d in records) for f in fields},
+    }
+
+
+def overlaps(entry: Dict[str, Any], start: Optional[str], end: Optional[str]) -> bool:
+    return (start is None or entry["max_date"] >= start) and (end is None or entry["min_date"] <= end)
+
+
+def in_date_range(records: Iterable, start: Optional[str], end: Optional[str]) -> List:
+    """Records dated within ``start``..``end`` (inclusive ISO strings; None leaves that side open)."""
+    return [r for r in records if (start is None or _date(r) >= start) and (end is None or _date(r) <= end)]
+
+
+def month_totals(records: Iterable, fields: Iterable[str]) -> Dict[str, Dict[str, float]]:
+    """``month -> {"count": n, field: total, ...}`` over model records."""
+    fields = tuple(fields)
+    totals: Dict[str, Dict[str, float]] = {}
+    for r in records:
+        month = totals.setdefault(month_of(r), {"count": 0, **{f: 0.0 for f in fields}})
+        month["count"] += 1
+        for f in fields:
+            month[f] += _number(getattr(r, f, None))
+    return totals
@@ -0,0 +1,165 @@
+"""Report summaries as pandas group-bys over columnar data (no Streamlit dependency).
+
+Frames use the model field names as columns; dates are ISO strings, so ranges are string comparisons.
+"""
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from src.models import Expense, MilkSale, DailyYield, CowEvent
+
+DAILY_COLUMNS = ["Date", "Production (L)", "Milk (L)", "Milk Revenue", "Expenses", "Net Profit"]
+MONTHLY_COLUMNS = ["Month", "Production (L)", "Milk (L)", "Milk Revenue", "Expenses", "Net Profit"]
+BUYER_COLUMNS = ["Buyer", "Total Litres", "Total Revenue"]
+COW_COLUMNS = ["Cow ID", "Yield (L)", "Direct Expenses"]
+
+
+def records_frame(records: Iterable, model: type, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Columnar DataFrame from a list of model instances (one column per field)."""
+    names = columns or [f.name for f in fields(model)]
+    records = list(records)
+    return pd.DataFrame({n: [getattr(r, n) for r in records] for n in names}, columns=names)
+
+
+# Collection -> the columns the report functions read from its frame
+FRAME_COLUMNS = {
+    "milk_sales": ["date", "buyer_name", "quantity", "rate", "total_amount"],
+    "expenses": ["date", "amount", "cow_id"],
+    "daily_yields": ["date", "quantity"],
+    "cow_events": ["date", "cow_id", "event_type", "value"],
+}
+
+
+def sales_frame(sales: Iterable[MilkSale]) -> pd.DataFrame:
+    return records_frame(sales, MilkSale, FRAME_COLUMNS["milk_sales"])
+
+
+def expenses_frame(expenses: Iterable[Expense]) -> pd.DataFrame:
+    return records_frame(expenses, Expense, FRAME_COLUMNS["expenses"])
+
+
+def yields_frame(yields: Iterable[DailyYield]) -> pd.DataFrame:
+    return records_frame(yields, DailyYield, FRAME_COLUMNS["daily_yields"])
+
+
+def events_frame(events: Iterable[CowEvent]) -> pd.DataFrame:
+    return records_frame(events, CowEvent, FRAME_COLUMNS["cow_events"])
+
+
+def _in_range(df: pd.DataFrame, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    if start is None and end is None:
+        return df
+    dates = df["date"].astype(str)
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= dates >= start
+    if end is not None:
+        mask &= dates <= end
+    return df[mask]
+
+
+def _combine(parts: List[pd.Series], names: List[str]) -> pd.DataFrame:
+    """Outer-join per-key sums into one frame, zero-filling keys missing from a source."""
+    combined = pd.concat(parts, axis=1, keys=names, sort=False).fillna(0.0)
+    combined["Net Profit"] = combined["Milk Revenue"] - combined["Expenses"]
+    return combined
+
+
+def daily_summary(sales: pd.DataFrame, expenses: pd.DataFrame, yields: pd.DataFrame,
+                  start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Production, sales, revenue and expenses per date within ``start``..``end``."""
+    sales = _in_range(sales, start, end)
+    expenses = _in_range(expenses, start, end)
+    yields = _in_range(yields, start, end)
+    if sales.empty and expenses.empty and yields.empty:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    by_sale_date = sales.groupby("date")[["quantity", "total_amount"]].sum()
+    combined = _combine(
+        [yields.groupby("date")["quantity"].sum(), by_sale_date["quantity"],
+         by_sale_date["total_amount"], expenses.groupby("date")["amount"].sum()],
+        ["Production (L)", "Milk (L)", "Milk Revenue", "Expenses"],
+    )
+    combined = combined.sort_index().rename_axis("Date").reset_index()
+    return combined[DAILY_COLUMNS]
+
+
+def _month_keys(df: pd.DataFrame) -> pd.Series:
+    """``YYYY-MM`` per row; rows with unparseable dates get NaN and drop out of group-bys."""
+    # Parse each distinct date once: a multi-year history has a few thousand dates but millions of rows
+    codes, uniques = pd.factorize(df["date"])
+    months = pd.to_datetime(pd.Series(uniques, dtype=object), format="ISO8601", errors="coerce").dt.strftime("%Y-%m")
+    keys = months.to_numpy(dtype=object)[codes] if len(uniques) else np.array([], dtype=object)
+    keys[codes < 0] = np.nan
+    return pd.Series(keys, index=df.index)
+
+
+def _monthly_table(production: pd.Series, milk: pd.Series, revenue: pd.Series, expenses: pd.Series) -> pd.DataFrame:
+    combined = _combine([production, milk, revenue, expenses], ["Production (L)", "Milk (L)", "Milk Revenue", "Expenses"])
+    combined = combined.sort_index(ascending=False)
+    month_names = pd.to_datetime(combined.index, format="%Y-%m").strftime("%B %Y")
+    combined.insert(0, "Month", month_names)
+    return combined.reset_index(drop=True)[MONTHLY_COLUMNS]
+
+
+def monthly_summary(sales: pd.DataFrame, expenses: pd.DataFrame, yields: pd.DataFrame) -> pd.DataFrame:
+    """Full-history monthly totals, newest month first."""
+    if sales.empty and expenses.empty and yields.empty:
+        return pd.DataFrame(columns=MONTHLY_COLUMNS)
+
+    sale_months = sales.groupby(_month_keys(sales))[["quantity", "total_amount"]].sum()
+    return _monthly_table(yields.groupby(_month_keys(yields))["quantity"].sum(), sale_months["quantity"],
+                          sale_months["total_amount"], expenses.groupby(_month_keys(expenses))["amount"].sum())
+
+
+def _totals_series(totals: Dict[str, Dict[str, float]], field: str) -> pd.Series:
+    series = pd.Series({month: t[field] for month, t in totals.items() if t["count"]}, dtype=float)
+    # Only real YYYY-MM months, as monthly_summary drops rows whose date does not parse
+    return series[pd.to_datetime(series.index, format="%Y-%m", errors="coerce").notna()]
+
+
+def monthly_summary_from_totals(sales_totals: Dict[str, Dict[str, float]], yield_totals: Dict[str, Dict[str, float]],
+                                expenses: pd.DataFrame) -> pd.DataFrame:
+    """``monthly_summary`` with sales and production from per-month totals (``DataManager.get_month_totals``)."""
+    milk, revenue = _totals_series(sales_totals, "quantity"), _totals_series(sales_totals, "total_amount")
+    production = _totals_series(yield_totals, "quantity")
+    if milk.empty and production.empty and expenses.empty:
+        return pd.DataFrame(columns=MONTHLY_COLUMNS)
+    return _monthly_table(production, milk, revenue, expenses.groupby(_month_keys(expenses))["amount"].sum())
+
+
+def buyer_summary(sales: pd.DataFrame, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Litres and revenue per buyer within ``start``..``end``."""
+    sales = _in_range(sales, start, end)
+    if sales.empty:
+        return pd.DataFrame(columns=BUYER_COLUMNS)
+    summary = sales.groupby("buyer_name")[["quantity", "total_amount"]].sum().reset_index()
+    summary.columns = BUYER_COLUMNS
+    return summary
+
+
+def parse_yield_litres(values: pd.Series) -> pd.Series:
+    """Litres from free-text yield values such as ``"12.5L"``; NaN when not numeric."""
+    cleaned = values.astype(str).str.lower().str.replace("l", "", regex=False)
+    cleaned = cleaned.str.replace("litres", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def cow_summary(events: pd.DataFrame, expenses: pd.DataFrame,
+                start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Recorded yield and directly linked expenses per cow within ``start``..``end``."""
+    events = _in_range(events, start, end)
+    expenses = _in_range(expenses, start, end)
+
+    yield_events = events[events["event_type"] == "Yield"]
+    litres = parse_yield_litres(yield_events["value"])
+    yield_events = yield_events.assign(litres=litres)[litres.notna()]
+    linked = expenses[expenses["cow_id"].fillna("").astype(str) != ""]
+    if yield_events.empty and linked.empty:
+        return pd.DataFrame(columns=COW_COLUMNS)
+
+    combined = pd.concat(
+        [yield_events.groupby("cow_id")["litres"].sum(), linked.groupby("cow_id")["amount"].sum()],
+        axis=1, keys=["Yield (L)", "Direct Expenses"], sort=False,
+    ).fillna(0.0)
+    return combined.rename_axis("Cow ID").reset_index()[COW_COLUMNS]
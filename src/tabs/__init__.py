@@ -1,4 +1,5 @@
 # Tabs module for Dairy Manager
-from . import dashboard, expenses, milk_sales, cows, reports
+# Submodules are imported on first use (``from src.tabs import reports``) so that
+# starting the app does not pay for tabs, and their dependencies, it never opens.
 
-__all__ = ['dashboard', 'expenses', 'milk_sales', 'cows', 'reports']
\ No newline at end of file
+__all__ = ['dashboard', 'expenses', 'milk_sales', 'cows', 'reports']
@@ -1,8 +1,9 @@
 import streamlit as st
 from src.data_manager import DataManager
 from src.models import Cow, CowEvent, Expense
+from src.ui_components import EnhancedDataTable
+from src.ui_components.fragment_utils import rerun_fragment
 from datetime import date, datetime
-import pandas as pd
 import uuid
 
 def render(dm: DataManager):
@@ -166,61 +167,71 @@ def render(dm: DataManager):
         if 'cev_notes' not in st.session_state: st.session_state.cev_notes = ""
         if 'cev_next_due' not in st.session_state: st.session_state.cev_next_due = None
 
-        st.markdown("#### Record Event / Yield")
-        
-        with st.form("cow_event_form", clear_on_submit=False):
-            col1, col2 = st.columns(2)
-            with col1:
-                ev_d_val = st.session_state.cev_date if st.session_state.cev_edit_mode else date.today()
-                ev_date = st.date_input("Date", value=ev_d_val)
-                
-                types = ["Yield", "Vaccination", "Doctor Visit", "Other"]
-                t_idx = types.index(st.session_state.cev_type) if st.session_state.cev_type in types else 0
-                ev_type = st.selectbox("Event Type", types, index=t_idx)
-            with col2:
-                v_val = st.session_state.cev_val if st.session_state.cev_edit_mode else ""
-                ev_value = st.text_input("Value", value=v_val, placeholder="e.g., 12.5 Litres")
-                
-                c_val = st.session_state.cev_cost if st.session_state.cev_edit_mode else 0.0
-                ev_cost = st.number_input("Cost (if any)", min_value=0.0, step=10.0, value=float(c_val))
-            
-            n_val = st.session_state.cev_next_due if st.session_state.cev_next_due else None
-            ev_next_due = st.date_input("Next Due Date", value=n_val)
-            
-            note_val = st.session_state.cev_notes if st.session_state.cev_edit_mode else ""
-            ev_notes = st.text_input("Notes", value=note_val)
-            
-            btn_txt = "Update Record" if st.session_state.cev_edit_mode else "Save Record"
-            ev_submit = st.form_submit_button(btn_txt)
-            
-            if ev_submit:
-                if not ev_value:
-                    st.error("Value required.")
+        cow_event_form(dm, selected_cow)
+
+        cow_event_history(dm, selected_cow)
+
+
+@st.fragment
+def cow_event_form(dm: DataManager, selected_cow: Cow):
+    """Event / yield form for one cow; inputs rerun only this fragment."""
+    st.markdown("#### Record Event / Yield")
+
+    with st.form("cow_event_form", clear_on_submit=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            ev_d_val = st.session_state.cev_date if st.session_state.cev_edit_mode else date.today()
+            ev_date = st.date_input("Date", value=ev_d_val)
+
+            types = ["Yield", "Vaccination", "Doctor Visit", "Other"]
+            t_idx = types.index(st.session_state.cev_type) if st.session_state.cev_type in types else 0
+            ev_type = st.selectbox("Event Type", types, index=t_idx)
+        with col2:
+            v_val = st.session_state.cev_val if st.session_state.cev_edit_mode else ""
+            ev_value = st.text_input("Value", value=v_val, placeholder="e.g., 12.5 Litres")
+
+            c_val = st.session_state.cev_cost if st.session_state.cev_edit_mode else 0.0
+            ev_cost = st.number_input("Cost (if any)", min_value=0.0, step=10.0, value=float(c_val))
+
+        n_val = st.session_state.cev_next_due if st.session_state.cev_next_due else None
+        ev_next_due = st.date_input("Next Due Date", value=n_val)
+
+        note_val = st.session_state.cev_notes if st.session_state.cev_edit_mode else ""
+        ev_notes = st.text_input("Notes", value=note_val)
+
+        btn_txt = "Update Record" if st.session_state.cev_edit_mode else "Save Record"
+        ev_submit = st.form_submit_button(btn_txt)
+
+        if ev_submit:
+            if not ev_value:
+                st.error("Value required.")
+            else:
+                new_id = st.session_state.cev_edit_id if st.session_state.cev_edit_mode else str(uuid.uuid4())
+
+                new_event = CowEvent(
+                    id=new_id,
+                    date=ev_date.isoformat(),
+                    cow_id=selected_cow.name,
+                    event_type=ev_type,
+                    value=ev_value,
+                    cost=ev_cost,
+                    next_due_date=ev_next_due.isoformat() if ev_next_due else None,
+                    notes=ev_notes
+                )
+
+                if st.session_state.cev_edit_mode:
+                    dm.update_cow_event(new_event)
+                    st.success("Updated.")
                 else:
-                    new_id = st.session_state.cev_edit_id if st.session_state.cev_edit_mode else str(uuid.uuid4())
-                    
-                    new_event = CowEvent(
-                        id=new_id,
-                        date=ev_date.isoformat(),
-                        cow_id=selected_cow.name,
-                        event_type=ev_type,
-                        value=ev_value,
-                        cost=ev_cost,
-                        next_due_date=ev_next_due.isoformat() if ev_next_due else None,
-                        notes=ev_notes
-                    )
-                    
-                    if st.session_state.cev_edit_mode:
-                        dm.update_cow_event(new_event)
-                        st.success("Updated.")
-                    else:
-                        dm.add_cow_event(new_event)
+                    # The event and its expense are written together, or not at all
+                    with dm.unit_of_work() as uow:
+                        uow.add("cow_events", new_event)
                         # Auto-add expense logic only on CREATE, not UPDATE to avoid dupes/confusion?
                         # Or checking if cost changed? simpler: only on create.
                         if ev_cost > 0:
                             # Add expense logic
                             expense_desc = f"Cow {selected_cow.name} - {ev_type}: {ev_value}"
-                            new_expense = Expense(
+                            uow.add("expenses", Expense(
                                 id=str(uuid.uuid4()),
                                 date=ev_date.isoformat(),
                                 name=f"Cow Expense - {ev_type}",
@@ -228,87 +239,75 @@ def render(dm: DataManager):
                                 amount=ev_cost,
                                 is_recurring=False,
                                 cow_id=selected_cow.name
-                            )
-                            dm.add_expense(new_expense)
-                            st.success(f"Event recorded AND ₹{ev_cost} added to Expenses.")
-                        else:
-                            st.success("Event recorded.")
-                    
-                    # Reset
-                    st.session_state.cev_edit_mode = False
-                    st.session_state.cev_edit_id = None
-                    st.session_state.cev_val = ""
-                    st.session_state.cev_cost = 0.0
-                    st.session_state.cev_notes = ""
-                    st.session_state.cev_next_due = None
-                    st.rerun()
+                            ))
+                    if ev_cost > 0:
+                        st.success(f"Event recorded AND ₹{ev_cost} added to Expenses.")
+                    else:
+                        st.success("Event recorded.")
 
-        if st.session_state.cev_edit_mode:
-            if st.button("Cancel Edit", key="cancel_cev"):
+                # Reset
                 st.session_state.cev_edit_mode = False
                 st.session_state.cev_edit_id = None
-                # Reset...
+                st.session_state.cev_val = ""
+                st.session_state.cev_cost = 0.0
+                st.session_state.cev_notes = ""
+                st.session_state.cev_next_due = None
                 st.rerun()
 
-        # History Table (With Edit/Delete)
-        st.markdown("#### History")
-        all_events = dm.get_cow_events()
-        cow_events = [e for e in all_events if e.cow_id == selected_cow.name]
-        
-        if cow_events:
-            # Sort
-            cow_events = sorted(cow_events, key=lambda x: x.date, reverse=True)
-            
-            # Mobile-friendly card layout
-            for ev in cow_events:
-                with st.container():
-                    col1, col2 = st.columns([4, 1])
-                    with col1:
-                        st.markdown(f"**{ev.date}** | {ev.event_type}")
-                        st.caption(f"Value: {ev.value}")
-                        if ev.cost > 0:
-                            st.caption(f"Cost: ₹{ev.cost}")
-                        if ev.notes:
-                            st.caption(f"Notes: {ev.notes}")
-                        if ev.next_due_date:
-                            st.caption(f"Next Due: {ev.next_due_date}")
-                    with col2:
-                        # Right-aligned action buttons with responsive design
-                        button_col1, button_col2 = st.columns(2)
-                        with button_col1:
-                            edit_clicked = st.button("✏️", key=f"ed_cev_{ev.id}", help="Edit", width="stretch")
-                        with button_col2:
-                            delete_clicked = st.button("🗑️", key=f"del_cev_{ev.id}", help="Delete", width="stretch")
-                        
-                        # Handle edit button click
-                        if edit_clicked:
-                            st.session_state.cev_edit_mode = True
-                            st.session_state.cev_edit_id = ev.id
-                            try:
-                                st.session_state.cev_date = datetime.fromisoformat(ev.date).date()
-                            except (ValueError, AttributeError):
-                                st.session_state.cev_date = date.today()
-                            st.session_state.cev_type = ev.event_type
-                            st.session_state.cev_val = ev.value
-                            st.session_state.cev_cost = ev.cost
-                            st.session_state.cev_notes = ev.notes
-                            if ev.next_due_date:
-                                try:
-                                    st.session_state.cev_next_due = datetime.fromisoformat(ev.next_due_date).date()
-                                except (ValueError, AttributeError):
-                                    st.session_state.cev_next_due = None
-                            st.rerun()
-                        
-                        # Handle delete button click
-                        if delete_clicked:
-                            if st.session_state.get(f"confirm_del_event_{ev.id}", False):
-                                dm.delete_cow_event(ev.id)
-                                st.success("Cow event deleted!")
-                                st.rerun()
-                            else:
-                                st.session_state[f"confirm_del_event_{ev.id}"] = True
-                                st.warning("Click again to confirm deletion")
-                                st.rerun()
-                    st.divider()
-        else:
-            st.info("No records found for this cow.")
+    if st.session_state.cev_edit_mode:
+        if st.button("Cancel Edit", key="cancel_cev"):
+            st.session_state.cev_edit_mode = False
+            st.session_state.cev_edit_id = None
+            # Reset...
+            rerun_fragment()
+
+
+@st.fragment
+def cow_event_history(dm: DataManager, selected_cow: Cow):
+    """Event history for one cow; reads only the cow_events collection."""
+    # History Table (With Edit/Delete)
+    st.markdown("#### History")
+    all_events = dm.get_cow_events()
+    cow_events = [e for e in all_events if e.cow_id == selected_cow.name]
+
+    if cow_events:
+        grid_key = f"cev_hist_{selected_cow.id}"
+        selected = EnhancedDataTable.select_rows(cow_events, {
+            "Date": lambda ev: ev.date,
+            "Event": lambda ev: ev.event_type,
+            "Value": lambda ev: ev.value,
+            "Cost": lambda ev: ev.cost,
+            "Next Due": lambda ev: ev.next_due_date or "",
+            "Notes": lambda ev: ev.notes,
+        }, key=grid_key)
+        edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key=grid_key)
+
+        # Handle edit button click
+        if edit_clicked:
+            ev = selected[0]
+            st.session_state.cev_edit_mode = True
+            st.session_state.cev_edit_id = ev.id
+            try:
+                st.session_state.cev_date = datetime.fromisoformat(ev.date).date()
+            except (ValueError, AttributeError):
+                st.session_state.cev_date = date.today()
+            st.session_state.cev_type = ev.event_type
+            st.session_state.cev_val = ev.value
+            st.session_state.cev_cost = ev.cost
+            st.session_state.cev_notes = ev.notes
+            if ev.next_due_date:
+                try:
+                    st.session_state.cev_next_due = datetime.fromisoformat(ev.next_due_date).date()
+                except (ValueError, AttributeError):
+                    st.session_state.cev_next_due = None
+            st.rerun()
+
+        # Delete the selected events in one commit once confirmed
+        if delete_confirmed:
+            with dm.unit_of_work() as uow:
+                for ev in selected:
+                    uow.delete("cow_events", ev.id)
+            EnhancedDataTable.reset_selection(grid_key)
+            rerun_fragment()
+    else:
+        st.info("No records found for this cow.")
@@ -1,9 +1,9 @@
 import streamlit as st
 from src.data_manager import DataManager
 from src.models import Expense
-from src.ui_components import EnhancedDataTable, RowNumberFormatter
+from src.ui_components import EnhancedDataTable
+from src.ui_components.fragment_utils import rerun_fragment
 from datetime import date, datetime
-import pandas as pd
 import uuid
 
 def render(dm: DataManager):
@@ -22,6 +22,16 @@ def render(dm: DataManager):
     if 'exp_rec_type' not in st.session_state: st.session_state.exp_rec_type = "Monthly"
     if 'exp_next_due' not in st.session_state: st.session_state.exp_next_due = None
 
+    expense_form(dm)
+
+    st.divider()
+
+    expense_history(dm)
+
+
+@st.fragment
+def expense_form(dm: DataManager):
+    """Add / edit form; typing reruns only this fragment."""
     # --- Add / Edit Form ---
     form_title = "Edit Expense" if st.session_state.exp_edit_mode else "Add New Expense"
     with st.expander(form_title, expanded=True):
@@ -107,56 +117,55 @@ def render(dm: DataManager):
                     st.session_state.exp_desc = ""
                     st.session_state.exp_is_recurring = False
                     st.session_state.exp_date = date.today()
-                    st.rerun()
+                    rerun_fragment()
 
 
-    st.divider()
-
+@st.fragment
+def expense_history(dm: DataManager):
+    """Recent expenses list; reads only the expenses collection."""
     # --- History Management (Edit / Delete) ---
     st.subheader("Recent Expenses History")
     expenses = dm.get_expenses()
     
     if expenses:
-        # Sort desc by date
-        expenses = sorted(expenses, key=lambda x: x.date, reverse=True)
-        
-        # Show last 50 for performance with enhanced data table
-        for i, exp in enumerate(expenses[:50]):
-            row_number = RowNumberFormatter.get_row_number(i)
-            
-            # Use EnhancedDataTable for proper formatting and button positioning
-            edit_clicked, delete_clicked = EnhancedDataTable.render_expense_row(exp, row_number)
-            
-            # Handle edit button click
-            if edit_clicked:
-                st.session_state.exp_edit_mode = True
-                st.session_state.exp_edit_id = exp.id
-                # Populate state
+        # One selectable grid, newest first, one keyset page at a time
+        selected = EnhancedDataTable.select_rows(expenses, {
+            "Date": lambda e: e.date,
+            "Name": lambda e: e.name,
+            "Amount": lambda e: e.amount,
+            "Description": lambda e: e.description,
+            "Recurring": lambda e: f"{e.recurrence_type} (next {e.next_due_date or 'N/A'})" if e.is_recurring else "",
+        }, key="exp_hist")
+        edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key="exp_hist")
+
+        # Handle edit button click
+        if edit_clicked:
+            exp = selected[0]
+            st.session_state.exp_edit_mode = True
+            st.session_state.exp_edit_id = exp.id
+            # Populate state
+            try:
+                st.session_state.exp_date = datetime.fromisoformat(exp.date).date()
+            except (ValueError, AttributeError):
+                st.session_state.exp_date = date.today()
+            st.session_state.exp_name = exp.name
+            st.session_state.exp_amount = exp.amount
+            st.session_state.exp_desc = exp.description
+            st.session_state.exp_is_recurring = exp.is_recurring
+            st.session_state.exp_rec_type = exp.recurrence_type
+            if exp.next_due_date:
                 try:
-                    st.session_state.exp_date = datetime.fromisoformat(exp.date).date()
+                    st.session_state.exp_next_due = datetime.fromisoformat(exp.next_due_date).date()
                 except (ValueError, AttributeError):
-                    st.session_state.exp_date = date.today()
-                st.session_state.exp_name = exp.name
-                st.session_state.exp_amount = exp.amount
-                st.session_state.exp_desc = exp.description
-                st.session_state.exp_is_recurring = exp.is_recurring
-                st.session_state.exp_rec_type = exp.recurrence_type
-                if exp.next_due_date:
-                    try:
-                        st.session_state.exp_next_due = datetime.fromisoformat(exp.next_due_date).date()
-                    except (ValueError, AttributeError):
-                        st.session_state.exp_next_due = None
-                st.rerun()
-            
-            # Handle delete button click with confirmation
-            if delete_clicked:
-                if st.session_state.get(f"confirm_del_exp_{exp.id}", False):
-                    dm.delete_expense(exp.id)
-                    st.success("Expense deleted!")
-                    st.rerun()
-                else:
-                    st.session_state[f"confirm_del_exp_{exp.id}"] = True
-                    st.warning("Click again to confirm deletion")
-                    st.rerun()
+                    st.session_state.exp_next_due = None
+            st.rerun()
+
+        # Delete the selected rows in one commit once confirmed
+        if delete_confirmed:
+            with dm.unit_of_work() as uow:
+                for exp in selected:
+                    uow.delete("expenses", exp.id)
+            EnhancedDataTable.reset_selection("exp_hist")
+            rerun_fragment()
     else:
         st.info("No expenses recorded yet.")
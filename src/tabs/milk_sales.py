@@ -2,8 +2,8 @@ import streamlit as st
 from src.data_manager import DataManager
 from src.models import MilkSale, Payment, Buyer, DailyYield
 from src.ui_components import CalendarView, EnhancedDataTable, NavigationControls, RowNumberFormatter, SearchInterface, DateRangeSelector, DropdownDateSelector
+from src.ui_components.fragment_utils import rerun_fragment
 from datetime import date, datetime
-import pandas as pd
 import uuid
 
 def render(dm: DataManager):
@@ -48,92 +48,9 @@ def render(dm: DataManager):
     if 'dy_qty' not in st.session_state: st.session_state.dy_qty = 0.0
     if 'dy_notes' not in st.session_state: st.session_state.dy_notes = ""
 
-    with st.expander("Record Production", expanded=True):
-        with st.form("daily_yield_form", clear_on_submit=False): 
-            col1, col2 = st.columns(2)
-            with col1:
-                d_val = st.session_state.dy_date if st.session_state.dy_edit_mode else date.today()
-                dy_date = st.date_input("Date", value=d_val)
-            with col2:
-                q_val = st.session_state.dy_qty if st.session_state.dy_edit_mode else 0.0
-                dy_qty = st.number_input("Quantity (Litres)", min_value=0.0, step=0.1, value=float(q_val))
-            
-            n_val = st.session_state.dy_notes if st.session_state.dy_edit_mode else ""
-            dy_notes = st.text_input("Notes", value=n_val)
-            
-            btn_txt = "Update Record" if st.session_state.dy_edit_mode else "Record Production"
-            submitted = st.form_submit_button(btn_txt)
-            
-            if submitted:
-                if dy_qty > 0:
-                    new_id = st.session_state.dy_edit_id if st.session_state.dy_edit_mode else str(uuid.uuid4())
-                    
-                    new_yield = DailyYield(
-                        id=new_id,
-                        date=dy_date.isoformat(),
-                        quantity=dy_qty,
-                        notes=dy_notes
-                    )
-                    
-                    if st.session_state.dy_edit_mode:
-                        dm.update_daily_yield(new_yield)
-                        st.success("Updated.")
-                    else:
-                        dm.add_daily_yield(new_yield)
-                        st.success("Recorded.")
-                    
-                    st.session_state.dy_edit_mode = False
-                    st.session_state.dy_edit_id = None
-                    st.session_state.dy_qty = 0.0
-                    st.session_state.dy_notes = ""
-                    st.rerun()
-                else:
-                    st.error("Quantity > 0 required.")
-        
-        if st.session_state.dy_edit_mode:
-            if st.button("Cancel Edit", key="cancel_dy"):
-                st.session_state.dy_edit_mode = False
-                st.session_state.dy_edit_id = None
-                st.session_state.dy_qty = 0.0
-                st.session_state.dy_notes = ""
-                st.rerun()
+    production_form(dm)
 
-    # Expandable History for Daily Yields (With Edit) - Enhanced formatting
-    with st.expander("Production History (All Time)"):
-        all_daily_yields_sorted = sorted(all_daily_yields, key=lambda x: x.date, reverse=True)
-        if all_daily_yields_sorted:
-            for i, y in enumerate(all_daily_yields_sorted):
-                row_number = RowNumberFormatter.get_row_number(i)
-                
-                # Use EnhancedDataTable for consistent formatting
-                edit_clicked, delete_clicked = EnhancedDataTable.render_transaction_row(
-                    y, row_number, "yield"
-                )
-                
-                # Handle edit button click
-                if edit_clicked:
-                    st.session_state.dy_edit_mode = True
-                    st.session_state.dy_edit_id = y.id
-                    try:
-                        st.session_state.dy_date = datetime.fromisoformat(y.date).date()
-                    except (ValueError, AttributeError):
-                        st.session_state.dy_date = date.today()
-                    st.session_state.dy_qty = y.quantity
-                    st.session_state.dy_notes = y.notes
-                    st.rerun()
-                
-                # Handle delete button click
-                if delete_clicked:
-                    if st.session_state.get(f"confirm_del_yield_{y.id}", False):
-                        dm.delete_daily_yield(y.id)
-                        st.success("Production record deleted!")
-                        st.rerun()
-                    else:
-                        st.session_state[f"confirm_del_yield_{y.id}"] = True
-                        st.warning("Click again to confirm deletion")
-                        st.rerun()
-        else:
-            st.info("No records found.")
+    production_history(dm)
 
     st.divider()
 
@@ -159,36 +76,33 @@ def render(dm: DataManager):
         st.subheader("Existing Buyers")
         buyers = dm.get_buyers()
         if buyers:
-            for i, b in enumerate(buyers):
-                row_number = RowNumberFormatter.get_row_number(i)
-                
-                # Use EnhancedDataTable for consistent formatting and clickable names
-                edit_clicked, delete_clicked, name_clicked = EnhancedDataTable.render_buyer_row(b, row_number)
-                
-                # Handle buyer name click - open calendar view
-                if name_clicked:
-                    st.session_state.selected_buyer_for_calendar = b.name
-                    st.session_state.buyer_calendar_view = True
-                    st.rerun()
-                
-                # Handle edit button click
-                if edit_clicked:
-                    # Pre-populate the form with existing buyer data
-                    st.session_state.new_buyer_name = b.name
-                    st.session_state.new_buyer_rate = b.default_rate
-                    st.info(f"Editing {b.name} - update the form above")
-                    st.rerun()
-                
-                # Handle delete button click
-                if delete_clicked:
-                    if st.session_state.get(f"confirm_del_buyer_{b.name}", False):
-                        dm.delete_buyer(b.name)
-                        st.success(f"Buyer {b.name} deleted!")
-                        st.rerun()
-                    else:
-                        st.session_state[f"confirm_del_buyer_{b.name}"] = True
-                        st.warning("Click again to confirm deletion")
-                        st.rerun()
+            selected = EnhancedDataTable.select_rows(buyers, {
+                "Buyer": lambda b: b.name,
+                "Rate/L": lambda b: b.default_rate,
+            }, key="buyer_list", page_size=None)
+
+            # Open the selected buyer's calendar view
+            if st.button("📊 Open Ledger", key="buyer_list_open", disabled=len(selected) != 1):
+                st.session_state.selected_buyer_for_calendar = selected[0].name
+                st.session_state.buyer_calendar_view = True
+                st.rerun()
+
+            edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key="buyer_list")
+
+            # Handle edit button click
+            if edit_clicked:
+                # Pre-populate the form with existing buyer data
+                b = selected[0]
+                st.session_state.new_buyer_name = b.name
+                st.session_state.new_buyer_rate = b.default_rate
+                st.info(f"Editing {b.name} - update the form above")
+                st.rerun()
+
+            # Delete the selected buyers in one commit once confirmed
+            if delete_confirmed:
+                dm.delete_buyers([b.name for b in selected])
+                EnhancedDataTable.reset_selection("buyer_list")
+                st.rerun()
 
     st.divider()
 
@@ -212,148 +126,13 @@ def render(dm: DataManager):
     tab1, tab2, tab3 = st.tabs(["Daily Entry", "Payments/Advances", "Buyer Ledgers"])
 
     with tab1:
-        st.subheader("Record Milk Sale")
-        
-        if not st.session_state.sale_edit_mode:
-            # Normal Flow
-            sel_buyer = st.selectbox("Select Buyer", buyer_names, key="s_buyer_sel")
-            current_buyer = next((b for b in buyers if b.name == sel_buyer), None)
-            def_rate = current_buyer.default_rate if current_buyer else 0.0
+        entry_mode = st.radio("Entry Mode", ["Single Sale", "Whole Day"], horizontal=True, key="sale_entry_mode")
+        if entry_mode == "Whole Day":
+            day_sales_grid(dm)
         else:
-            # Edit Flow
-            try:
-                b_idx = buyer_names.index(st.session_state.sale_buyer)
-            except: b_idx = 0
-            sel_buyer = st.selectbox("Select Buyer", buyer_names, index=b_idx, key="s_buyer_sel_edit")
-            def_rate = st.session_state.sale_rate 
-            
-        with st.form("sale_form"):
-            col1, col2 = st.columns(2)
-            with col1:
-                d_val = st.session_state.sale_date if st.session_state.sale_edit_mode else date.today()
-                s_date = st.date_input("Date", value=d_val)
-                q_val = st.session_state.sale_qty if st.session_state.sale_edit_mode else 0.0
-                s_qty = st.number_input("Quantity (Litres)", min_value=0.0, step=0.1, value=float(q_val))
-            
-            with col2:
-                r_val = def_rate
-                s_rate = st.number_input("Rate (INR/L)", value=float(r_val), step=0.5)
-            
-            btn_txt = "Update Sale" if st.session_state.sale_edit_mode else "Record Sale"
-            submit = st.form_submit_button(btn_txt)
-            
-            if submit:
-                if s_qty > 0 and s_rate > 0:
-                    total = s_qty * s_rate
-                    new_id = st.session_state.sale_edit_id if st.session_state.sale_edit_mode else str(uuid.uuid4())
-                    
-                    sale = MilkSale(
-                        id=new_id,
-                        date=s_date.isoformat(),
-                        buyer_name=sel_buyer,
-                        quantity=s_qty,
-                        rate=s_rate,
-                        total_amount=total
-                    )
-                    
-                    if st.session_state.sale_edit_mode:
-                        dm.update_milk_sale(sale)
-                        st.success("Updated.")
-                    else:
-                        dm.add_milk_sale(sale)
-                        st.success("Recorded.")
-                    
-                    st.session_state.sale_edit_mode = False
-                    st.session_state.sale_edit_id = None
-                    st.session_state.sale_qty = 0.0
-                    st.rerun()
-                else:
-                    st.error("Invalid Input")
-        
-        if st.session_state.sale_edit_mode:
-            if st.button("Cancel Edit", key="cancel_sale"):
-                st.session_state.sale_edit_mode = False
-                st.session_state.sale_edit_id = None
-                st.session_state.sale_qty = 0.0
-                st.rerun()
+            sale_form(dm)
 
-        # Sales History with Dropdown Date Selector - Mobile-friendly approach
-        st.subheader("Sales History")
-        
-        # Convert sales data to calendar format
-        sales_calendar_data = []
-        for sale in all_sales:
-            sales_calendar_data.append({
-                'date': sale.date,
-                'buyer_name': sale.buyer_name,
-                'quantity': sale.quantity,
-                'rate': sale.rate,
-                'total_amount': sale.total_amount,
-                'id': sale.id
-            })
-        
-        # Initialize calendar view state
-        if 'sales_selected_date' not in st.session_state:
-            st.session_state.sales_selected_date = None
-        
-        # Use dropdown date selector instead of calendar
-        selected_date = DropdownDateSelector.render(
-            data_points=sales_calendar_data,
-            key_prefix="sales_dropdown"
-        )
-        
-        # Update session state if date is selected
-        if selected_date:
-            st.session_state.sales_selected_date = selected_date
-        
-        # Display transactions for selected date
-        if st.session_state.sales_selected_date:
-            st.subheader(f"Sales for {st.session_state.sales_selected_date}")
-            
-            # Filter sales for selected date
-            selected_sales = [s for s in all_sales if s.date == st.session_state.sales_selected_date]
-            
-            if selected_sales:
-                for i, sale in enumerate(selected_sales):
-                    row_number = RowNumberFormatter.get_row_number(i)
-                    
-                    # Use EnhancedDataTable for proper formatting and button positioning
-                    edit_clicked, delete_clicked = EnhancedDataTable.render_transaction_row(
-                        sale, row_number, "sale"
-                    )
-                    
-                    # Handle edit button click
-                    if edit_clicked:
-                        st.session_state.sale_edit_mode = True
-                        st.session_state.sale_edit_id = sale.id
-                        try:
-                            st.session_state.sale_date = datetime.fromisoformat(sale.date).date()
-                        except (ValueError, AttributeError):
-                            st.session_state.sale_date = date.today()
-                        st.session_state.sale_buyer = sale.buyer_name
-                        st.session_state.sale_qty = sale.quantity
-                        st.session_state.sale_rate = sale.rate
-                        st.rerun()
-                    
-                    # Handle delete button click
-                    if delete_clicked:
-                        if st.session_state.get(f"confirm_del_sale_{sale.id}", False):
-                            dm.delete_milk_sale(sale.id)
-                            st.success("Sale deleted!")
-                            st.rerun()
-                        else:
-                            st.session_state[f"confirm_del_sale_{sale.id}"] = True
-                            st.warning("Click again to confirm deletion")
-                            st.rerun()
-            else:
-                st.info(f"No sales recorded for {st.session_state.sales_selected_date}")
-            
-            # Clear selection button
-            if st.button("Clear Date Selection", key="clear_sales_date"):
-                st.session_state.sales_selected_date = None
-                st.rerun()
-        else:
-            st.info("Click on a date in the calendar above to view sales for that day.")
+        sales_history(dm)
 
     with tab2:
         st.subheader("Payments & Advances")
@@ -367,141 +146,9 @@ def render(dm: DataManager):
         if 'pay_amount' not in st.session_state: st.session_state.pay_amount = 0.0
         if 'pay_notes' not in st.session_state: st.session_state.pay_notes = ""
 
-        form_title = "Edit Payment" if st.session_state.pay_edit_mode else "Record Payment"
-        with st.expander(form_title, expanded=True):
-            if not st.session_state.pay_edit_mode:
-                p_buyer = st.selectbox("Buyer", buyer_names, key="pay_buyer_select")
-            else:
-                try:
-                    b_idx = buyer_names.index(st.session_state.pay_buyer)
-                except: b_idx = 0
-                p_buyer = st.selectbox("Buyer", buyer_names, index=b_idx, key="pay_buyer_select_edit")
-            
-            with st.form("pay_form"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    d_val = st.session_state.pay_date if st.session_state.pay_edit_mode else date.today()
-                    p_date = st.date_input("Date", value=d_val)
-                    t_val = st.session_state.pay_type if st.session_state.pay_edit_mode else "Payment"
-                    p_type = st.radio("Type", ["Payment", "Advance"], index=0 if t_val == "Payment" else 1)
-                with col2:
-                    a_val = st.session_state.pay_amount if st.session_state.pay_edit_mode else 0.0
-                    p_amount = st.number_input("Amount", min_value=0.0, step=100.0, value=float(a_val))
-                    n_val = st.session_state.pay_notes if st.session_state.pay_edit_mode else ""
-                    p_desc = st.text_input("Notes", value=n_val)
-                
-                btn_txt = "Update Payment" if st.session_state.pay_edit_mode else "Save Payment"
-                if st.form_submit_button(btn_txt):
-                    if p_amount > 0:
-                        new_id = st.session_state.pay_edit_id if st.session_state.pay_edit_mode else str(uuid.uuid4())
-                        
-                        payment = Payment(
-                            id=new_id,
-                            date=p_date.isoformat(),
-                            buyer_name=p_buyer,
-                            entry_type=p_type,
-                            amount=p_amount,
-                            notes=p_desc
-                        )
-                        
-                        if st.session_state.pay_edit_mode:
-                            dm.update_payment(payment)
-                            st.success("Payment updated!")
-                        else:
-                            dm.add_payment(payment)
-                            st.success("Payment saved!")
-                        
-                        # Reset state
-                        st.session_state.pay_edit_mode = False
-                        st.session_state.pay_edit_id = None
-                        st.session_state.pay_amount = 0.0
-                        st.session_state.pay_notes = ""
-                        st.rerun()
-                    else:
-                        st.error("Amount must be greater than 0")
-            
-            if st.session_state.pay_edit_mode:
-                if st.button("Cancel Edit", key="cancel_payment"):
-                    st.session_state.pay_edit_mode = False
-                    st.session_state.pay_edit_id = None
-                    st.session_state.pay_amount = 0.0
-                    st.session_state.pay_notes = ""
-                    st.rerun()
+        payment_form(dm)
 
-        # Payment History - Tabular Format
-        st.subheader("Payment History")
-        
-        # Get all payments
-        all_payments = dm.get_payments()
-        
-        if all_payments:
-            # Sort payments by date (most recent first)
-            sorted_payments = sorted(all_payments, key=lambda x: x.date, reverse=True)
-            
-            # Create table data
-            table_data = []
-            for i, payment in enumerate(sorted_payments):
-                row_number = RowNumberFormatter.get_row_number(i)
-                table_data.append({
-                    "S.No": row_number,
-                    "Date": payment.date,
-                    "Name": payment.buyer_name,
-                    "Payment Type": payment.entry_type,
-                    "Payment Amount": f"₹{payment.amount}",
-                    "Notes": payment.notes or "-"
-                })
-            
-            # Display table
-            df = pd.DataFrame(table_data)
-            st.dataframe(df, width="stretch", hide_index=True)
-            
-            # Edit/Delete functionality below the table
-            st.markdown("---")
-            st.subheader("Edit/Delete Payments")
-            
-            # Create buttons for each payment
-            for i, payment in enumerate(sorted_payments):
-                row_number = RowNumberFormatter.get_row_number(i)
-                
-                with st.container():
-                    col1, col2 = st.columns([5, 1])
-                    
-                    with col1:
-                        st.markdown(f"**Row {row_number}**: {payment.date} | {payment.buyer_name} | {payment.entry_type}: ₹{payment.amount}")
-                        if payment.notes:
-                            st.caption(f"Notes: {payment.notes}")
-                    
-                    with col2:
-                        # Edit and Delete buttons
-                        button_col1, button_col2 = st.columns(2)
-                        with button_col1:
-                            if st.button("✏️", key=f"edit_pay_table_{payment.id}", help="Edit"):
-                                st.session_state.pay_edit_mode = True
-                                st.session_state.pay_edit_id = payment.id
-                                try:
-                                    st.session_state.pay_date = datetime.fromisoformat(payment.date).date()
-                                except (ValueError, AttributeError):
-                                    st.session_state.pay_date = date.today()
-                                st.session_state.pay_buyer = payment.buyer_name
-                                st.session_state.pay_type = payment.entry_type
-                                st.session_state.pay_amount = payment.amount
-                                st.session_state.pay_notes = payment.notes or ""
-                                st.rerun()
-                        
-                        with button_col2:
-                            if st.button("🗑️", key=f"del_pay_table_{payment.id}", help="Delete"):
-                                if st.session_state.get(f"confirm_del_pay_table_{payment.id}", False):
-                                    dm.delete_payment(payment.id)
-                                    st.success("Payment deleted!")
-                                    st.rerun()
-                                else:
-                                    st.session_state[f"confirm_del_pay_table_{payment.id}"] = True
-                                    st.warning("Click again to confirm deletion")
-                                    st.rerun()
-                    
-                    st.divider()
-        else:
-            st.info("No payment records found.")
+        payment_history(dm)
 
     with tab3:
         st.subheader("Buyer Ledgers")
@@ -524,28 +171,29 @@ def render(dm: DataManager):
                 st.session_state.selected_buyer_for_calendar = None
                 st.rerun()
             
+            # Statement totals from the running balance ledger
+            statement = dm.get_balance_ledger().get(buyer_name)
+            st_col1, st_col2, st_col3, st_col4 = st.columns(4)
+            st_col1.metric("Total Sales", f"₹{statement.sales_amount:,.2f}", help=f"{statement.sales_quantity:.1f} L in {statement.sale_count} sale(s)")
+            st_col2.metric("Payments", f"₹{statement.payments:,.2f}")
+            st_col3.metric("Advances", f"₹{statement.advances:,.2f}")
+            st_col4.metric("Balance Due", f"₹{statement.balance:,.2f}")
+            
+            # Point-in-time balance from the statement index
+            as_of = st.date_input("Balance as of", value=date.today(), key=f"buyer_{buyer_name}_as_of")
+            as_of_balance = dm.get_statement_index().get(buyer_name).balance_as_of(as_of.isoformat())
+            st.caption(f"Balance as of {as_of.isoformat()}: ₹{as_of_balance:,.2f}")
+            
             # Get buyer's sales data
             buyer_sales = [s for s in all_sales if s.buyer_name == buyer_name]
             
-            # Convert to calendar format
-            buyer_calendar_data = []
-            for sale in buyer_sales:
-                buyer_calendar_data.append({
-                    'date': sale.date,
-                    'buyer_name': sale.buyer_name,
-                    'quantity': sale.quantity,
-                    'rate': sale.rate,
-                    'total_amount': sale.total_amount,
-                    'id': sale.id
-                })
-            
             # Navigation controls for buyer calendar
             buyer_current_date = NavigationControls.render(key_prefix=f"buyer_{buyer_name}_nav")
             
             # Buyer calendar view
             buyer_calendar_view = CalendarView()
             buyer_calendar_result = buyer_calendar_view.render(
-                data_points=buyer_calendar_data,
+                presence=dm.get_date_presence_index().get("milk_sales", buyer_name),
                 selected_month=buyer_current_date,
                 calendar_key=f"buyer_{buyer_name}_calendar"
             )
@@ -594,7 +242,8 @@ def render(dm: DataManager):
             DateRangeSelector.render_with_export(
                 buyer=buyer_name,
                 sales_data=buyer_sales,
-                key_prefix=f"export_{buyer_name}"
+                key_prefix=f"export_{buyer_name}",
+                statement=dm.get_statement_index().get(buyer_name)
             )
         
         else:
@@ -608,7 +257,8 @@ def render(dm: DataManager):
                 # Search functionality
                 search_result = SearchInterface.render_buyer_list_with_search(
                     buyers=buyer_names,
-                    key_prefix="buyer_ledger_search"
+                    key_prefix="buyer_ledger_search",
+                    index=dm.get_buyer_search_index()
                 )
                 
                 if search_result:
@@ -620,13 +270,10 @@ def render(dm: DataManager):
             st.markdown("---")
             st.subheader("Buyer Balance Summary")
             summary_data = []
-            all_sales = dm.get_milk_sales()
-            all_payments = dm.get_payments()
+            ledger = dm.get_balance_ledger()
             for i, b in enumerate(buyers):
                 row_number = RowNumberFormatter.get_row_number(i)
-                b_sales = [s for s in all_sales if s.buyer_name == b.name]
-                b_payments = [p for p in all_payments if p.buyer_name == b.name]
-                bal = sum(s.total_amount for s in b_sales) - sum(p.amount for p in b_payments)
+                bal = ledger.balance(b.name)
                 summary_data.append({
                     "#": row_number,
                     "Buyer": b.name, 
@@ -634,4 +281,411 @@ def render(dm: DataManager):
                 })
             
             if summary_data:
-                st.dataframe(pd.DataFrame(summary_data), width='stretch', hide_index=True)
+                st.dataframe(summary_data, width='stretch', hide_index=True)
+
+
+@st.fragment
+def production_form(dm: DataManager):
+    """Daily production form; inputs rerun only this fragment."""
+    with st.expander("Record Production", expanded=True):
+        with st.form("daily_yield_form", clear_on_submit=False): 
+            col1, col2 = st.columns(2)
+            with col1:
+                d_val = st.session_state.dy_date if st.session_state.dy_edit_mode else date.today()
+                dy_date = st.date_input("Date", value=d_val)
+            with col2:
+                q_val = st.session_state.dy_qty if st.session_state.dy_edit_mode else 0.0
+                dy_qty = st.number_input("Quantity (Litres)", min_value=0.0, step=0.1, value=float(q_val))
+
+            n_val = st.session_state.dy_notes if st.session_state.dy_edit_mode else ""
+            dy_notes = st.text_input("Notes", value=n_val)
+
+            btn_txt = "Update Record" if st.session_state.dy_edit_mode else "Record Production"
+            submitted = st.form_submit_button(btn_txt)
+
+            if submitted:
+                if dy_qty > 0:
+                    new_id = st.session_state.dy_edit_id if st.session_state.dy_edit_mode else str(uuid.uuid4())
+
+                    new_yield = DailyYield(
+                        id=new_id,
+                        date=dy_date.isoformat(),
+                        quantity=dy_qty,
+                        notes=dy_notes
+                    )
+
+                    if st.session_state.dy_edit_mode:
+                        dm.update_daily_yield(new_yield)
+                        st.success("Updated.")
+                    else:
+                        dm.add_daily_yield(new_yield)
+                        st.success("Recorded.")
+
+                    st.session_state.dy_edit_mode = False
+                    st.session_state.dy_edit_id = None
+                    st.session_state.dy_qty = 0.0
+                    st.session_state.dy_notes = ""
+                    st.rerun()
+                else:
+                    st.error("Quantity > 0 required.")
+
+        if st.session_state.dy_edit_mode:
+            if st.button("Cancel Edit", key="cancel_dy"):
+                st.session_state.dy_edit_mode = False
+                st.session_state.dy_edit_id = None
+                st.session_state.dy_qty = 0.0
+                st.session_state.dy_notes = ""
+                rerun_fragment()
+
+
+@st.fragment
+def production_history(dm: DataManager):
+    """Production history; reads only the daily_yields collection."""
+    # Expandable History for Daily Yields (With Edit) - Enhanced formatting
+    with st.expander("Production History (All Time)"):
+        all_daily_yields = dm.get_daily_yields()
+        if all_daily_yields:
+            selected = EnhancedDataTable.select_rows(all_daily_yields, {
+                "Date": lambda y: y.date,
+                "Quantity (L)": lambda y: y.quantity,
+                "Notes": lambda y: y.notes,
+            }, key="yield_hist")
+            edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key="yield_hist")
+
+            # Handle edit button click
+            if edit_clicked:
+                y = selected[0]
+                st.session_state.dy_edit_mode = True
+                st.session_state.dy_edit_id = y.id
+                try:
+                    st.session_state.dy_date = datetime.fromisoformat(y.date).date()
+                except (ValueError, AttributeError):
+                    st.session_state.dy_date = date.today()
+                st.session_state.dy_qty = y.quantity
+                st.session_state.dy_notes = y.notes
+                st.rerun()
+
+            # Delete the selected records in one commit once confirmed
+            if delete_confirmed:
+                with dm.unit_of_work() as uow:
+                    for y in selected:
+                        uow.delete("daily_yields", y.id)
+                EnhancedDataTable.reset_selection("yield_hist")
+                st.rerun()
+        else:
+            st.info("No records found.")
+
+
+@st.fragment
+def sale_form(dm: DataManager):
+    """Milk sale form; reads only the buyers collection."""
+    buyers = dm.get_buyers()
+    buyer_names = [b.name for b in buyers]
+
+    st.subheader("Record Milk Sale")
+
+    if not st.session_state.sale_edit_mode:
+        # Normal Flow
+        sel_buyer = st.selectbox("Select Buyer", buyer_names, key="s_buyer_sel")
+        current_buyer = next((b for b in buyers if b.name == sel_buyer), None)
+        def_rate = current_buyer.default_rate if current_buyer else 0.0
+    else:
+        # Edit Flow
+        try:
+            b_idx = buyer_names.index(st.session_state.sale_buyer)
+        except: b_idx = 0
+        sel_buyer = st.selectbox("Select Buyer", buyer_names, index=b_idx, key="s_buyer_sel_edit")
+        def_rate = st.session_state.sale_rate 
+
+    with st.form("sale_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            d_val = st.session_state.sale_date if st.session_state.sale_edit_mode else date.today()
+            s_date = st.date_input("Date", value=d_val)
+            q_val = st.session_state.sale_qty if st.session_state.sale_edit_mode else 0.0
+            s_qty = st.number_input("Quantity (Litres)", min_value=0.0, step=0.1, value=float(q_val))
+
+        with col2:
+            r_val = def_rate
+            s_rate = st.number_input("Rate (INR/L)", value=float(r_val), step=0.5)
+
+        btn_txt = "Update Sale" if st.session_state.sale_edit_mode else "Record Sale"
+        submit = st.form_submit_button(btn_txt)
+
+        if submit:
+            if s_qty > 0 and s_rate > 0:
+                total = s_qty * s_rate
+                new_id = st.session_state.sale_edit_id if st.session_state.sale_edit_mode else str(uuid.uuid4())
+
+                sale = MilkSale(
+                    id=new_id,
+                    date=s_date.isoformat(),
+                    buyer_name=sel_buyer,
+                    quantity=s_qty,
+                    rate=s_rate,
+                    total_amount=total
+                )
+
+                if st.session_state.sale_edit_mode:
+                    dm.update_milk_sale(sale)
+                    st.success("Updated.")
+                else:
+                    dm.add_milk_sale(sale)
+                    st.success("Recorded.")
+
+                st.session_state.sale_edit_mode = False
+                st.session_state.sale_edit_id = None
+                st.session_state.sale_qty = 0.0
+                st.rerun()
+            else:
+                st.error("Invalid Input")
+
+    if st.session_state.sale_edit_mode:
+        if st.button("Cancel Edit", key="cancel_sale"):
+            st.session_state.sale_edit_mode = False
+            st.session_state.sale_edit_id = None
+            st.session_state.sale_qty = 0.0
+            rerun_fragment()
+
+
+def day_sales_prefill(dm: DataManager, day: str):
+    """One row per buyer: the litres of their last delivery before ``day`` at their default rate, as a DataFrame."""
+    import pandas as pd
+
+    statements = dm.get_statement_index()
+    rows = []
+    for b in dm.get_buyers():
+        statement = statements.get(b.name)
+        last_day = statement.last_sale_day(day)
+        rows.append({
+            "Buyer": b.name,
+            "Qty (L)": statement.sales_quantity_on(last_day) if last_day else 0.0,
+            "Rate": float(b.default_rate),
+            "Already Recorded (L)": statement.sales_quantity_on(day),
+        })
+    return pd.DataFrame(rows, columns=["Buyer", "Qty (L)", "Rate", "Already Recorded (L)"])
+
+
+@st.fragment
+def day_sales_grid(dm: DataManager):
+    """Whole-day sales entry: edit the prefilled grid, then record every row in one write."""
+    import pandas as pd
+
+    st.subheader("Record Day's Sales")
+    s_date = st.date_input("Date", value=date.today(), key="day_grid_date")
+    day = s_date.isoformat()
+    nonce = st.session_state.get("day_grid_nonce", 0)
+
+    edited = st.data_editor(
+        day_sales_prefill(dm, day),
+        key=f"day_grid_{day}_{nonce}",
+        hide_index=True,
+        width="stretch",
+        disabled=["Buyer", "Already Recorded (L)"],
+        column_config={
+            "Qty (L)": st.column_config.NumberColumn(min_value=0.0, step=0.1),
+            "Rate": st.column_config.NumberColumn(min_value=0.0, step=0.5),
+        },
+    )
+    st.caption("Prefilled from each buyer's previous delivery; set a quantity to 0 to skip that buyer.")
+
+    sales = [
+        MilkSale(id=str(uuid.uuid4()), date=day, buyer_name=row["Buyer"],
+                 quantity=float(row["Qty (L)"]), rate=float(row["Rate"]),
+                 total_amount=float(row["Qty (L)"]) * float(row["Rate"]))
+        for row in edited.to_dict("records")
+        if pd.notna(row["Qty (L)"]) and pd.notna(row["Rate"]) and row["Qty (L)"] > 0 and row["Rate"] > 0
+    ]
+    total_qty = sum(s.quantity for s in sales)
+    if (edited["Already Recorded (L)"] > 0).any():
+        st.warning("Some buyers already have sales on this date; recording adds to them.")
+    if st.button(f"Record {len(sales)} Sales ({total_qty:.1f} L)", key="day_grid_submit", disabled=not sales):
+        dm.add_milk_sales(sales)
+        st.session_state.day_grid_nonce = nonce + 1
+        st.success(f"Recorded {len(sales)} sales.")
+        st.rerun()
+
+
+@st.fragment
+def sales_history(dm: DataManager):
+    """Sales history by date; reads only the milk_sales collection."""
+    all_sales = dm.get_milk_sales()
+
+    # Sales History with Dropdown Date Selector - Mobile-friendly approach
+    st.subheader("Sales History")
+
+    # Initialize calendar view state
+    if 'sales_selected_date' not in st.session_state:
+        st.session_state.sales_selected_date = None
+
+    # Use dropdown date selector instead of calendar
+    selected_date = DropdownDateSelector.render(
+        presence=dm.get_date_presence_index().get("milk_sales"),
+        key_prefix="sales_dropdown"
+    )
+
+    # Update session state if date is selected
+    if selected_date:
+        st.session_state.sales_selected_date = selected_date
+
+    # Display transactions for selected date
+    if st.session_state.sales_selected_date:
+        st.subheader(f"Sales for {st.session_state.sales_selected_date}")
+
+        # Filter sales for selected date
+        selected_sales = [s for s in all_sales if s.date == st.session_state.sales_selected_date]
+
+        if selected_sales:
+            grid_key = f"sales_hist_{st.session_state.sales_selected_date}"
+            selected = EnhancedDataTable.select_rows(selected_sales, {
+                "Date": lambda s: s.date,
+                "Buyer": lambda s: s.buyer_name,
+                "Qty (L)": lambda s: s.quantity,
+                "Rate": lambda s: s.rate,
+                "Total": lambda s: s.total_amount,
+            }, key=grid_key)
+            edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key=grid_key)
+
+            # Handle edit button click
+            if edit_clicked:
+                sale = selected[0]
+                st.session_state.sale_edit_mode = True
+                st.session_state.sale_edit_id = sale.id
+                try:
+                    st.session_state.sale_date = datetime.fromisoformat(sale.date).date()
+                except (ValueError, AttributeError):
+                    st.session_state.sale_date = date.today()
+                st.session_state.sale_buyer = sale.buyer_name
+                st.session_state.sale_qty = sale.quantity
+                st.session_state.sale_rate = sale.rate
+                st.rerun()
+
+            # Delete the selected sales in one commit once confirmed
+            if delete_confirmed:
+                with dm.unit_of_work() as uow:
+                    for sale in selected:
+                        uow.delete("milk_sales", sale.id)
+                EnhancedDataTable.reset_selection(grid_key)
+                st.rerun()
+        else:
+            st.info(f"No sales recorded for {st.session_state.sales_selected_date}")
+
+        # Clear selection button
+        if st.button("Clear Date Selection", key="clear_sales_date"):
+            st.session_state.sales_selected_date = None
+            rerun_fragment()
+    else:
+        st.info("Click on a date in the calendar above to view sales for that day.")
+
+
+@st.fragment
+def payment_form(dm: DataManager):
+    """Payment / advance form; reads only the buyers collection."""
+    buyer_names = [b.name for b in dm.get_buyers()]
+
+    form_title = "Edit Payment" if st.session_state.pay_edit_mode else "Record Payment"
+    with st.expander(form_title, expanded=True):
+        if not st.session_state.pay_edit_mode:
+            p_buyer = st.selectbox("Buyer", buyer_names, key="pay_buyer_select")
+        else:
+            try:
+                b_idx = buyer_names.index(st.session_state.pay_buyer)
+            except: b_idx = 0
+            p_buyer = st.selectbox("Buyer", buyer_names, index=b_idx, key="pay_buyer_select_edit")
+
+        with st.form("pay_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                d_val = st.session_state.pay_date if st.session_state.pay_edit_mode else date.today()
+                p_date = st.date_input("Date", value=d_val)
+                t_val = st.session_state.pay_type if st.session_state.pay_edit_mode else "Payment"
+                p_type = st.radio("Type", ["Payment", "Advance"], index=0 if t_val == "Payment" else 1)
+            with col2:
+                a_val = st.session_state.pay_amount if st.session_state.pay_edit_mode else 0.0
+                p_amount = st.number_input("Amount", min_value=0.0, step=100.0, value=float(a_val))
+                n_val = st.session_state.pay_notes if st.session_state.pay_edit_mode else ""
+                p_desc = st.text_input("Notes", value=n_val)
+
+            btn_txt = "Update Payment" if st.session_state.pay_edit_mode else "Save Payment"
+            if st.form_submit_button(btn_txt):
+                if p_amount > 0:
+                    new_id = st.session_state.pay_edit_id if st.session_state.pay_edit_mode else str(uuid.uuid4())
+
+                    payment = Payment(
+                        id=new_id,
+                        date=p_date.isoformat(),
+                        buyer_name=p_buyer,
+                        entry_type=p_type,
+                        amount=p_amount,
+                        notes=p_desc
+                    )
+
+                    if st.session_state.pay_edit_mode:
+                        dm.update_payment(payment)
+                        st.success("Payment updated!")
+                    else:
+                        dm.add_payment(payment)
+                        st.success("Payment saved!")
+
+                    # Reset state
+                    st.session_state.pay_edit_mode = False
+                    st.session_state.pay_edit_id = None
+                    st.session_state.pay_amount = 0.0
+                    st.session_state.pay_notes = ""
+                    st.rerun()
+                else:
+                    st.error("Amount must be greater than 0")
+
+        if st.session_state.pay_edit_mode:
+            if st.button("Cancel Edit", key="cancel_payment"):
+                st.session_state.pay_edit_mode = False
+                st.session_state.pay_edit_id = None
+                st.session_state.pay_amount = 0.0
+                st.session_state.pay_notes = ""
+                rerun_fragment()
+
+
+@st.fragment
+def payment_history(dm: DataManager):
+    """Payment history; reads only the payments collection."""
+    # Payment History - Tabular Format
+    st.subheader("Payment History")
+
+    # Get all payments
+    all_payments = dm.get_payments()
+
+    if all_payments:
+        # Most recent first; one selectable table drives edit and delete
+        selected = EnhancedDataTable.select_rows(all_payments, {
+            "Date": lambda p: p.date,
+            "Name": lambda p: p.buyer_name,
+            "Payment Type": lambda p: p.entry_type,
+            "Payment Amount": lambda p: f"₹{p.amount}",
+            "Notes": lambda p: p.notes or "-",
+        }, key="pay_hist")
+        edit_clicked, delete_confirmed = EnhancedDataTable.selection_actions(selected, key="pay_hist")
+
+        # Handle edit button click
+        if edit_clicked:
+            payment = selected[0]
+            st.session_state.pay_edit_mode = True
+            st.session_state.pay_edit_id = payment.id
+            try:
+                st.session_state.pay_date = datetime.fromisoformat(payment.date).date()
+            except (ValueError, AttributeError):
+                st.session_state.pay_date = date.today()
+            st.session_state.pay_buyer = payment.buyer_name
+            st.session_state.pay_type = payment.entry_type
+            st.session_state.pay_amount = payment.amount
+            st.session_state.pay_notes = payment.notes or ""
+            st.rerun()
+
+        # Delete the selected payments in one commit once confirmed
+        if delete_confirmed:
+            with dm.unit_of_work() as uow:
+                for payment in selected:
+                    uow.delete("payments", payment.id)
+            EnhancedDataTable.reset_selection("pay_hist")
+            st.rerun()
+    else:
+        st.info("No payment records found.")
@@ -1,12 +1,18 @@
 import streamlit as st
 from src.data_manager import DataManager
+from src import reports_engine
 from src.ui_components import CalendarView, NavigationControls, SearchInterface, DateRangeSelector, RowNumberFormatter
-import pandas as pd
 from datetime import date, timedelta, datetime
 
 def convert_df(df):
     return df.to_csv(index=False).encode('utf-8')
 
+def with_row_numbers(df):
+    """Prefix a report with 1-based row numbers."""
+    df = df.reset_index(drop=True)
+    df.insert(0, "#", [RowNumberFormatter.get_row_number(i) for i in range(len(df))])
+    return df
+
 def render(dm: DataManager):
     st.header("Reports & Summaries")
     
@@ -22,57 +28,21 @@ def render(dm: DataManager):
     
     tab1, tab2, tab3, tab4 = st.tabs(["Daily Summary", "Monthly Summary", "Buyer Report", "Cow Report"])
     
+    # Columnar frames for the selected range, shared by the ranged reports; a partitioned
+    # store reads only the months that overlap it
+    sales_df = reports_engine.sales_frame(dm.get_range("milk_sales", start_str, end_str))
+    expenses_df = reports_engine.expenses_frame(dm.get_range("expenses", start_str, end_str))
+    yields_df = reports_engine.yields_frame(dm.get_range("daily_yields", start_str, end_str))
+    
     # 1. Daily Summary (Expenses vs Revenue) - Enhanced with Row Numbers
     with tab1:
         st.subheader("Daily Income vs Expense")
-        all_sales = dm.get_milk_sales()
-        all_expenses = dm.get_expenses()
-        all_yields = dm.get_daily_yields()
-        
-        # Filter by date range
-        sales_in_range = [s for s in all_sales if start_str <= s.date <= end_str]
-        expenses_in_range = [e for e in all_expenses if start_str <= e.date <= end_str]
-        yields_in_range = [y for y in all_yields if start_str <= y.date <= end_str]
-        
-        # Aggregate by Date
-        daily_data = {}
-        
-        # Sales
-        for s in sales_in_range:
-            d = s.date
-            if d not in daily_data: daily_data[d] = {"Date": d, "Milk Revenue": 0.0, "Expenses": 0.0, "Milk (L)": 0.0, "Production (L)": 0.0}
-            daily_data[d]["Milk Revenue"] += s.total_amount
-            daily_data[d]["Milk (L)"] += s.quantity
-            
-        # Expenses
-        for e in expenses_in_range:
-            d = e.date
-            if d not in daily_data: daily_data[d] = {"Date": d, "Milk Revenue": 0.0, "Expenses": 0.0, "Milk (L)": 0.0, "Production (L)": 0.0}
-            daily_data[d]["Expenses"] += e.amount
-        
-        # Daily Yields (Production)
-        for y in yields_in_range:
-            d = y.date
-            if d not in daily_data: daily_data[d] = {"Date": d, "Milk Revenue": 0.0, "Expenses": 0.0, "Milk (L)": 0.0, "Production (L)": 0.0}
-            daily_data[d]["Production (L)"] += y.quantity
-
-        df_daily = pd.DataFrame(daily_data.values())
+        df_daily = reports_engine.daily_summary(sales_df, expenses_df, yields_df, start_str, end_str)
         if not df_daily.empty:
-            df_daily = df_daily.sort_values(by="Date")
-            df_daily["Net Profit"] = df_daily["Milk Revenue"] - df_daily["Expenses"]
-            
-            # Add row numbers (1-based) - Preserve existing functionality with enhancement
-            df_daily = df_daily.reset_index(drop=True)
-            df_daily.insert(0, "#", [RowNumberFormatter.get_row_number(i) for i in range(len(df_daily))])
+            df_daily = with_row_numbers(df_daily)
+            st.dataframe(df_daily, width='stretch', hide_index=True)
             
-            # Reorder columns
-            cols = ["#", "Date", "Production (L)", "Milk (L)", "Milk Revenue", "Expenses", "Net Profit"]
-            # Ensure cols exist
-            cols = [c for c in cols if c in df_daily.columns]
-            
-            st.dataframe(df_daily[cols], width='stretch', hide_index=True)
-            
-            csv = convert_df(df_daily[cols])
+            csv = convert_df(df_daily)
             st.download_button(
                 "Download Daily Summary CSV",
                 csv,
@@ -87,96 +57,18 @@ def render(dm: DataManager):
     with tab2:
         st.subheader("Monthly Summary - Historical View")
         
-        # Get all historical data (not just current date range)
-        all_sales_hist = dm.get_milk_sales()
-        all_expenses_hist = dm.get_expenses()
-        all_yields_hist = dm.get_daily_yields()
-        
-        # Create comprehensive monthly data
-        monthly_data = {}
-        
-        # Process all sales
-        for s in all_sales_hist:
-            try:
-                sale_date = datetime.fromisoformat(s.date)
-                month_key = sale_date.strftime("%Y-%m")
-                month_display = sale_date.strftime("%B %Y")
-                
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {
-                        "Month": month_display,
-                        "Milk Revenue": 0.0,
-                        "Expenses": 0.0,
-                        "Milk (L)": 0.0,
-                        "Production (L)": 0.0,
-                        "sort_key": month_key
-                    }
-                
-                monthly_data[month_key]["Milk Revenue"] += s.total_amount
-                monthly_data[month_key]["Milk (L)"] += s.quantity
-            except:
-                continue
-        
-        # Process all expenses
-        for e in all_expenses_hist:
-            try:
-                expense_date = datetime.fromisoformat(e.date)
-                month_key = expense_date.strftime("%Y-%m")
-                month_display = expense_date.strftime("%B %Y")
-                
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {
-                        "Month": month_display,
-                        "Milk Revenue": 0.0,
-                        "Expenses": 0.0,
-                        "Milk (L)": 0.0,
-                        "Production (L)": 0.0,
-                        "sort_key": month_key
-                    }
-                
-                monthly_data[month_key]["Expenses"] += e.amount
-            except:
-                continue
-        
-        # Process all yields
-        for y in all_yields_hist:
-            try:
-                yield_date = datetime.fromisoformat(y.date)
-                month_key = yield_date.strftime("%Y-%m")
-                month_display = yield_date.strftime("%B %Y")
-                
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {
-                        "Month": month_display,
-                        "Milk Revenue": 0.0,
-                        "Expenses": 0.0,
-                        "Milk (L)": 0.0,
-                        "Production (L)": 0.0,
-                        "sort_key": month_key
-                    }
-                
-                monthly_data[month_key]["Production (L)"] += y.quantity
-            except:
-                continue
+        # All historical data (not just current date range), newest month first; sales and
+        # production come from per-month totals rather than every record
+        df_monthly_hist = reports_engine.monthly_summary_from_totals(
+            dm.get_month_totals("milk_sales"), dm.get_month_totals("daily_yields"),
+            reports_engine.expenses_frame(dm.get_expenses()))
         
-        if monthly_data:
-            # Convert to DataFrame and sort by date (newest first)
-            df_monthly_hist = pd.DataFrame(monthly_data.values())
-            df_monthly_hist = df_monthly_hist.sort_values(by="sort_key", ascending=False)
-            df_monthly_hist["Net Profit"] = df_monthly_hist["Milk Revenue"] - df_monthly_hist["Expenses"]
-            
-            # Add row numbers (1-based)
-            df_monthly_hist = df_monthly_hist.reset_index(drop=True)
-            df_monthly_hist.insert(0, "#", [RowNumberFormatter.get_row_number(i) for i in range(len(df_monthly_hist))])
-            
-            # Display columns in desired order
-            display_cols = ["#", "Month", "Production (L)", "Milk (L)", "Milk Revenue", "Expenses", "Net Profit"]
-            display_cols = [c for c in display_cols if c in df_monthly_hist.columns]
-            
-            st.dataframe(df_monthly_hist[display_cols], width='stretch', hide_index=True)
+        if not df_monthly_hist.empty:
+            df_monthly_hist = with_row_numbers(df_monthly_hist)
+            st.dataframe(df_monthly_hist, width='stretch', hide_index=True)
             
             # Download functionality
-            csv_m = convert_df(df_monthly_hist[display_cols])
+            csv_m = convert_df(df_monthly_hist)
             st.download_button(
                 "Download Historical Monthly Summary CSV",
                 csv_m,
@@ -199,7 +91,6 @@ def render(dm: DataManager):
         
         # Get all buyers and sales data
         all_buyers = dm.get_buyers()
-        all_sales_for_report = dm.get_milk_sales()
         
         if not all_buyers:
             st.info("No buyers available.")
@@ -223,15 +114,9 @@ def render(dm: DataManager):
             
             if st.session_state.buyer_report_view_mode == 'summary':
                 # Summary view with date range filtering
-                if sales_in_range:
-                    df_sales = pd.DataFrame([s.__dict__ for s in sales_in_range])
-                    buyer_summary = df_sales.groupby('buyer_name')[['quantity', 'total_amount']].sum().reset_index()
-                    buyer_summary.columns = ['Buyer', 'Total Litres', 'Total Revenue']
-                    
-                    # Add row numbers (1-based)
-                    buyer_summary = buyer_summary.reset_index(drop=True)
-                    buyer_summary.insert(0, "#", [RowNumberFormatter.get_row_number(i) for i in range(len(buyer_summary))])
-                    
+                buyer_summary = reports_engine.buyer_summary(sales_df, start_str, end_str)
+                if not buyer_summary.empty:
+                    buyer_summary = with_row_numbers(buyer_summary)
                     st.dataframe(buyer_summary, width='stretch', hide_index=True)
                     
                     csv_b = convert_df(buyer_summary)
@@ -259,19 +144,7 @@ def render(dm: DataManager):
                         st.rerun()
                     
                     # Get buyer's sales data
-                    buyer_sales_report = [s for s in all_sales_for_report if s.buyer_name == buyer_name]
-                    
-                    # Convert to calendar format
-                    buyer_calendar_data_report = []
-                    for sale in buyer_sales_report:
-                        buyer_calendar_data_report.append({
-                            'date': sale.date,
-                            'buyer_name': sale.buyer_name,
-                            'quantity': sale.quantity,
-                            'rate': sale.rate,
-                            'total_amount': sale.total_amount,
-                            'id': sale.id
-                        })
+                    buyer_sales_report = [s for s in dm.get_milk_sales() if s.buyer_name == buyer_name]
                     
                     # Navigation controls
                     report_current_date = NavigationControls.render(key_prefix=f"buyer_report_{buyer_name}_nav")
@@ -279,7 +152,7 @@ def render(dm: DataManager):
                     # Calendar view
                     report_calendar_view = CalendarView()
                     report_calendar_result = report_calendar_view.render(
-                        data_points=buyer_calendar_data_report,
+                        presence=dm.get_date_presence_index().get("milk_sales", buyer_name),
                         selected_month=report_current_date,
                         calendar_key=f"buyer_report_{buyer_name}_calendar"
                     )
@@ -339,7 +212,8 @@ def render(dm: DataManager):
                     # Search functionality
                     search_result = SearchInterface.render_buyer_list_with_search(
                         buyers=buyer_names,
-                        key_prefix="buyer_report_search"
+                        key_prefix="buyer_report_search",
+                        index=dm.get_buyer_search_index()
                     )
                     
                     if search_result:
@@ -349,33 +223,10 @@ def render(dm: DataManager):
     # 4. Cow Report
     with tab4:
         st.subheader("Cow Production & Expenses in Range")
-        # Need cow events (yield) and expenses linked to cows
-        all_events = dm.get_cow_events()
-        events_in_range = [e for e in all_events if start_str <= e.date <= end_str]
-        expenses_linked = [e for e in expenses_in_range if e.cow_id]
-        
-        cow_stats = {} # cow_id -> {yield, expenses}
-        
-        # 1. Sum Yields
-        for e in events_in_range:
-            if e.event_type == 'Yield':
-                try:
-                    val_clean = e.value.lower().replace('l', '').replace('litres', '').strip()
-                    val = float(val_clean)
-                    
-                    if e.cow_id not in cow_stats: cow_stats[e.cow_id] = {"Yield (L)": 0.0, "Direct Expenses": 0.0}
-                    cow_stats[e.cow_id]["Yield (L)"] += val
-                except:
-                    pass 
+        events_df = reports_engine.events_frame(dm.get_range("cow_events", start_str, end_str))
+        df_cows = reports_engine.cow_summary(events_df, expenses_df, start_str, end_str)
         
-        # 2. Sum Expenses linked to cows
-        for e in expenses_linked:
-            if e.cow_id not in cow_stats: cow_stats[e.cow_id] = {"Yield (L)": 0.0, "Direct Expenses": 0.0}
-            cow_stats[e.cow_id]["Direct Expenses"] += e.amount
-        
-        if cow_stats:
-            data = [{"Cow ID": k, **v} for k,v in cow_stats.items()]
-            df_cows = pd.DataFrame(data)
+        if not df_cows.empty:
             st.dataframe(df_cows, width='stretch')
             
             csv_c = convert_df(df_cows)
@@ -388,3 +239,22 @@ def render(dm: DataManager):
             )
         else:
             st.info("No cow data in range.")
+
+    # 5. Analytics snapshot for notebooks: typed Parquet rather than CSV
+    st.markdown("---")
+    st.subheader("Analytics Snapshot")
+    st.caption("Every collection as a compressed Parquet file with typed columns. Load it with "
+               "`src.analytics_snapshot.read_collection` to read only the columns and dates you need.")
+
+    def snapshot_archive():
+        # Built only when the button is clicked, and not kept afterwards; pyarrow is imported here too
+        from src.analytics_snapshot import snapshot_zip
+        return snapshot_zip(dm)
+
+    st.download_button(
+        "Download Snapshot (.zip)",
+        snapshot_archive,
+        f"dairy_snapshot_{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip",
+        "application/zip",
+        key='download-snapshot'
+    )
@@ -6,6 +6,8 @@ from .search_interface import SearchInterface
 from .date_range_selector import DateRangeSelector
 from .row_number_formatter import RowNumberFormatter
 from .dropdown_date_selector import DropdownDateSelector
+from .style_registry import StyleRegistry
+from .diagnostics_panel import DiagnosticsPanel
 
 __all__ = [
     'CalendarView',
@@ -14,5 +16,7 @@ __all__ = [
     'SearchInterface',
     'DateRangeSelector',
     'RowNumberFormatter',
-    'DropdownDateSelector'
+    'DropdownDateSelector',
+    'StyleRegistry',
+    'DiagnosticsPanel'
 ]
\ No newline at end of file
@@ -2,6 +2,7 @@ import streamlit as st
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
 import calendar as cal
+from src.date_presence import DatePresence
 
 class CalendarView:
     """Interactive monthly calendar interface with visual indicators and date selection."""
@@ -9,31 +10,28 @@ class CalendarView:
     def __init__(self):
         pass
     
-    def render(self, data_points: List[Dict[str, Any]], selected_month: Optional[datetime] = None, 
-               calendar_key: str = "calendar") -> Dict[str, Any]:
-        """Render simple mobile-friendly calendar as a list of dates."""
+    def render(self, data_points: Optional[List[Dict[str, Any]]] = None, selected_month: Optional[datetime] = None, 
+               calendar_key: str = "calendar", presence: Optional[DatePresence] = None) -> Dict[str, Any]:
+        """Render simple mobile-friendly calendar as a list of dates.
+
+        Pass ``presence`` (from ``DataManager.get_date_presence_index()``) to skip parsing ``data_points``.
+        """
         
         if selected_month is None:
             selected_month = datetime.now()
         
-        # Get dates with data
-        dates_with_data = set()
-        for point in data_points:
-            date_str = point.get('date', '')
-            if date_str:
-                try:
-                    if isinstance(date_str, str):
-                        parsed_date = datetime.fromisoformat(date_str).date()
-                    else:
-                        parsed_date = date_str
-                    dates_with_data.add(parsed_date)
-                except:
-                    continue
-        
         # Create calendar grid
         year = selected_month.year
         month = selected_month.month
         
+        # Days of this month with data
+        if presence is None:
+            presence = DatePresence()
+            for point in data_points or []:
+                date_str = point.get('date', '')
+                presence.add(date_str.isoformat() if isinstance(date_str, date) else date_str)
+        days_with_data = presence.month(year, month)
+        
         # Get calendar data
         cal_data = cal.monthcalendar(year, month)
         
@@ -44,7 +42,7 @@ class CalendarView:
         selected_date = None
         
         # Show dates with data prominently
-        dates_with_data_list = sorted([d for d in dates_with_data if d.year == year and d.month == month])
+        dates_with_data_list = [date(year, month, d) for d in days_with_data.days()]
         
         if dates_with_data_list:
             st.markdown("**📅 Dates with Data:**")
@@ -93,7 +91,7 @@ class CalendarView:
                     week_cols[i].markdown(" ")
                 else:
                     current_date = date(year, month, day)
-                    if current_date in dates_with_data:
+                    if days_with_data.has(day):
                         if week_cols[i].button(
                             f"🟢 {day}",
                             key=f"{calendar_key}_grid_{day}",
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date, timedelta
 from typing import Optional, Tuple, List, Dict, Any
 import io
@@ -90,6 +89,83 @@ class DateRangeSelector:
             'record_count': len(filtered_data)
         }
     
+    @staticmethod
+    def prepare_statement_export(statement, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Prepare a buyer statement (sales and payments with running balance) for a date range."""
+        period = statement.period(start_date.isoformat(), end_date.isoformat())
+        
+        statement_records = [{
+            'Date': period.start_date,
+            'Type': 'Opening Balance',
+            'Quantity (L)': None,
+            'Debit (₹)': None,
+            'Credit (₹)': None,
+            'Balance (₹)': round(period.opening_balance, 2),
+            'Notes': ''
+        }]
+        for entry, balance in zip(period.entries, period.running_balances):
+            statement_records.append({
+                'Date': entry.date,
+                'Type': entry.kind,
+                'Quantity (L)': entry.quantity if entry.kind == 'Sale' else None,
+                'Debit (₹)': entry.amount if entry.amount >= 0 else None,
+                'Credit (₹)': -entry.amount if entry.amount < 0 else None,
+                'Balance (₹)': round(balance, 2),
+                'Notes': entry.notes
+            })
+        statement_records.append({
+            'Date': period.end_date,
+            'Type': 'Closing Balance',
+            'Quantity (L)': period.sales_quantity,
+            'Debit (₹)': period.sales_amount,
+            'Credit (₹)': period.received,
+            'Balance (₹)': round(period.closing_balance, 2),
+            'Notes': ''
+        })
+        
+        return {
+            'buyer_name': period.buyer_name,
+            'start_date': period.start_date,
+            'end_date': period.end_date,
+            'statement_records': statement_records,
+            'opening_balance': period.opening_balance,
+            'total_sales': period.sales_amount,
+            'total_quantity': period.sales_quantity,
+            'total_received': period.received,
+            'closing_balance': period.closing_balance,
+            'record_count': len(period.entries)
+        }
+    
+    @staticmethod
+    def generate_statement_download(export_data: Dict[str, Any], key_prefix: str = "statement") -> None:
+        """Show statement totals and a CSV download button for it."""
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Opening Balance", f"₹{export_data['opening_balance']:,.2f}")
+        with col2:
+            st.metric("Sales", f"₹{export_data['total_sales']:,.2f}", help=f"{export_data['total_quantity']:.1f} L")
+        with col3:
+            st.metric("Received", f"₹{export_data['total_received']:,.2f}")
+        with col4:
+            st.metric("Closing Balance", f"₹{export_data['closing_balance']:,.2f}")
+        
+        import pandas as pd
+        df = pd.DataFrame(export_data['statement_records'])
+        with st.expander("Preview Statement", expanded=False):
+            st.dataframe(df, width="stretch", hide_index=True)
+        
+        csv_buffer = io.StringIO()
+        df.to_csv(csv_buffer, index=False)
+        filename = f"{export_data['buyer_name']}_statement_{export_data['start_date']}_to_{export_data['end_date']}.csv"
+        st.download_button(
+            label="📥 Download Statement CSV",
+            data=csv_buffer.getvalue(),
+            file_name=filename,
+            mime="text/csv",
+            key=f"{key_prefix}_statement_download",
+            width="stretch"
+        )
+    
     @staticmethod
     def generate_csv_download(export_data: Dict[str, Any], key_prefix: str = "export") -> None:
         """Generate CSV download button for export data."""
@@ -99,6 +175,7 @@ class DateRangeSelector:
             return
         
         # Create DataFrame
+        import pandas as pd
         df = pd.DataFrame(export_data['purchase_records'])
         
         # Add summary row
@@ -138,8 +215,12 @@ class DateRangeSelector:
     
     @staticmethod
     def render_with_export(buyer: str, sales_data: List[Dict[str, Any]], 
-                          key_prefix: str = "buyer_export") -> None:
-        """Render date range selector with export functionality for specific buyer."""
+                          key_prefix: str = "buyer_export", statement=None) -> None:
+        """Render date range selector with export functionality for specific buyer.
+        
+        When a ``BuyerStatement`` is given, the range is also exported as a statement
+        with opening balance, payments and closing balance.
+        """
         
         st.subheader(f"Export Data for {buyer}")
         
@@ -150,14 +231,19 @@ class DateRangeSelector:
             st.warning("Please select a valid date range.")
             return
         
+        if statement is not None:
+            st.markdown("**Account Statement**")
+            statement_data = DateRangeSelector.prepare_statement_export(statement, start_date, end_date)
+            DateRangeSelector.generate_statement_download(statement_data, key_prefix)
+            st.markdown("**Purchases**")
+        
         # Prepare and display export data
         export_data = DateRangeSelector.prepare_export_data(buyer, sales_data, start_date, end_date)
         
         if export_data['record_count'] > 0:
             # Show preview of data
             with st.expander("Preview Data", expanded=False):
-                df_preview = pd.DataFrame(export_data['purchase_records'])
-                st.dataframe(df_preview, width="stretch")
+                st.dataframe(export_data['purchase_records'], width="stretch")
             
             # Generate download
             DateRangeSelector.generate_csv_download(export_data, key_prefix)
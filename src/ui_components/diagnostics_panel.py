@@ -0,0 +1,72 @@
+import streamlit as st
+from typing import Optional
+from src.instrumentation import Profiler, instrument, uninstrument, is_instrumented
+
+MS_COLUMNS = ["Total (ms)", "Mean (ms)", "Max (ms)"]
+
+
+class DiagnosticsPanel:
+    """Opt-in profiling: a sidebar switch, per-tab render times, backend call stats and a trace download."""
+
+    @staticmethod
+    def profiler(dm) -> Optional[Profiler]:
+        """Instrument ``dm`` while the sidebar switch is on; returns the session's profiler, or None when off."""
+        enabled = st.session_state.get("diag_enabled", False)
+        profiler = st.session_state.get("diag_profiler")
+        if enabled:
+            if profiler is None:
+                profiler = st.session_state.diag_profiler = Profiler()
+            if not is_instrumented(dm, profiler):
+                instrument(dm, profiler)
+            profiler.last_run.clear()
+            return profiler
+        if profiler is not None:
+            uninstrument(dm, profiler)
+            del st.session_state.diag_profiler
+        return None
+
+    @staticmethod
+    def _table(rows):
+        st.dataframe(rows, hide_index=True, width="stretch",
+                     column_config={c: st.column_config.NumberColumn(format="%.1f") for c in MS_COLUMNS})
+
+    @staticmethod
+    def render(dm, profiler: Optional[Profiler]):
+        with st.sidebar.expander("Diagnostics"):
+            st.toggle("Profile this session", key="diag_enabled",
+                      help="Times every backend call and tab render; adds a little overhead while on")
+            if profiler is None:
+                st.caption("Turn on profiling, then use the app to collect timings.")
+                return
+
+            if profiler.last_run:
+                st.markdown("**Last run**")
+                for name, seconds in profiler.last_run.items():
+                    st.caption(f"{name}: {seconds * 1000:.0f} ms")
+
+            backend_rows = profiler.rows("backend")
+            if backend_rows:
+                st.markdown("**Backend calls**")
+                DiagnosticsPanel._table(backend_rows)
+            io_rows = profiler.rows("io")
+            if io_rows:
+                st.markdown("**Storage I/O**")
+                DiagnosticsPanel._table(io_rows)
+
+            hits, misses = getattr(dm, "cache_hits", None), getattr(dm, "cache_misses", None)
+            if hits is not None:
+                st.markdown("**Sheets cache**")
+                sheets = sorted(set(hits) | set(misses))
+                st.dataframe([{"Sheet": s, "Hits": hits[s], "Misses": misses[s]} for s in sheets],
+                             hide_index=True, width="stretch")
+
+            col1, col2 = st.columns(2)
+            if col1.button("Reset", key="diag_reset", width="stretch"):
+                profiler.reset()
+                if hits is not None:
+                    hits.clear()
+                    misses.clear()
+                st.rerun()
+            col2.download_button("Trace", data=profiler.trace_json(), file_name="dairy-trace.json",
+                                 mime="application/json", key="diag_trace", width="stretch",
+                                 help="Chrome trace format: open in chrome://tracing or ui.perfetto.dev")
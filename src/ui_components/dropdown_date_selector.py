@@ -2,31 +2,29 @@ import streamlit as st
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 import calendar as cal
+from src.date_presence import DatePresence
 
 class DropdownDateSelector:
     """Mobile-friendly dropdown-based date selector."""
     
     @staticmethod
-    def render(data_points: List[Dict[str, Any]], key_prefix: str = "dropdown_date") -> Optional[str]:
-        """Render three dropdowns for year, month, and date selection."""
+    def render(data_points: Optional[List[Dict[str, Any]]] = None, key_prefix: str = "dropdown_date",
+               presence: Optional[DatePresence] = None) -> Optional[str]:
+        """Render three dropdowns for year, month, and date selection.
+
+        Pass ``presence`` (from ``DataManager.get_date_presence_index()``) to skip parsing ``data_points``.
+        """
+        if presence is None:
+            presence = DatePresence()
+            for point in data_points or []:
+                date_str = point.get('date', '')
+                presence.add(date_str.isoformat() if isinstance(date_str, date) else date_str)
         
         # Get available years from data
-        available_years = set()
         current_year = date.today().year
+        available_years = set(presence.years())
         available_years.add(current_year)  # Always include current year
         
-        for point in data_points:
-            date_str = point.get('date', '')
-            if date_str:
-                try:
-                    if isinstance(date_str, str):
-                        parsed_date = datetime.fromisoformat(date_str).date()
-                    else:
-                        parsed_date = date_str
-                    available_years.add(parsed_date.year)
-                except:
-                    continue
-        
         # Sort years in descending order (most recent first)
         years_list = sorted(list(available_years), reverse=True)
         
@@ -70,26 +68,13 @@ class DropdownDateSelector:
                 days_in_month = cal.monthrange(selected_year, selected_month)[1]
                 valid_dates = list(range(1, days_in_month + 1))
                 
-                # Get dates with data for the selected year and month
-                dates_with_data = set()
-                for point in data_points:
-                    date_str = point.get('date', '')
-                    if date_str:
-                        try:
-                            if isinstance(date_str, str):
-                                parsed_date = datetime.fromisoformat(date_str).date()
-                            else:
-                                parsed_date = date_str
-                            
-                            if parsed_date.year == selected_year and parsed_date.month == selected_month:
-                                dates_with_data.add(parsed_date.day)
-                        except:
-                            continue
+                # Days with data for the selected year and month
+                dates_with_data = presence.month(selected_year, selected_month)
                 
                 # Create date options with indicators for data
                 date_options = []
                 for day in valid_dates:
-                    if day in dates_with_data:
+                    if dates_with_data.has(day):
                         date_options.append(f"🟢 {day}")
                     else:
                         date_options.append(str(day))
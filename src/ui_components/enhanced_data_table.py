@@ -1,306 +1,128 @@
+import heapq
 import streamlit as st
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, List, Sequence, Callable
 from datetime import datetime
+from .row_number_formatter import RowNumberFormatter
+from .fragment_utils import rerun_fragment
+from .style_registry import StyleRegistry
+
+HISTORY_PAGE_SIZE = 25
+GRID_PAGE_SIZE = 200
+
+# Global responsive button styling, injected once per page by StyleRegistry
+StyleRegistry.register("buttons", """
+.stButton > button {
+    width: 100%;
+    border-radius: 6px;
+    border: 1px solid #ddd;
+    background-color: #f8f9fa;
+    color: #495057;
+    font-size: 14px;
+    padding: 0.25rem 0.5rem;
+    transition: all 0.2s ease;
+}
+.stButton > button:hover {
+    background-color: #e9ecef;
+    border-color: #adb5bd;
+    transform: translateY(-1px);
+}
+.stButton > button:active {
+    transform: translateY(0);
+}
+
+/* Action button specific styling */
+.action-buttons {
+    display: flex;
+    gap: 0.5rem;
+    justify-content: flex-end;
+    align-items: center;
+}
+
+/* Mobile responsive adjustments */
+@media (max-width: 768px) {
+    .stButton > button {
+        font-size: 12px;
+        padding: 0.2rem 0.4rem;
+    }
+    .action-buttons {
+        gap: 0.25rem;
+    }
+}
+
+/* Ensure buttons stay on right side */
+.element-container:has(.stButton) {
+    display: flex;
+    justify-content: flex-end;
+}
+""")
 
 class EnhancedDataTable:
     """Enhanced table rendering with right-aligned action buttons and improved formatting."""
     
     @staticmethod
-    def apply_global_button_styles():
-        """Apply global CSS styles for consistent button positioning."""
-        st.markdown("""
-        <style>
-        /* Global responsive button styling */
-        .stButton > button {
-            width: 100%;
-            border-radius: 6px;
-            border: 1px solid #ddd;
-            background-color: #f8f9fa;
-            color: #495057;
-            font-size: 14px;
-            padding: 0.25rem 0.5rem;
-            transition: all 0.2s ease;
-        }
-        .stButton > button:hover {
-            background-color: #e9ecef;
-            border-color: #adb5bd;
-            transform: translateY(-1px);
-        }
-        .stButton > button:active {
-            transform: translateY(0);
-        }
-        
-        /* Action button specific styling */
-        .action-buttons {
-            display: flex;
-            gap: 0.5rem;
-            justify-content: flex-end;
-            align-items: center;
-        }
-        
-        /* Mobile responsive adjustments */
-        @media (max-width: 768px) {
-            .stButton > button {
-                font-size: 12px;
-                padding: 0.2rem 0.4rem;
-            }
-            .action-buttons {
-                gap: 0.25rem;
-            }
-        }
-        
-        /* Ensure buttons stay on right side */
-        .element-container:has(.stButton) {
-            display: flex;
-            justify-content: flex-end;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    @staticmethod
-    def render_expense_row(expense, row_number: int) -> Tuple[bool, bool]:
-        """Render expense row with right-aligned action buttons."""
-        # Custom CSS for responsive button alignment
-        st.markdown("""
-        <style>
-        .expense-row {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            width: 100%;
-            margin-bottom: 1rem;
-            padding: 0.5rem;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            background-color: #fafafa;
-        }
-        .expense-content {
-            flex: 1;
-            min-width: 0;
-        }
-        .expense-actions {
-            display: flex;
-            gap: 0.5rem;
-            margin-left: 1rem;
-            flex-shrink: 0;
-        }
-        @media (max-width: 768px) {
-            .expense-row {
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            .expense-actions {
-                align-self: flex-end;
-                margin-left: 0;
-            }
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        with st.container():
-            col1, col2 = st.columns([5, 1], gap="small")
-            
-            with col1:
-                # Single-line formatting: Date and Name on same line
-                st.markdown(f"**{expense.date}** | {expense.name}")
-                st.caption(f"₹{expense.amount} | {expense.description}")
-                if expense.is_recurring:
-                    st.caption(f"🔄 Recurring: {expense.recurrence_type} | Next: {expense.next_due_date or 'N/A'}")
-            
-            with col2:
-                # Right-aligned action buttons with responsive design
-                button_col1, button_col2 = st.columns(2)
-                with button_col1:
-                    edit_clicked = st.button("✏️", key=f"edit_exp_{expense.id}", help="Edit", width="stretch")
-                with button_col2:
-                    delete_clicked = st.button("🗑️", key=f"del_exp_{expense.id}", help="Delete", width="stretch")
-            
-            st.divider()
-            return edit_clicked, delete_clicked
-    
+    def select_rows(records: Sequence, columns: Dict[str, Callable[[Any], Any]], key: str,
+                    page_size: Optional[int] = GRID_PAGE_SIZE) -> List:
+        """Render one page of ``records`` as a single selectable ``st.dataframe``; return the selected records.
+
+        With ``page_size=None`` every record is shown in the given order (for undated lists such as buyers).
+        """
+        if page_size is None:
+            page, start_index = list(records), 0
+        else:
+            page, start_index = EnhancedDataTable.paginate(records, key_prefix=key, page_size=page_size)
+        table = {"#": [RowNumberFormatter.get_row_number(start_index + i) for i in range(len(page))]}
+        for label, value in columns.items():
+            table[label] = [value(r) for r in page]
+
+        # A new grid key drops the selection after a delete or when the page changes
+        nonce = st.session_state.get(f"{key}_grid_nonce", 0)
+        cursors = st.session_state.get(f"{key}_cursors", [])
+        event = st.dataframe(
+            table, key=f"{key}_grid_{nonce}_{len(cursors)}", on_select="rerun",
+            selection_mode="multi-row", hide_index=True, width="stretch"
+        )
+        return [page[i] for i in event.selection.rows if i < len(page)]
+
     @staticmethod
-    def render_transaction_row(transaction, row_number: int, transaction_type: str = "sale") -> Tuple[bool, bool]:
-        """Render transaction row with right-aligned action buttons."""
-        # Custom CSS for responsive button alignment
-        st.markdown("""
-        <style>
-        .transaction-row {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            width: 100%;
-            margin-bottom: 1rem;
-            padding: 0.5rem;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            background-color: #f8f9fa;
-        }
-        .transaction-content {
-            flex: 1;
-            min-width: 0;
-        }
-        .transaction-actions {
-            display: flex;
-            gap: 0.5rem;
-            margin-left: 1rem;
-            flex-shrink: 0;
-        }
-        @media (max-width: 768px) {
-            .transaction-row {
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            .transaction-actions {
-                align-self: flex-end;
-                margin-left: 0;
-            }
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        with st.container():
-            col1, col2 = st.columns([5, 1], gap="small")
-            
-            with col1:
-                if transaction_type == "sale":
-                    st.markdown(f"**{transaction.date}** | {transaction.buyer_name}")
-                    st.caption(f"Qty: {transaction.quantity}L @ ₹{transaction.rate}/L | Total: ₹{transaction.total_amount}")
-                elif transaction_type == "yield":
-                    st.markdown(f"**{transaction.date}** | {transaction.quantity}L")
-                    if hasattr(transaction, 'notes') and transaction.notes:
-                        st.caption(f"Notes: {transaction.notes}")
-            
-            with col2:
-                # Right-aligned action buttons with responsive design
-                button_col1, button_col2 = st.columns(2)
-                with button_col1:
-                    edit_clicked = st.button("✏️", key=f"edit_{transaction_type}_{transaction.id}", help="Edit", width="stretch")
-                with button_col2:
-                    delete_clicked = st.button("🗑️", key=f"del_{transaction_type}_{transaction.id}", help="Delete", width="stretch")
-            
-            st.divider()
-            return edit_clicked, delete_clicked
-    
+    def selection_actions(selected: List, key: str) -> Tuple[bool, bool]:
+        """Edit / Delete buttons for the selected grid rows; returns ``(edit_clicked, delete_confirmed)``.
+
+        Edit needs exactly one selected row; Delete asks for a second click on the same selection.
+        """
+        confirm_key = f"{key}_confirm_delete"
+        selected_ids = [EnhancedDataTable.record_key(r) for r in selected]
+        armed = bool(selected_ids) and st.session_state.get(confirm_key) == selected_ids
+
+        col_edit, col_delete, col_info = st.columns([1, 1, 3])
+        with col_edit:
+            edit_clicked = st.button("✏️ Edit", key=f"{key}_edit", disabled=len(selected) != 1, width="stretch")
+        with col_delete:
+            delete_label = f"🗑️ Confirm ({len(selected)})" if armed else f"🗑️ Delete ({len(selected)})"
+            delete_clicked = st.button(delete_label, key=f"{key}_delete", disabled=not selected, width="stretch")
+        with col_info:
+            if armed:
+                st.warning("Click again to confirm deletion")
+            elif not selected:
+                st.caption("Select rows in the table to edit or delete them.")
+
+        if delete_clicked and not armed:
+            st.session_state[confirm_key] = selected_ids
+            rerun_fragment()
+        if delete_clicked:
+            st.session_state.pop(confirm_key, None)
+        return edit_clicked, delete_clicked
+
     @staticmethod
-    def render_payment_row(payment, row_number: int) -> Tuple[bool, bool]:
-        """Render payment row with right-aligned action buttons."""
-        # Custom CSS for responsive button alignment
-        st.markdown("""
-        <style>
-        .payment-row {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            width: 100%;
-            margin-bottom: 1rem;
-            padding: 0.5rem;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            background-color: #f0f8ff;
-        }
-        .payment-content {
-            flex: 1;
-            min-width: 0;
-        }
-        .payment-actions {
-            display: flex;
-            gap: 0.5rem;
-            margin-left: 1rem;
-            flex-shrink: 0;
-        }
-        @media (max-width: 768px) {
-            .payment-row {
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            .payment-actions {
-                align-self: flex-end;
-                margin-left: 0;
-            }
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        with st.container():
-            col1, col2 = st.columns([5, 1], gap="small")
-            
-            with col1:
-                st.markdown(f"**{payment.date}** | {payment.buyer_name}")
-                st.caption(f"{payment.entry_type}: ₹{payment.amount}")
-                if hasattr(payment, 'notes') and payment.notes:
-                    st.caption(f"Notes: {payment.notes}")
-            
-            with col2:
-                # Right-aligned action buttons with responsive design
-                button_col1, button_col2 = st.columns(2)
-                with button_col1:
-                    edit_clicked = st.button("✏️", key=f"edit_pay_{payment.id}", help="Edit", width="stretch")
-                with button_col2:
-                    delete_clicked = st.button("🗑️", key=f"del_pay_{payment.id}", help="Delete", width="stretch")
-            
-            st.divider()
-            return edit_clicked, delete_clicked
-    
+    def record_key(record) -> str:
+        """Identity of a grid row: the record id, or the name for buyers."""
+        return str(getattr(record, "id", None) or record.name)
+
     @staticmethod
-    def render_buyer_row(buyer, row_number: int) -> Tuple[bool, bool, bool]:
-        """Render buyer row with right-aligned action buttons and clickable name."""
-        # Custom CSS for responsive button alignment
-        st.markdown("""
-        <style>
-        .buyer-row {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            width: 100%;
-            margin-bottom: 1rem;
-            padding: 0.5rem;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            background-color: #fff8dc;
-        }
-        .buyer-content {
-            flex: 1;
-            min-width: 0;
-        }
-        .buyer-actions {
-            display: flex;
-            gap: 0.5rem;
-            margin-left: 1rem;
-            flex-shrink: 0;
-        }
-        @media (max-width: 768px) {
-            .buyer-row {
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            .buyer-actions {
-                align-self: flex-end;
-                margin-left: 0;
-            }
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        with st.container():
-            col1, col2 = st.columns([5, 1], gap="small")
-            
-            with col1:
-                # Clickable buyer name
-                name_clicked = st.button(f"📊 {buyer.name}", key=f"buyer_name_{buyer.name}", 
-                                       help="Click to view calendar", width="stretch")
-                st.caption(f"Rate: ₹{buyer.default_rate}/L")
-            
-            with col2:
-                # Right-aligned action buttons with responsive design
-                button_col1, button_col2 = st.columns(2)
-                with button_col1:
-                    edit_clicked = st.button("✏️", key=f"edit_buyer_{buyer.name}", help="Edit", width="stretch")
-                with button_col2:
-                    delete_clicked = st.button("🗑️", key=f"del_buyer_{buyer.name}", help="Delete", width="stretch")
-            
-            st.divider()
-            return edit_clicked, delete_clicked, name_clicked
-    
+    def reset_selection(key: str):
+        """Clear the grid selection of ``key`` on the next run."""
+        st.session_state[f"{key}_grid_nonce"] = st.session_state.get(f"{key}_grid_nonce", 0) + 1
+        st.session_state.pop(f"{key}_confirm_delete", None)
+
     @staticmethod
     def format_single_line(data: Dict[str, Any]) -> str:
         """Format data for single-line display."""
@@ -321,4 +143,47 @@ class EnhancedDataTable:
     @staticmethod
     def get_row_number(index: int) -> int:
         """Convert 0-based index to 1-based row number."""
-        return index + 1
\ No newline at end of file
+        return index + 1
+
+    @staticmethod
+    def history_key(record) -> Tuple[str, str]:
+        """Keyset cursor of a history row: ``(date, id)``."""
+        return (record.date or "", str(record.id or ""))
+
+    @staticmethod
+    def keyset_page(items: Sequence, cursor: Optional[Tuple[str, str]] = None,
+                    page_size: int = HISTORY_PAGE_SIZE) -> Tuple[List, int, bool]:
+        """Newest-first page of ``items`` strictly older than ``cursor``.
+
+        Returns ``(rows, start_index, has_more)``; one pass plus a bounded heap, no full sort.
+        """
+        key = EnhancedDataTable.history_key
+        older = items if cursor is None else [it for it in items if key(it) < tuple(cursor)]
+        rows = heapq.nlargest(page_size + 1, older, key=key)
+        return rows[:page_size], len(items) - len(older), len(rows) > page_size
+
+    @staticmethod
+    def paginate(items: Sequence, key_prefix: str, page_size: int = HISTORY_PAGE_SIZE) -> Tuple[List, int]:
+        """Render Newer/Older controls for a history list and return ``(page_rows, start_index)``."""
+        cursors = st.session_state.setdefault(f"{key_prefix}_cursors", [])
+        rows, start_index, has_more = EnhancedDataTable.keyset_page(items, cursors[-1] if cursors else None, page_size)
+        if not rows and cursors:
+            # Everything after the cursor was deleted; go back to the newest page
+            cursors.clear()
+            rows, start_index, has_more = EnhancedDataTable.keyset_page(items, None, page_size)
+
+        if cursors or has_more:
+            col_prev, col_info, col_next = st.columns([1, 3, 1])
+            with col_prev:
+                if st.button("← Newer", key=f"{key_prefix}_newer", disabled=not cursors, width="stretch"):
+                    cursors.pop()
+                    rerun_fragment()
+            with col_info:
+                first = RowNumberFormatter.get_row_number(start_index)
+                last = RowNumberFormatter.get_row_number(start_index + len(rows) - 1)
+                st.caption(f"Page {len(cursors) + 1} · rows {first}–{last} of {len(items)}")
+            with col_next:
+                if st.button("Older →", key=f"{key_prefix}_older", disabled=not has_more, width="stretch"):
+                    cursors.append(EnhancedDataTable.history_key(rows[-1]))
+                    rerun_fragment()
+        return rows, start_index
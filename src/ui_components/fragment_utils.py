@@ -0,0 +1,11 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+
+def rerun_fragment():
+    """Rerun only the enclosing ``st.fragment``; falls back to a full rerun when the
+    fragment is executing as part of a full-app run (where fragment scope is not allowed)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -1,6 +1,16 @@
 import streamlit as st
 from datetime import datetime, timedelta
 from typing import Optional
+from .style_registry import StyleRegistry
+
+StyleRegistry.register("nav-month-label", """
+.nav-month-label {
+    text-align: center;
+    font-weight: bold;
+    padding: 8px;
+    font-size: 16px;
+}
+""")
 
 class NavigationControls:
     """Month/year navigation controls for calendar views."""
@@ -30,8 +40,7 @@ class NavigationControls:
             # Display current month/year with today button
             col2a, col2b = st.columns([2, 1])
             with col2a:
-                st.markdown(f"<div style='text-align: center; font-weight: bold; padding: 8px; font-size: 16px;'>"
-                           f"{current_date.strftime('%B %Y')}</div>", 
+                st.markdown(f"<div class='nav-month-label'>{current_date.strftime('%B %Y')}</div>",
                            unsafe_allow_html=True)
             with col2b:
                 if st.button("Today", key=f"{key_prefix}_today", help="Go to Current Month", width="stretch"):
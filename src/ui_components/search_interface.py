@@ -1,12 +1,15 @@
 import streamlit as st
 from typing import List, Optional
+from src.buyer_search import BuyerSearchIndex
+
+SEARCH_RESULT_LIMIT = 25
 
 class SearchInterface:
     """Buyer name search functionality with real-time filtering."""
     
     @staticmethod
     def render(buyers: List[str], placeholder: str = "Search buyer name...", 
-               key_prefix: str = "search") -> Optional[str]:
+               key_prefix: str = "search", index: Optional[BuyerSearchIndex] = None) -> Optional[str]:
         """Render search interface and return selected buyer or search query."""
         
         # Search input
@@ -20,18 +23,19 @@ class SearchInterface:
         if not search_query:
             return None
         
-        # Filter buyers based on search query
-        filtered_buyers = SearchInterface.filter_buyers(search_query, buyers)
+        # Top 10 ranked matches, falling back to fuzzy matches for typos
+        index = index or BuyerSearchIndex(buyers)
+        filtered_buyers = index.search(search_query, k=10, fuzzy=True)
         
         if not filtered_buyers:
             st.info("No buyers found matching your search.")
             return search_query
         
         # Display filtered results
-        st.write(f"Found {len(filtered_buyers)} buyer(s):")
+        st.write(f"Found {max(index.count(search_query), len(filtered_buyers))} buyer(s):")
         
         selected_buyer = None
-        for buyer in filtered_buyers[:10]:  # Limit to top 10 results
+        for buyer in filtered_buyers:
             if st.button(buyer, key=f"{key_prefix}_buyer_{buyer}", width="stretch"):
                 selected_buyer = buyer
                 # Store selected buyer in session state
@@ -41,22 +45,15 @@ class SearchInterface:
         return selected_buyer or st.session_state.get(f"{key_prefix}_selected_buyer")
     
     @staticmethod
-    def filter_buyers(query: str, buyers: List[str]) -> List[str]:
-        """Filter buyers based on search query."""
+    def filter_buyers(query: str, buyers: List[str], index: Optional[BuyerSearchIndex] = None,
+                      k: Optional[int] = None) -> List[str]:
+        """Filter buyers by query: exact matches first, then starts with, then contains.
+
+        Pass a prebuilt ``index`` (``DataManager.get_buyer_search_index()``) to avoid rebuilding it per keystroke.
+        """
         if not query or not buyers:
             return buyers
-        
-        query_lower = query.lower().strip()
-        
-        # Filter buyers that contain the query (case-insensitive)
-        filtered = [buyer for buyer in buyers if query_lower in buyer.lower()]
-        
-        # Sort by relevance (exact matches first, then starts with, then contains)
-        exact_matches = [b for b in filtered if b.lower() == query_lower]
-        starts_with = [b for b in filtered if b.lower().startswith(query_lower) and b not in exact_matches]
-        contains = [b for b in filtered if b not in exact_matches and b not in starts_with]
-        
-        return exact_matches + starts_with + contains
+        return (index or BuyerSearchIndex(buyers)).search(query, k=k)
     
     @staticmethod
     def handle_search_state(key_prefix: str = "search") -> str:
@@ -73,8 +70,9 @@ class SearchInterface:
     
     @staticmethod
     def render_buyer_list_with_search(buyers: List[str], on_buyer_click_callback=None, 
-                                    key_prefix: str = "buyer_list") -> Optional[str]:
-        """Render searchable buyer list with click callbacks."""
+                                    key_prefix: str = "buyer_list", index: Optional[BuyerSearchIndex] = None,
+                                    limit: int = SEARCH_RESULT_LIMIT) -> Optional[str]:
+        """Render searchable buyer list (top ``limit`` ranked matches) with click callbacks."""
         
         if not buyers:
             st.info("No buyers available.")
@@ -87,18 +85,20 @@ class SearchInterface:
             placeholder="Type buyer name to search"
         )
         
-        # Filter buyers
-        if search_query:
-            filtered_buyers = SearchInterface.filter_buyers(search_query, buyers)
-        else:
-            filtered_buyers = buyers
+        # Top ranked matches, falling back to fuzzy matches for typos
+        index = index or BuyerSearchIndex(buyers)
+        filtered_buyers = index.search(search_query, k=limit, fuzzy=True)
         
         if not filtered_buyers:
             st.warning("No buyers match your search.")
             return None
         
         # Display results
-        st.write(f"Showing {len(filtered_buyers)} buyer(s):")
+        total = max(index.count(search_query), len(filtered_buyers))
+        if total > len(filtered_buyers):
+            st.write(f"Showing top {len(filtered_buyers)} of {total} buyer(s):")
+        else:
+            st.write(f"Showing {len(filtered_buyers)} buyer(s):")
         
         selected_buyer = None
         for i, buyer in enumerate(filtered_buyers):
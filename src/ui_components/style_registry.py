@@ -0,0 +1,34 @@
+import re
+import streamlit as st
+from typing import Dict
+
+class StyleRegistry:
+    """Named CSS blocks, injected once per page render as a single minified ``<style>`` element.
+
+    Components register their CSS at import time; ``app.py`` calls ``inject()`` once at page
+    level, so the stylesheet sits outside every fragment and survives fragment reruns.
+    """
+
+    _styles: Dict[str, str] = {}
+
+    @classmethod
+    def register(cls, name: str, css: str):
+        """Add (or replace) the CSS block ``name``; registering twice never duplicates it."""
+        cls._styles[name] = cls.minify(css)
+
+    @staticmethod
+    def minify(css: str) -> str:
+        """Strip comments and collapse whitespace."""
+        css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+        css = re.sub(r"\s+", " ", css)
+        return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+    @classmethod
+    def stylesheet(cls) -> str:
+        """Every registered block in one ``<style>`` element."""
+        return "<style>" + "".join(cls._styles.values()) + "</style>"
+
+    @classmethod
+    def inject(cls):
+        """Emit the stylesheet; call once per page render."""
+        st.markdown(cls.stylesheet(), unsafe_allow_html=True)
@@ -0,0 +1,61 @@
+from typing import Any, List, NamedTuple, Optional
+from src.models import Expense, MilkSale, Payment, Cow, CowEvent, DailyYield
+
+# Collections a unit of work can touch -> record type. Buyers are keyed by name and
+# updated by rate, so they keep their own methods.
+RECORD_TYPES = {
+    "expenses": Expense,
+    "milk_sales": MilkSale,
+    "daily_yields": DailyYield,
+    "payments": Payment,
+    "cows": Cow,
+    "cow_events": CowEvent,
+}
+
+# Collection -> suffix of its DataManager add_/update_/delete_ methods
+METHOD_SUFFIX = {
+    "expenses": "expense",
+    "milk_sales": "milk_sale",
+    "daily_yields": "daily_yield",
+    "payments": "payment",
+    "cows": "cow",
+    "cow_events": "cow_event",
+}
+
+
+class Mutation(NamedTuple):
+    kind: str  # 'add', 'update' or 'delete'
+    collection: str
+    record: Any = None  # the new record for add/update
+    record_id: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        return self.record.id if self.record is not None else self.record_id
+
+
+class UnitOfWork:
+    """Mutations collected across collections and handed to the backend in one commit.
+
+    Use through ``DataManager.unit_of_work()``; nothing is written if the block raises.
+    """
+
+    def __init__(self):
+        self.mutations: List[Mutation] = []
+
+    @staticmethod
+    def _check(collection: str):
+        if collection not in RECORD_TYPES:
+            raise ValueError(f"Unit of work does not support collection '{collection}'")
+
+    def add(self, collection: str, record) -> None:
+        self._check(collection)
+        self.mutations.append(Mutation("add", collection, record))
+
+    def update(self, collection: str, record) -> None:
+        self._check(collection)
+        self.mutations.append(Mutation("update", collection, record))
+
+    def delete(self, collection: str, record_id: str) -> None:
+        self._check(collection)
+        self.mutations.append(Mutation("delete", collection, record_id=record_id))
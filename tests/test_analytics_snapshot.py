@@ -0,0 +1,66 @@
+import unittest
+import io
+import os
+import shutil
+import zipfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src import analytics_snapshot, reports_engine
+from src.data_manager import LocalJSONBackend
+from src.models import Expense, MilkSale, DailyYield
+
+class TestAnalyticsSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_snapshot"
+        self.dm = LocalJSONBackend(data_dir=os.path.join(self.test_dir, "data"))
+        self.dm.add_milk_sales([
+            MilkSale(id=f"S{i}", date=f"2024-{1 + i % 3:02d}-{1 + i % 28:02d}", buyer_name="John" if i % 2 else "Mary",
+                     quantity=float(i), rate=50.0, total_amount=i * 50.0) for i in range(60)
+        ] + [MilkSale(id="BAD", date="someday", buyer_name="John", quantity=1.0, rate=50.0, total_amount=50.0)])
+        self.dm.add_daily_yield(DailyYield(id="Y1", date="2024-02-01", quantity=30.0, notes=""))
+        self.dm.add_expense(Expense(id="X1", date="2024-02-10", name="Feed", description="", amount=100.0,
+                                    is_recurring=True, recurrence_type="monthly", next_due_date="2024-03-10"))
+        self.snapshot = os.path.join(self.test_dir, "snapshot")
+        self.counts = analytics_snapshot.write_snapshot(self.dm, self.snapshot, row_group_size=10)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_typed_columns_and_manifest(self):
+        sales = pq.read_schema(os.path.join(self.snapshot, "milk_sales.parquet"))
+        self.assertEqual((sales.field("date").type, sales.field("quantity").type), (pa.date32(), pa.float64()))
+        expenses = pq.read_schema(os.path.join(self.snapshot, "expenses.parquet"))
+        self.assertEqual((expenses.field("is_recurring").type, expenses.field("next_due_date").type), (pa.bool_(), pa.date32()))
+        self.assertEqual(analytics_snapshot.read_manifest(self.snapshot)["collections"], self.counts)
+        self.assertEqual((self.counts["milk_sales"], self.counts["expenses"], self.counts["cows"]), (61, 1, 0))
+        with self.assertRaises(FileExistsError):
+            analytics_snapshot.write_snapshot(self.dm, self.snapshot)
+
+    def test_range_read_skips_row_groups(self):
+        parquet = pq.ParquetFile(os.path.join(self.snapshot, "milk_sales.parquet"))
+        self.assertEqual(parquet.metadata.num_row_groups, 7)
+        self.assertLess(len(analytics_snapshot.row_groups(parquet, "2024-02-01", "2024-02-31")), 7)
+
+        frame = analytics_snapshot.report_frame(self.snapshot, "milk_sales", "2024-02-01", "2024-02-29")
+        self.assertEqual(list(frame.columns), reports_engine.FRAME_COLUMNS["milk_sales"])
+        live = [s for s in self.dm.get_milk_sales() if "2024-02-01" <= s.date <= "2024-02-29"]
+        self.assertEqual(sorted(frame["quantity"]), sorted(s.quantity for s in live))
+        self.assertTrue(frame["date"].between("2024-02-01", "2024-02-29").all())
+
+    def test_report_frames_match_live_reports(self):
+        frames = {c: analytics_snapshot.report_frame(self.snapshot, c) for c in ("milk_sales", "expenses", "daily_yields")}
+        from_snapshot = reports_engine.monthly_summary(frames["milk_sales"], frames["expenses"], frames["daily_yields"])
+        live = reports_engine.monthly_summary(reports_engine.sales_frame(self.dm.get_milk_sales()),
+                                              reports_engine.expenses_frame(self.dm.get_expenses()),
+                                              reports_engine.yields_frame(self.dm.get_daily_yields()))
+        self.assertEqual(from_snapshot.to_dict("records"), live.to_dict("records"))
+
+    def test_zip_holds_the_same_files(self):
+        with zipfile.ZipFile(io.BytesIO(analytics_snapshot.snapshot_zip(self.dm))) as archive:
+            self.assertEqual(sorted(archive.namelist()), sorted(os.listdir(self.snapshot)))
+            table = pq.read_table(io.BytesIO(archive.read("milk_sales.parquet")))
+        self.assertEqual(table.num_rows, 61)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.models import MilkSale, Payment
+
+class TestBalanceLedger(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_ledger"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_running_totals_follow_mutations(self):
+        self.dm.add_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=10, rate=50, total_amount=500))
+        ledger = self.dm.get_balance_ledger()
+        self.assertEqual(ledger.balance("John"), 500)
+
+        self.dm.add_milk_sale(MilkSale(id="S2", date="2023-10-02", buyer_name="John", quantity=4, rate=50, total_amount=200))
+        self.dm.add_payment(Payment(id="P1", date="2023-10-03", buyer_name="John", entry_type="Payment", amount=300, notes=""))
+        self.dm.add_payment(Payment(id="P2", date="2023-10-03", buyer_name="John", entry_type="Advance", amount=100, notes=""))
+        self.assertEqual(ledger.balance("John"), 300)
+
+        self.dm.update_milk_sale(MilkSale(id="S2", date="2023-10-02", buyer_name="John", quantity=5, rate=50, total_amount=250))
+        self.dm.delete_payment("P2")
+        entry = ledger.get("John")
+        self.assertEqual(entry.sales_amount, 750)
+        self.assertEqual(entry.sales_quantity, 15)
+        self.assertEqual(entry.payments, 300)
+        self.assertEqual(entry.advances, 0)
+        self.assertEqual(entry.balance, 450)
+
+        # Incremental totals match a full rebuild
+        self.dm._reset_derived("milk_sales")
+        self.assertEqual(self.dm.get_balance_ledger().balance("John"), 450)
+
+    def test_sale_moved_between_buyers(self):
+        self.dm.add_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=10, rate=50, total_amount=500))
+        ledger = self.dm.get_balance_ledger()
+        self.dm.update_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="Mary", quantity=10, rate=50, total_amount=500))
+        self.assertEqual(ledger.balance("John"), 0)
+        self.assertEqual(ledger.balance("Mary"), 500)
+        self.assertEqual(ledger.balance("Unknown"), 0)
+
+    def test_external_write_rebuilds_ledger(self):
+        self.dm.get_balance_ledger()
+        other = LocalJSONBackend(data_dir=self.test_dir)
+        other.add_milk_sale(MilkSale(id="S9", date="2023-10-05", buyer_name="John", quantity=2, rate=50, total_amount=100))
+        # Ensure the file signature differs even on coarse-grained filesystems
+        os.utime(other.files["milk_sales"], ns=(1, 1))
+        self.assertEqual(self.dm.get_balance_ledger().balance("John"), 100)
+
+if __name__ == '__main__':
+    unittest.main()
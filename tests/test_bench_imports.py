@@ -0,0 +1,30 @@
+import unittest
+from benchmarks.bench_imports import startup_modules, tab_modules, measure, parse_importtime, check_budgets
+
+class TestBenchImports(unittest.TestCase):
+    def test_startup_is_read_from_app(self):
+        modules = startup_modules()
+        self.assertIn("streamlit", modules)
+        self.assertNotIn("src.google_sheets_backend", modules)
+        self.assertEqual(modules[-1], tab_modules()[0])
+
+    def test_local_startup_skips_sheets_and_pandas(self):
+        loaded = {row["module"].split(".")[0] for row in measure(startup_modules())}
+        self.assertIn("streamlit", loaded)
+        for package in ("gspread", "pandas", "numpy"):
+            self.assertNotIn(package, loaded)
+
+    def test_parse_and_budget(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       100 |        100 | early\n"
+                  "--- measured imports ---\n"
+                  "import time:       300 |        300 |   pandas.core\n"
+                  "import time:      1200 |       1500 | pandas\n")
+        rows = parse_importtime(stderr)
+        self.assertEqual([(r["module"], r["depth"]) for r in rows], [("pandas.core", 1), ("pandas", 0)])
+        results = {"startup": {"total_ms": 1.5, "modules": ["pandas", "pandas.core"], "top": []}}
+        self.assertEqual(check_budgets(results, {"default": {"total_ms": 1, "forbidden": ["pandas", "numpy"]}}),
+                         ["startup: 1.5 ms > budget 1 ms", "startup: imports pandas (pandas, pandas.core)"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import os
+import shutil
+from benchmarks.synthetic_data import generate, write_local
+from benchmarks.bench_tabs import CountingBackend, render_tab, check_budgets
+from src.data_manager import LocalJSONBackend
+
+class TestBenchTabs(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_bench_tabs"
+        write_local(generate(years=1, buyers=3, cows=2), self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_render_records_metrics_per_rerun(self):
+        runs = render_tab("expenses", CountingBackend(LocalJSONBackend(data_dir=self.test_dir)))
+        self.assertEqual([r["rerun"] for r in runs], ["cold", "warm"])
+        for r in runs:
+            self.assertGreater(r["elements"], 0)
+            self.assertEqual(r["calls"].get("get_expenses"), 1)
+            self.assertEqual(r["file_reads"], 1)
+
+    def test_budget_check(self):
+        results = [{"scale": "small", "tab": "cows", "rerun": "warm", "seconds": 0.5, "backend_calls": 3, "file_reads": 1, "elements": 40}]
+        budgets = {"small": {"default": {"warm": {"seconds": 1.0, "elements": 30}}}}
+        self.assertEqual(check_budgets(results, budgets), ["small/cows/warm: elements 40 > budget 30"])
+        self.assertEqual(check_budgets(results, {}), [])
+
+if __name__ == '__main__':
+    unittest.main()
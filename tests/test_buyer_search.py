@@ -0,0 +1,54 @@
+import unittest
+import os
+import random
+import shutil
+from src.buyer_search import BuyerSearchIndex
+from src.data_manager import LocalJSONBackend
+from src.models import Buyer
+
+def reference_filter(query, buyers):
+    """The original list-scan ranking: exact, then starts with, then contains."""
+    q = query.lower().strip()
+    filtered = [b for b in buyers if q in b.lower()]
+    exact = [b for b in filtered if b.lower() == q]
+    starts = [b for b in filtered if b.lower().startswith(q) and b not in exact]
+    return exact + starts + [b for b in filtered if b not in exact and b not in starts]
+
+class TestBuyerSearch(unittest.TestCase):
+    def test_matches_reference_ranking(self):
+        rng = random.Random(7)
+        names = ["".join(rng.choice("abcde ") for _ in range(rng.randint(2, 8))).strip() or "a" for _ in range(300)]
+        names = list(dict.fromkeys(names))
+        index = BuyerSearchIndex(names)
+        for query in ["a", "ab", "Ab", "bca", "e d", "dddd", "zz", " c "]:
+            self.assertEqual(index.search(query), reference_filter(query, names), query)
+
+    def test_top_k_and_fuzzy(self):
+        index = BuyerSearchIndex(["Ramesh", "Ram", "Suresh", "Rajesh", "Mahesh"])
+        self.assertEqual(index.search("ram", k=1), ["Ram"])
+        self.assertEqual(index.search("esh"), ["Ramesh", "Suresh", "Rajesh", "Mahesh"])
+        self.assertEqual(index.count("esh"), 4)
+        self.assertEqual(index.search("rmesh"), [])
+        self.assertEqual(index.search("rmesh", fuzzy=True)[0], "Ramesh")
+        self.assertEqual(index.search(""), ["Ramesh", "Ram", "Suresh", "Rajesh", "Mahesh"])
+
+class TestBuyerSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_buyer_search"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_index_cached_per_buyer_list_version(self):
+        self.dm.add_buyer(Buyer(name="John", default_rate=50))
+        index = self.dm.get_buyer_search_index()
+        self.assertIs(self.dm.get_buyer_search_index(), index)
+        self.dm.add_buyer(Buyer(name="Johanna", default_rate=45))
+        rebuilt = self.dm.get_buyer_search_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.search("joh"), ["John", "Johanna"])
+
+if __name__ == '__main__':
+    unittest.main()
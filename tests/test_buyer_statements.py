@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+from src.buyer_statements import StatementIndex
+from src.data_manager import LocalJSONBackend
+from src.models import MilkSale, Payment
+
+class TestBuyerStatements(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_statements"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.dm.add_milk_sale(MilkSale(id="S1", date="2023-09-30", buyer_name="John", quantity=10, rate=50, total_amount=500))
+        self.dm.add_milk_sale(MilkSale(id="S2", date="2023-10-01", buyer_name="John", quantity=4, rate=50, total_amount=200))
+        self.dm.add_payment(Payment(id="P1", date="2023-10-01", buyer_name="John", entry_type="Payment", amount=300, notes="Cash"))
+        self.dm.add_milk_sale(MilkSale(id="S3", date="2023-10-31", buyer_name="John", quantity=2, rate=50, total_amount=100))
+        self.dm.add_payment(Payment(id="P2", date="2023-11-02", buyer_name="John", entry_type="Advance", amount=50, notes=""))
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_point_in_time_balances(self):
+        statement = self.dm.get_statement_index().get("John")
+        self.assertEqual(statement.balance_as_of("2023-09-29"), 0)
+        self.assertEqual(statement.balance_as_of("2023-09-30"), 500)
+        self.assertEqual(statement.balance_as_of("2023-10-01"), 400)
+        self.assertEqual(statement.opening_balance("2023-10-01"), 500)
+        self.assertEqual(statement.balance_as_of("2023-12-31"), 450)
+
+    def test_period_totals(self):
+        period = self.dm.get_statement_index().get("John").period("2023-10-01", "2023-10-31")
+        self.assertEqual(period.opening_balance, 500)
+        self.assertEqual(period.sales_amount, 300)
+        self.assertEqual(period.sales_quantity, 6)
+        self.assertEqual(period.received, 300)
+        self.assertEqual(period.closing_balance, 500)
+        self.assertEqual([e.record_id for e in period.entries], ["S2", "P1", "S3"])
+        self.assertEqual(period.running_balances, [700, 400, 500])
+
+    def test_index_follows_mutations(self):
+        index = self.dm.get_statement_index()
+        self.dm.update_milk_sale(MilkSale(id="S1", date="2023-10-15", buyer_name="John", quantity=10, rate=50, total_amount=500))
+        self.dm.delete_payment("P1")
+        statement = index.get("John")
+        self.assertEqual(statement.opening_balance("2023-10-01"), 0)
+        self.assertEqual(statement.balance_as_of("2023-10-15"), 700)
+        self.assertEqual(statement.balance_as_of("2023-12-31"), 750)
+        self.assertEqual(self.dm.get_balance_ledger().balance("John"), 750)
+
+    def test_entries_without_ids_are_removed_one_at_a_time(self):
+        small = Payment(id=None, date="2023-10-05", buyer_name="John", entry_type="Payment", amount=10, notes="")
+        large = Payment(id=None, date="2023-10-05", buyer_name="John", entry_type="Payment", amount=90, notes="")
+        index = StatementIndex.build([], [small, large])
+        index.apply("payments", old=large)
+        self.assertEqual(index.get("John").balance_as_of("2023-10-05"), -10)
+
+    def test_last_sale_day(self):
+        statement = self.dm.get_statement_index().get("John")
+        self.assertEqual(statement.last_sale_day("2023-10-31"), "2023-10-01")
+        self.assertEqual(statement.last_sale_day("2023-11-05"), "2023-10-31")
+        self.assertIsNone(statement.last_sale_day("2023-09-30"))
+        self.assertEqual(statement.sales_quantity_on("2023-10-01"), 4)
+        self.assertEqual(statement.sales_quantity_on("2023-11-02"), 0)
+
+    def test_batch_sales_single_write(self):
+        index = self.dm.get_statement_index()
+        writes = []
+        write_json = self.dm._write_json
+        self.dm._write_json = lambda name, data: (writes.append(name), write_json(name, data))
+        self.dm.add_milk_sales([
+            MilkSale(id="S4", date="2023-11-03", buyer_name="John", quantity=3, rate=50, total_amount=150),
+            MilkSale(id="S5", date="2023-11-03", buyer_name="Mary", quantity=2, rate=40, total_amount=80),
+        ])
+        self.assertEqual(writes, ["milk_sales"])
+        self.assertEqual(len(self.dm.get_milk_sales()), 5)
+        self.assertEqual(index.get("John").sales_quantity_on("2023-11-03"), 3)
+        self.assertEqual(self.dm.get_balance_ledger().balance("Mary"), 80)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import multiprocessing
+import os
+import shutil
+import threading
+from src.data_manager import LocalJSONBackend
+from src.file_lock import RWLock, fcntl
+from src.models import MilkSale
+
+SALES_PER_WRITER = 15
+
+def add_sales(data_dir, writer, threads=2):
+    """Each thread gets its own backend, as each Streamlit session does, and records its sales one by one."""
+    def run(t):
+        dm = LocalJSONBackend(data_dir=data_dir)
+        for i in range(SALES_PER_WRITER):
+            sid = f"{writer}-{t}-{i}"
+            dm.add_milk_sale(MilkSale(id=sid, date="2024-03-01", buyer_name=f"B{t}", quantity=1.0, rate=50.0, total_amount=50.0))
+            if i % 5 == 4:
+                dm.update_milk_sale(MilkSale(id=sid, date="2024-03-01", buyer_name=f"B{t}", quantity=2.0, rate=50.0, total_amount=100.0))
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+class TestConcurrentWrites(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_concurrent"
+        LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def assert_no_lost_updates(self, writers, threads):
+        sales = LocalJSONBackend(data_dir=self.test_dir).get_milk_sales()
+        self.assertEqual(len(sales), writers * threads * SALES_PER_WRITER)
+        self.assertEqual(len({s.id for s in sales}), len(sales))
+        self.assertEqual(sum(s.quantity for s in sales), writers * threads * (SALES_PER_WRITER + SALES_PER_WRITER // 5))
+
+    def test_threads(self):
+        add_sales(self.test_dir, "w", threads=6)
+        self.assert_no_lost_updates(1, 6)
+
+    @unittest.skipIf(fcntl is None, "no cross-process file locking on this platform")
+    def test_processes(self):
+        processes = [multiprocessing.Process(target=add_sales, args=(self.test_dir, f"p{n}")) for n in range(3)]
+        for p in processes:
+            p.start()
+        add_sales(self.test_dir, "main")
+        for p in processes:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+        self.assert_no_lost_updates(4, 2)
+
+    def test_readers_share_writers_exclude(self):
+        lock, inside, order = RWLock(), threading.Barrier(2, timeout=5), []
+        def reader():
+            with lock.read():
+                inside.wait()  # both readers are in at once
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for r in readers:
+            r.start()
+        for r in readers:
+            r.join()
+        self.assertFalse(inside.broken)
+
+        def writer_fn():
+            with lock.write():
+                order.append("write")
+        with lock.read():
+            writer = threading.Thread(target=writer_fn)
+            writer.start()
+            writer.join(0.2)
+            order.append("read done")
+        writer.join(5)
+        self.assertEqual(order, ["read done", "write"])
+
+    def test_reentrant_within_write(self):
+        lock = RWLock()
+        with lock.write() as outer:
+            with lock.read() as nested_read, lock.write() as nested_write:
+                self.assertEqual((outer, nested_read, nested_write), (True, False, False))
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+
+if __name__ == '__main__':
+    unittest.main()
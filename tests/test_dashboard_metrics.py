@@ -0,0 +1,48 @@
+import unittest
+import os
+import shutil
+from datetime import date
+from src.data_manager import LocalJSONBackend
+from src.dashboard_metrics import get_dashboard_metrics
+from src.models import Expense, MilkSale, DailyYield, CowEvent
+
+class TestDashboardMetrics(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_dashboard"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.today = date(2024, 3, 15)
+        self.dm.add_expense(Expense(date="2024-03-01", name="Feed", description="", amount=100))
+        self.dm.add_expense(Expense(date="2024-01-10", name="Vet", description="", amount=50))
+        self.dm.add_expense(Expense(date="2023-12-31", name="Old", description="", amount=999))
+        self.dm.add_milk_sale(MilkSale(date="2024-03-02", buyer_name="John", quantity=10, rate=50, total_amount=500))
+        self.dm.add_milk_sale(MilkSale(date="2024-02-02", buyer_name="John", quantity=4, rate=50, total_amount=200))
+        self.dm.add_daily_yield(DailyYield(date="2024-03-03", quantity=30, notes=""))
+        self.dm.add_cow_event(CowEvent(date="2024-03-04", cow_id="Bessie", event_type="Yield", value="12.5L",
+                                       next_due_date="2024-03-10"))
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_metrics(self):
+        m = get_dashboard_metrics(self.dm, self.today)
+        self.assertEqual(m.month_opex, 100)
+        self.assertEqual(m.ytd_opex, 150)
+        self.assertEqual(m.month_produced, 42.5)
+        self.assertEqual(m.month_sold, 10)
+        self.assertEqual(m.month_revenue, 500)
+        self.assertEqual(m.realized_rate, 50)
+        self.assertEqual(m.ytd_revenue, 700)
+        self.assertEqual(m.net_profit, 550)
+        self.assertEqual(m.notifications, ["Cow Bessie: Yield due on 2024-03-10"])
+
+    def test_memoized_until_data_or_date_changes(self):
+        first = get_dashboard_metrics(self.dm, self.today)
+        self.assertIs(get_dashboard_metrics(self.dm, self.today), first)
+        self.assertIsNot(get_dashboard_metrics(self.dm, date(2024, 3, 16)), first)
+
+        self.dm.add_expense(Expense(date="2024-03-05", name="Salt", description="", amount=10))
+        self.assertEqual(get_dashboard_metrics(self.dm, self.today).month_opex, 110)
+
+if __name__ == '__main__':
+    unittest.main()
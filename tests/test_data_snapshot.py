@@ -0,0 +1,42 @@
+import unittest
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.data_snapshot import DataSnapshot
+from src.models import Buyer, MilkSale
+
+class TestDataSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_snapshot"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.dm.add_buyer(Buyer(name="John", default_rate=50))
+        self.reads = []
+        read_json = self.dm._read_json
+        self.dm._read_json = lambda key: (self.reads.append(key), read_json(key))[1]
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_reads_each_collection_once(self):
+        snap = DataSnapshot(self.dm)
+        for _ in range(3):
+            self.assertEqual([b.name for b in snap.get_buyers()], ["John"])
+        snap.get_milk_sales()
+        snap.get_milk_sales().append("scratch")
+        self.assertEqual(snap.get_milk_sales(), [])
+        self.assertEqual(self.reads, ["buyers", "milk_sales"])
+
+    def test_refreshes_after_writes(self):
+        snap = DataSnapshot(self.dm)
+        snap.get_buyers()
+        snap.add_buyer(Buyer(name="Mary", default_rate=40))
+        self.assertEqual([b.name for b in snap.get_buyers()], ["John", "Mary"])
+        # Writes made by another session to the file are picked up as well
+        LocalJSONBackend(data_dir=self.test_dir).add_milk_sale(
+            MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=1, rate=50, total_amount=50))
+        self.assertEqual(len(snap.get_milk_sales()), 1)
+        self.assertEqual(snap.get_balance_ledger().balance("John"), 50)
+
+if __name__ == '__main__':
+    unittest.main()
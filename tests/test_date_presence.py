@@ -0,0 +1,59 @@
+import unittest
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.date_presence import DatePresence
+from src.models import MilkSale, DailyYield
+
+def sale(sid, day, buyer="John"):
+    return MilkSale(id=sid, date=day, buyer_name=buyer, quantity=1, rate=50, total_amount=50)
+
+class TestDatePresence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_presence"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bitmap_and_counts(self):
+        presence = DatePresence()
+        for day in ["2023-10-01", "2023-10-01", "2023-10-31", "2023-11-05", "bad", None, "2023-13-01"]:
+            presence.add(day)
+        october = presence.month(2023, 10)
+        self.assertEqual(october.days(), [1, 31])
+        self.assertEqual(october.count(1), 2)
+        self.assertTrue(october.has(31))
+        self.assertFalse(october.has(2))
+        self.assertEqual(presence.years(), [2023])
+        self.assertEqual(presence.month(2024, 1).days(), [])
+
+        presence.add("2023-10-01", -1)
+        self.assertEqual(presence.count("2023-10-01"), 1)
+        presence.add("2023-11-05", -1)
+        self.assertFalse(presence.month(2023, 11))
+
+    def test_index_follows_mutations_per_collection_and_buyer(self):
+        self.dm.add_milk_sale(sale("S1", "2023-10-01"))
+        self.dm.add_milk_sale(sale("S2", "2023-10-02", buyer="Mary"))
+        index = self.dm.get_date_presence_index()
+        self.assertEqual(index.get("milk_sales").month(2023, 10).days(), [1, 2])
+        self.assertEqual(index.get("milk_sales", "John").month(2023, 10).days(), [1])
+
+        # Move S1 to Mary on a new date, add a yield, delete S2
+        self.dm.update_milk_sale(sale("S1", "2023-10-05", buyer="Mary"))
+        self.dm.add_daily_yield(DailyYield(id="Y1", date="2024-01-03", quantity=10, notes=""))
+        self.dm.delete_milk_sale("S2")
+        self.assertEqual(index.get("milk_sales").month(2023, 10).days(), [5])
+        self.assertEqual(index.get("milk_sales", "John").month(2023, 10).days(), [])
+        self.assertEqual(index.get("milk_sales", "Mary").month(2023, 10).days(), [5])
+        self.assertEqual(index.get("daily_yields").years(), [2024])
+
+        # Incremental state matches a full rebuild
+        self.dm._reset_derived("milk_sales")
+        rebuilt = self.dm.get_date_presence_index()
+        self.assertEqual(rebuilt.get("milk_sales", "Mary").month(2023, 10).days(), [5])
+
+if __name__ == '__main__':
+    unittest.main()
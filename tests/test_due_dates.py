@@ -0,0 +1,62 @@
+import unittest
+import os
+import shutil
+from datetime import date
+from src.data_manager import LocalJSONBackend
+from src.due_dates import next_occurrence, post_due_recurring_expenses
+from src.models import Expense, CowEvent
+
+class TestDueDates(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_due"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_next_occurrence(self):
+        self.assertEqual(next_occurrence(date(2024, 1, 31), "Monthly"), date(2024, 2, 29))
+        self.assertEqual(next_occurrence(date(2023, 12, 15), "monthly"), date(2024, 1, 15))
+        self.assertEqual(next_occurrence(date(2024, 2, 29), "Yearly"), date(2025, 2, 28))
+        self.assertIsNone(next_occurrence(date(2024, 1, 1), "Custom"))
+        # The schedule's own day survives a clamped month or year
+        self.assertEqual(next_occurrence(date(2024, 2, 29), "Monthly", 31), date(2024, 3, 31))
+        self.assertEqual(next_occurrence(date(2025, 2, 28), "Yearly", 29), date(2026, 2, 28))
+        self.assertEqual(next_occurrence(date(2027, 2, 28), "Yearly", 29), date(2028, 2, 29))
+
+    def test_index_range_lookup(self):
+        self.dm.add_expense(Expense(id="E1", date="2024-01-01", name="Rent", description="", amount=1000,
+                                    is_recurring=True, recurrence_type="Monthly", next_due_date="2024-02-01"))
+        self.dm.add_expense(Expense(id="E2", date="2024-01-01", name="Feed", description="", amount=50))
+        self.dm.add_cow_event(CowEvent(id="C1", date="2024-01-01", cow_id="Bessie", event_type="Vaccination",
+                                       value="FMD", next_due_date="2024-03-01"))
+        index = self.dm.get_due_date_index()
+        self.assertEqual([r.id for _, r in index.due_on_or_before("2024-02-01")], ["E1"])
+        self.assertEqual([r.id for _, r in index.due_between("2024-02-02", "2024-03-01")], ["C1"])
+
+        # Index follows writes
+        self.dm.update_cow_event(CowEvent(id="C1", date="2024-01-01", cow_id="Bessie", event_type="Vaccination",
+                                          value="FMD", next_due_date="2024-01-15"))
+        self.assertEqual([r.id for _, r in index.due_on_or_before("2024-02-01")], ["C1", "E1"])
+        self.dm.delete_expense("E1")
+        self.assertEqual([r.id for _, r in index.due_on_or_before("2024-12-31")], ["C1"])
+
+    def test_scheduler_rolls_forward(self):
+        self.dm.add_expense(Expense(id="E1", date="2024-01-31", name="Rent", description="Shed", amount=1000,
+                                    is_recurring=True, recurrence_type="Monthly", next_due_date="2024-01-31"))
+        self.dm.add_expense(Expense(id="E2", date="2024-01-01", name="Vet", description="", amount=300,
+                                    is_recurring=True, recurrence_type="Custom", next_due_date="2024-01-10"))
+        posted = post_due_recurring_expenses(self.dm, today=date(2024, 3, 5))
+        self.assertEqual([e.date for e in posted], ["2024-01-31", "2024-02-29"])
+        self.assertTrue(all(not e.is_recurring and e.amount == 1000 for e in posted))
+
+        template = next(e for e in self.dm.get_expenses() if e.id == "E1")
+        self.assertEqual(template.next_due_date, "2024-03-31")
+        # Custom schedules stay due; nothing more to post
+        due = self.dm.get_due_date_index().due_on_or_before("2024-03-05")
+        self.assertEqual([r.id for _, r in due], ["E2"])
+        self.assertEqual(post_due_recurring_expenses(self.dm, today=date(2024, 3, 5)), [])
+
+if __name__ == '__main__':
+    unittest.main()
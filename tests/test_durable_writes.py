@@ -0,0 +1,80 @@
+import unittest
+import json
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.due_dates import post_due_recurring_expenses
+from src.models import Expense
+from datetime import date
+
+def expense(eid, amount=10.0, **kw):
+    return Expense(id=eid, date="2024-01-05", name="Feed", description="", amount=amount, **kw)
+
+class TestDurableWrites(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_durable"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.path = self.dm.files["expenses"]
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def count_synced_writes(self):
+        written = []
+        dump = self.dm._dump_synced
+        self.dm._dump_synced = lambda path, data, indent=None: (written.append(os.path.basename(path)), dump(path, data, indent))
+        return written
+
+    def test_write_keeps_previous_version(self):
+        self.dm.add_expense(expense("A"))
+        self.dm.add_expense(expense("B"))
+        with open(self.path + ".bak") as f:
+            self.assertEqual([d["id"] for d in json.load(f)], ["A"])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_torn_file_recovers_last_good_snapshot(self):
+        self.dm.add_expense(expense("A"))
+        self.dm.add_expense(expense("B"))
+        with open(self.path, "w") as f:
+            f.write('[{"id": "A", "da')
+        self.assertEqual([e.id for e in self.dm.get_expenses()], ["A"])
+        with open(self.path) as f:
+            self.assertEqual([d["id"] for d in json.load(f)], ["A"])
+
+    def test_unreadable_without_snapshot_raises(self):
+        with open(self.path, "w") as f:
+            f.write("[")
+        with self.assertRaises(ValueError):
+            self.dm.get_expenses()
+
+    def test_interrupted_write_is_discarded_on_open(self):
+        self.dm.add_expense(expense("A"))
+        with open(self.path + ".tmp", "w") as f:
+            f.write('[{"id": "half')
+        dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.assertEqual([e.id for e in dm.get_expenses()], ["A"])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_group_commit_writes_once(self):
+        written = self.count_synced_writes()
+        with self.dm.group_commit():
+            for i in range(5):
+                self.dm.add_expense(expense(f"X{i}"))
+            self.dm.delete_expense("X0")
+            self.assertEqual(len(self.dm.get_expenses()), 4)
+            self.assertEqual(written, [])
+        self.assertEqual(written, ["expenses.json.tmp"])
+        self.assertEqual([e.id for e in LocalJSONBackend(data_dir=self.test_dir).get_expenses()], ["X1", "X2", "X3", "X4"])
+
+    def test_posting_due_expenses_is_one_commit(self):
+        self.dm.add_expense(expense("R", is_recurring=True, recurrence_type="Monthly", next_due_date="2024-01-05"))
+        written = self.count_synced_writes()
+        posted = post_due_recurring_expenses(self.dm, date(2024, 4, 10))
+        self.assertEqual(len(posted), 4)
+        self.assertEqual(written, ["expenses.json.tmp"])
+        template = next(e for e in self.dm.get_expenses() if e.id == "R")
+        self.assertEqual(template.next_due_date, "2024-05-05")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import json
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.instrumentation import Profiler, instrument, uninstrument
+from src.models import MilkSale
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_instrumentation"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_times_public_and_internal_calls(self):
+        profiler = Profiler()
+        instrument(self.dm, profiler)
+        self.dm.add_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=2, rate=50, total_amount=100))
+        self.dm.get_statement_index()
+        with profiler.span("render", "Milk Sales"):
+            self.dm.get_milk_sales()
+
+        backend = profiler.stats["backend"]
+        self.assertEqual(backend["add_milk_sale"].count, 1)
+        # One read from the index build inside the backend, one from the caller
+        self.assertEqual(backend["get_milk_sales"].count, 2)
+        self.assertEqual(profiler.stats["io"]["_write_json"].count, 1)
+        self.assertIn("Milk Sales", profiler.last_run)
+        trace = json.loads(profiler.trace_json())["traceEvents"]
+        self.assertEqual({e["cat"] for e in trace}, {"backend", "io", "render"})
+
+        uninstrument(self.dm, profiler)
+        self.dm.get_milk_sales()
+        self.assertEqual(backend["get_milk_sales"].count, 2)
+        self.assertFalse(any(callable(v) for v in self.dm.__dict__.values()))
+
+    def test_context_managers_are_not_timed(self):
+        profiler = Profiler()
+        instrument(self.dm, profiler)
+        with self.dm.group_commit():
+            self.dm.add_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=2, rate=50, total_amount=100))
+        self.assertNotIn("group_commit", profiler.stats["backend"])
+        # The batched write is still timed where it happens
+        self.assertIn("_write_many", profiler.stats["io"])
+
+    def test_trace_is_bounded(self):
+        profiler = Profiler(max_events=3)
+        for i in range(5):
+            profiler.record("backend", "get_buyers", 0.0, 0.001)
+        self.assertEqual(len(profiler.events), 3)
+        self.assertEqual(profiler.stats["backend"]["get_buyers"].count, 5)
+
+if __name__ == '__main__':
+    unittest.main()
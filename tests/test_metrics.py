@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import urllib.request
+from collections import Counter
+from src.data_manager import LocalJSONBackend
+from src.instrumentation import Profiler, instrument, uninstrument, span
+from src.metrics import MetricsExporter, collection_of, serve, write_textfile
+from src.models import MilkSale
+
+class FakeSheets:
+    def __init__(self):
+        self.cache_hits = Counter(milk_sales=3)
+        self.cache_misses = Counter(milk_sales=1, buyers=2)
+        self.api_calls = Counter(get_all_values=3, append_row=1)
+        self.api_errors = Counter(append_row=1)
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_metrics"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.exporter = MetricsExporter()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_collection_labels(self):
+        self.assertEqual(collection_of("get_milk_sales"), "milk_sales")
+        self.assertEqual(collection_of("delete_cow_event"), "cow_events")
+        self.assertEqual(collection_of("update_buyer"), "buyers")
+        self.assertEqual(collection_of("add_milk_sales"), "milk_sales")
+        self.assertEqual(collection_of("_read_json", ("payments",)), "payments")
+        self.assertEqual(collection_of("get_balance_ledger"), "")
+
+    def test_backend_calls_and_renders(self):
+        self.exporter.track(self.dm)
+        self.exporter.track(self.dm)
+        self.dm.add_milk_sale(MilkSale(id="S1", date="2023-10-01", buyer_name="John", quantity=2, rate=50, total_amount=100))
+        self.dm.get_milk_sales()
+        with self.assertRaises(AttributeError):
+            self.dm.update_milk_sale(None)
+        with span([self.exporter], "render", "Milk Sales"):
+            pass
+        text = self.exporter.render()
+        self.assertIn('dairy_backend_call_seconds_count{method="get_milk_sales",collection="milk_sales"} 1', text)
+        self.assertIn('dairy_backend_call_seconds_bucket{method="add_milk_sale",collection="milk_sales",le="+Inf"} 1', text)
+        self.assertIn('dairy_backend_call_errors_total{method="update_milk_sale",collection="milk_sales"} 1', text)
+        self.assertIn('dairy_records{collection="milk_sales"} 1', text)
+        self.assertIn('dairy_tab_rerun_seconds_count{tab="Milk Sales"} 1', text)
+
+        # The profiler can come and go without detaching the exporter
+        profiler = Profiler()
+        instrument(self.dm, profiler)
+        uninstrument(self.dm, profiler)
+        self.dm.get_milk_sales()
+        self.assertIn('dairy_backend_call_seconds_count{method="get_milk_sales",collection="milk_sales"} 2', self.exporter.render())
+
+    def test_sheets_counters_and_exposition(self):
+        sheets = FakeSheets()
+        self.exporter._backends.add(sheets)
+        text = self.exporter.render()
+        self.assertIn('dairy_sheets_api_calls_total{operation="get_all_values"} 3', text)
+        self.assertIn('dairy_sheets_api_errors_total{operation="append_row"} 1', text)
+        self.assertIn('dairy_cache_requests_total{collection="milk_sales",result="hit"} 3', text)
+        self.assertIn('dairy_cache_hit_ratio{collection="milk_sales"} 0.75', text)
+        self.assertIn('dairy_cache_hit_ratio{collection="buyers"} 0.0', text)
+
+        server = serve(self.exporter, 0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+                self.assertEqual(response.read().decode(), text)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        path = os.path.join(self.test_dir, "dairy.prom")
+        write_textfile(self.exporter, path)
+        with open(path) as f:
+            self.assertEqual(f.read(), text)
+
+if __name__ == '__main__':
+    unittest.main()
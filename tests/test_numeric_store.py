@@ -0,0 +1,139 @@
+import unittest
+import json
+from contextlib import contextmanager
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.file_lock import DirectoryLock
+from src.models import MilkSale, DailyYield
+from src.numeric_store import SalesHistory, YieldHistory, DELETED
+from src.partitions import TOTAL_FIELDS, month_totals
+
+def sale(sid, day, qty=10.0, buyer="John"):
+    return MilkSale(id=sid, date=day, buyer_name=buyer, quantity=qty, rate=50.0, total_amount=qty * 50.0)
+
+class TestNumericStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_numeric"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.dm.add_milk_sales([sale("S1", "2024-01-05"), sale("S2", "2024-01-20", 5.0, "Mary"), sale("S3", "2024-02-02"),
+                                sale("S4", "not-a-date", 2.0), sale("S5", "2023-12-31", 1.5, "Mary")])
+        self.dm.add_daily_yield(DailyYield(id="Y1", date="2024-02-01", quantity=30.0, notes=""))
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def expected(self, dm, collection="milk_sales"):
+        return month_totals(getattr(dm, f"get_{collection}")(), TOTAL_FIELDS[collection])
+
+    def bin_path(self, collection="milk_sales"):
+        return os.path.join(self.test_dir, "numeric", f"{collection}.bin")
+
+    def test_month_totals_match_records(self):
+        self.assertEqual(self.dm.get_month_totals("milk_sales"), self.expected(self.dm))
+        self.assertEqual(self.dm.get_month_totals("daily_yields"), self.expected(self.dm, "daily_yields"))
+        history = self.dm.get_numeric_history("milk_sales")
+        self.assertEqual(history.buyers, ["John", "Mary"])
+        self.assertEqual(os.path.getsize(self.bin_path()), 5 * history.dtype.itemsize)
+        # Without a data directory the same rows are kept in memory
+        in_memory = YieldHistory.build(self.dm.get_daily_yields)
+        self.assertIsNone(in_memory.path)
+        self.assertEqual(in_memory.month_totals(), self.expected(self.dm, "daily_yields"))
+
+    def test_changes_patch_the_file_in_place(self):
+        self.dm.get_month_totals("milk_sales")
+        inode = os.stat(self.bin_path()).st_ino
+        self.dm.add_milk_sale(sale("S6", "2024-02-10", 3.0, "Ann"))
+        self.dm.update_milk_sale(sale("S1", "2024-02-05", 4.0))
+        self.dm.delete_milk_sale("S2")
+        self.assertEqual(self.dm.get_month_totals("milk_sales"), self.expected(self.dm))
+        self.assertEqual(os.stat(self.bin_path()).st_ino, inode)
+        rows = self.dm.get_numeric_history("milk_sales").read(lambda r: r.copy())
+        self.assertEqual((len(rows), int((rows["date"] == DELETED).sum())), (6, 1))
+
+    def test_reopens_without_reading_the_store(self):
+        self.dm.add_milk_sale(sale("S6", "2024-02-10"))
+        totals = self.dm.get_month_totals("milk_sales")
+        fresh = LocalJSONBackend(data_dir=self.test_dir)
+        built = []
+        fresh._read_json = lambda key: built.append(key) or LocalJSONBackend._read_json(fresh, key)
+        self.assertEqual(fresh.get_month_totals("milk_sales"), totals)
+        self.assertEqual(built, [])
+
+    def test_other_writers_and_hand_edits_are_picked_up(self):
+        self.dm.get_month_totals("milk_sales")
+        other = LocalJSONBackend(data_dir=self.test_dir)
+        other.get_month_totals("milk_sales")
+        other.add_milk_sale(sale("S6", "2024-03-01"))
+        self.dm.delete_milk_sale("S3")
+        self.assertEqual(self.dm.get_month_totals("milk_sales"), self.expected(self.dm))
+        self.assertEqual(other.get_month_totals("milk_sales"), self.expected(self.dm))
+
+        with open(os.path.join(self.test_dir, "milk_sales.json"), 'w') as f:
+            json.dump([sale("H1", "2022-05-05").__dict__], f)
+        fresh = LocalJSONBackend(data_dir=self.test_dir)
+        self.assertEqual(fresh.get_month_totals("milk_sales"), {"2022-05": {"count": 1, "quantity": 10.0, "total_amount": 500.0}})
+
+    def test_stale_instance_reloads_instead_of_appending(self):
+        records = [sale("A", "2024-01-01")]
+        path = os.path.join(self.test_dir, "shared", "milk_sales.bin")
+        source = lambda: ("store", len(records))
+        first = SalesHistory.build(lambda: records, path, source=source)
+        second = SalesHistory.build(lambda: records, path, source=source)  # opens the file the first one wrote
+        records.append(sale("B", "2024-01-02"))
+        first.apply("milk_sales", new=records[-1])
+        first.month_totals()
+        records.append(sale("C", "2024-01-03"))
+        second.apply("milk_sales", new=records[-1])
+        self.assertEqual(second.month_totals()["2024-01"]["count"], 3)
+        self.assertEqual(first.month_totals()["2024-01"]["count"], 3)
+
+    def test_records_without_ids_are_patched_one_at_a_time(self):
+        records = [sale(None, "2024-01-01", 1.0), sale(None, "2024-01-02", 2.0), sale(None, "2024-01-03", 4.0)]
+        history = SalesHistory.build(lambda: records)
+        history.apply("milk_sales", old=records[0], new=sale(None, "2024-01-01", 8.0))
+        history.apply("milk_sales", old=records[1])
+        self.assertEqual(history.month_totals()["2024-01"], {"count": 2, "quantity": 12.0, "total_amount": 600.0})
+
+    def test_reads_share_the_lock_until_there_is_something_to_write(self):
+        taken = []
+        class RecordingLock(DirectoryLock):
+            @contextmanager
+            def shared(self):
+                taken.append("shared")
+                with super().shared():
+                    yield
+            @contextmanager
+            def exclusive(self):
+                taken.append("exclusive")
+                with super().exclusive():
+                    yield
+        lock = RecordingLock(os.path.join(self.test_dir, "recording.lock"))
+        records = [sale("A", "2024-01-01")]
+        history = SalesHistory.build(lambda: records, os.path.join(self.test_dir, "shared", "milk_sales.bin"),
+                                     lock=lock, source=lambda: ("store", len(records)))
+        del taken[:]
+        history.month_totals()
+        history.month_totals()
+        self.assertEqual(taken, ["shared", "shared"])
+        records.append(sale("B", "2024-01-02"))
+        history.apply("milk_sales", new=records[-1])
+        del taken[:]
+        self.assertEqual(history.month_totals()["2024-01"]["count"], 2)  # writes the added row first
+        history.month_totals()
+        self.assertEqual(taken, ["shared", "exclusive", "shared"])
+
+    def test_group_commit_is_only_trusted_once_written(self):
+        self.dm.get_month_totals("milk_sales")
+        with self.dm.group_commit():
+            self.dm.add_milk_sale(sale("S6", "2024-02-10"))
+            self.assertEqual(self.dm.get_month_totals("milk_sales")["2024-02"]["count"], 2)
+            with open(self.bin_path() + ".json") as f:
+                self.assertIsNone(json.load(f)["source"])
+        self.assertEqual(self.dm.get_month_totals("milk_sales"), self.expected(self.dm))
+        fresh = LocalJSONBackend(data_dir=self.test_dir)
+        self.assertEqual(fresh.get_month_totals("milk_sales"), self.expected(self.dm))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import json
+import os
+import shutil
+from src import reports_engine
+from src.data_manager import LocalJSONBackend
+from src.partitioned_backend import PartitionedJSONBackend
+from src.models import MilkSale, DailyYield, Expense
+
+def sale(sid, day, qty=10.0, buyer="John"):
+    return MilkSale(id=sid, date=day, buyer_name=buyer, quantity=qty, rate=50.0, total_amount=qty * 50.0)
+
+class TestPartitionedBackend(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_partitioned"
+        flat = LocalJSONBackend(data_dir=self.test_dir)
+        flat.add_milk_sales([sale("S1", "2024-01-05"), sale("S2", "2024-01-20", 5.0, "Mary"), sale("S3", "2024-02-02"),
+                             sale("S4", "2024-03-15", 2.0)])
+        flat.add_daily_yield(DailyYield(id="Y1", date="2024-02-01", quantity=30.0, notes=""))
+        flat.add_expense(Expense(id="X1", date="2024-02-10", name="Feed", description="", amount=100.0))
+        self.dm = PartitionedJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def manifest(self):
+        with open(os.path.join(self.test_dir, "milk_sales", "manifest.json")) as f:
+            return json.load(f)
+
+    def test_migrates_flat_files_into_months(self):
+        self.assertEqual(sorted(s.id for s in self.dm.get_milk_sales()), ["S1", "S2", "S3", "S4"])
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "milk_sales.json.migrated")))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "milk_sales.json")))
+        self.assertEqual([(e["month"], e["min_date"], e["max_date"], e["count"]) for e in self.manifest()],
+                         [("2024-01", "2024-01-05", "2024-01-20", 2), ("2024-02", "2024-02-02", "2024-02-02", 1),
+                          ("2024-03", "2024-03-15", "2024-03-15", 1)])
+        self.assertEqual([e.id for e in self.dm.get_expenses()], ["X1"])
+
+    def test_interrupted_migration_is_not_duplicated(self):
+        # The partitions committed but the flat file was never moved aside
+        shutil.copy(os.path.join(self.test_dir, "milk_sales.json.migrated"), os.path.join(self.test_dir, "milk_sales.json"))
+        dm = PartitionedJSONBackend(data_dir=self.test_dir)
+        self.assertEqual(len(dm.get_milk_sales()), 4)
+
+    def test_range_reads_only_overlapping_months(self):
+        opened = []
+        load = self.dm._load
+        self.dm._load = lambda key: (opened.append(key), load(key))[1]
+        sales = self.dm.get_range("milk_sales", "2024-01-10", "2024-02-28")
+        self.assertEqual(sorted(s.id for s in sales), ["S2", "S3"])
+        self.assertEqual(sorted(opened), ["milk_sales/2024-01", "milk_sales/2024-02", "milk_sales/manifest"])
+
+    def test_write_rewrites_one_month_and_the_manifest(self):
+        written = []
+        dump = self.dm._dump_synced
+        self.dm._dump_synced = lambda path, data, indent=None: (written.append(os.path.relpath(path, self.test_dir)), dump(path, data, indent))
+        self.dm.add_milk_sale(sale("S5", "2024-02-20"))
+        self.assertEqual(sorted(written), ["commit.journal.tmp", "milk_sales/2024-02.json.tmp", "milk_sales/manifest.json.tmp"])
+        self.assertEqual(self.dm.get_month_totals("milk_sales")["2024-02"], {"count": 2, "quantity": 20.0, "total_amount": 1000.0})
+
+    def test_update_moves_between_months_and_delete(self):
+        ledger = self.dm.get_balance_ledger()
+        self.dm.update_milk_sale(sale("S1", "2024-03-01", 4.0))
+        fresh = PartitionedJSONBackend(data_dir=self.test_dir)
+        self.assertEqual([s.id for s in fresh.get_range("milk_sales", "2024-03-01", "2024-03-31")], ["S4", "S1"])
+        self.assertEqual([e["month"] for e in self.manifest()], ["2024-01", "2024-02", "2024-03"])
+        fresh.delete_milk_sale("S2")
+        self.assertEqual([e["month"] for e in self.manifest()], ["2024-02", "2024-03"])
+        # This instance notices the other one's write and rebuilds its indexes
+        self.assertNotIn("S2", {s.id for s in self.dm.get_milk_sales()})
+        self.assertIsNot(self.dm.get_balance_ledger(), ledger)
+        self.assertAlmostEqual(self.dm.get_balance_ledger().balance("John"), (4.0 + 10.0 + 2.0) * 50.0)
+
+    def test_emptied_months_are_removed(self):
+        march = os.path.join(self.test_dir, "milk_sales", "2024-03.json")
+        self.dm.update_milk_sale(sale("S4", "2024-02-20", 2.0))
+        self.assertFalse(os.path.exists(march) or os.path.exists(march + ".bak"))
+        self.assertNotIn("milk_sales/2024-03", self.dm.files)
+        self.assertEqual(sorted(s.id for s in self.dm.get_range("milk_sales", "2024-02-01", "2024-02-29")), ["S3", "S4"])
+
+        # Emptied and refilled in one group commit: the month stays
+        with self.dm.group_commit():
+            self.dm.delete_milk_sale("S3")
+            self.dm.delete_milk_sale("S4")
+            self.dm.add_milk_sale(sale("S5", "2024-02-21"))
+        self.assertEqual([s.id for s in self.dm.get_range("milk_sales", "2024-02-01", "2024-02-29")], ["S5"])
+
+        # A month file the manifest no longer lists, as a crash before the removal would leave
+        with open(march, 'w') as f:
+            json.dump([sale("S9", "2024-03-01").__dict__], f)
+        fresh = PartitionedJSONBackend(data_dir=self.test_dir)
+        self.assertFalse(os.path.exists(march))
+        self.assertEqual(sorted(s.id for s in fresh.get_milk_sales()), ["S1", "S2", "S5"])
+
+    def test_monthly_summary_from_totals_matches_full_read(self):
+        flat = reports_engine.monthly_summary(reports_engine.sales_frame(self.dm.get_milk_sales()),
+                                              reports_engine.expenses_frame(self.dm.get_expenses()),
+                                              reports_engine.yields_frame(self.dm.get_daily_yields()))
+        from_totals = reports_engine.monthly_summary_from_totals(self.dm.get_month_totals("milk_sales"),
+                                                                 self.dm.get_month_totals("daily_yields"),
+                                                                 reports_engine.expenses_frame(self.dm.get_expenses()))
+        self.assertEqual(flat.to_dict("records"), from_totals.to_dict("records"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from src import reports_engine
+from src.models import Expense, MilkSale, DailyYield, CowEvent
+
+class TestReportsEngine(unittest.TestCase):
+    def setUp(self):
+        self.sales = reports_engine.sales_frame([
+            MilkSale(date="2023-10-01", buyer_name="John", quantity=10, rate=50, total_amount=500),
+            MilkSale(date="2023-10-01", buyer_name="Mary", quantity=5, rate=40, total_amount=200),
+            MilkSale(date="2023-11-02", buyer_name="John", quantity=2, rate=50, total_amount=100),
+        ])
+        self.expenses = reports_engine.expenses_frame([
+            Expense(date="2023-10-02", name="Feed", description="", amount=150),
+            Expense(date="2023-11-02", name="Vet", description="", amount=80, cow_id="Bessie"),
+            Expense(date="not-a-date", name="Bad", description="", amount=999),
+        ])
+        self.yields = reports_engine.yields_frame([
+            DailyYield(date="2023-10-01", quantity=20, notes=""),
+        ])
+        self.events = reports_engine.events_frame([
+            CowEvent(date="2023-11-01", cow_id="Bessie", event_type="Yield", value="12.5L"),
+            CowEvent(date="2023-11-01", cow_id="Daisy", event_type="Yield", value="n/a"),
+            CowEvent(date="2023-11-01", cow_id="Daisy", event_type="Vaccination", value="FMD"),
+        ])
+
+    def test_daily_summary(self):
+        df = reports_engine.daily_summary(self.sales, self.expenses, self.yields, "2023-10-01", "2023-10-31")
+        self.assertEqual(list(df.columns), reports_engine.DAILY_COLUMNS)
+        self.assertEqual(list(df["Date"]), ["2023-10-01", "2023-10-02"])
+        first, second = df.to_dict("records")
+        self.assertEqual((first["Production (L)"], first["Milk (L)"], first["Milk Revenue"]), (20, 15, 700))
+        self.assertEqual((second["Expenses"], second["Net Profit"]), (150, -150))
+
+    def test_monthly_summary_skips_bad_dates(self):
+        df = reports_engine.monthly_summary(self.sales, self.expenses, self.yields)
+        self.assertEqual(list(df["Month"]), ["November 2023", "October 2023"])
+        self.assertEqual(list(df["Milk Revenue"]), [100, 700])
+        self.assertEqual(list(df["Expenses"]), [80, 150])
+
+    def test_buyer_and_cow_summaries(self):
+        buyers = reports_engine.buyer_summary(self.sales, "2023-10-01", "2023-10-31")
+        self.assertEqual(buyers.set_index("Buyer")["Total Revenue"].to_dict(), {"John": 500, "Mary": 200})
+
+        cows = reports_engine.cow_summary(self.events, self.expenses, "2023-11-01", "2023-11-30")
+        self.assertEqual(cows.to_dict("records"), [{"Cow ID": "Bessie", "Yield (L)": 12.5, "Direct Expenses": 80}])
+
+    def test_empty_inputs(self):
+        empty_sales = reports_engine.sales_frame([])
+        empty_expenses = reports_engine.expenses_frame([])
+        empty_yields = reports_engine.yields_frame([])
+        self.assertTrue(reports_engine.daily_summary(empty_sales, empty_expenses, empty_yields).empty)
+        self.assertTrue(reports_engine.monthly_summary(empty_sales, empty_expenses, empty_yields).empty)
+        self.assertTrue(reports_engine.cow_summary(reports_engine.events_frame([]), empty_expenses).empty)
+
+if __name__ == '__main__':
+    unittest.main()
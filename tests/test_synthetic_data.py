@@ -0,0 +1,36 @@
+import unittest
+import os
+import shutil
+from benchmarks.synthetic_data import generate, write_local, COLLECTIONS
+from benchmarks.bench_scale import best_of, operation_cases
+
+class TestSyntheticData(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_synthetic"
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_seeded_and_complete(self):
+        data = generate(years=1, buyers=5, cows=3, seed=7)
+        self.assertEqual(data, generate(years=1, buyers=5, cows=3, seed=7))
+        self.assertNotEqual(data["milk_sales"], generate(years=1, buyers=5, cows=3, seed=8)["milk_sales"])
+        self.assertEqual(sorted(data), sorted(COLLECTIONS))
+        self.assertTrue(all(data[name] for name in COLLECTIONS))
+        self.assertEqual(len(data["daily_yields"]), 365)
+        self.assertTrue(any(e.is_recurring and e.next_due_date for e in data["expenses"]))
+        # Buyers pay most of what they owe
+        billed = sum(s.total_amount for s in data["milk_sales"])
+        paid = sum(p.amount for p in data["payments"] if p.entry_type == "Payment")
+        self.assertTrue(0.7 * billed < paid < billed)
+
+    def test_benchmark_cases_leave_data_unchanged(self):
+        dm = write_local(generate(years=1, buyers=3, cows=2), self.test_dir)
+        before = {name: getattr(dm, f"get_{name}")() for name in COLLECTIONS}
+        for fn, setup, teardown in operation_cases(dm, "2020-12-30").values():
+            best_of(fn, 2, setup, teardown)
+        self.assertEqual({name: getattr(dm, f"get_{name}")() for name in COLLECTIONS}, before)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.models import Payment
+from src.ui_components import EnhancedDataTable, StyleRegistry
+
+def payment(pid, day):
+    return Payment(id=pid, date=day, buyer_name="John", entry_type="Payment", amount=10, notes="")
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        # Two rows share a date so the id breaks the tie
+        self.items = [payment(f"P{i}", f"2023-10-{i // 2 + 1:02d}") for i in range(7)]
+
+    def test_pages_walk_newest_first_without_gaps(self):
+        seen, cursor = [], None
+        while True:
+            rows, start_index, has_more = EnhancedDataTable.keyset_page(self.items, cursor, page_size=3)
+            self.assertEqual(start_index, len(seen))
+            seen.extend(r.id for r in rows)
+            if not has_more:
+                break
+            cursor = EnhancedDataTable.history_key(rows[-1])
+        self.assertEqual(seen, ["P6", "P5", "P4", "P3", "P2", "P1", "P0"])
+
+    def test_cursor_survives_deleted_row(self):
+        rows, _, _ = EnhancedDataTable.keyset_page(self.items, None, page_size=3)
+        cursor = EnhancedDataTable.history_key(rows[-1])
+        remaining = [p for p in self.items if p.id != rows[-1].id]
+        next_rows, start_index, has_more = EnhancedDataTable.keyset_page(remaining, cursor, page_size=3)
+        self.assertEqual([r.id for r in next_rows], ["P3", "P2", "P1"])
+        self.assertEqual(start_index, 2)
+        self.assertTrue(has_more)
+
+    def test_empty_list(self):
+        self.assertEqual(EnhancedDataTable.keyset_page([], None), ([], 0, False))
+
+class TestStyleRegistry(unittest.TestCase):
+    def test_block_registered_twice_is_emitted_once(self):
+        StyleRegistry.register("test-block", ".test-block {\n    color: red; /* note */\n}")
+        StyleRegistry.register("test-block", ".test-block { color: red; }")
+        sheet = StyleRegistry.stylesheet()
+        self.assertEqual(sheet.count(".test-block{color:red;}"), 1)
+        self.assertEqual(sheet.count("<style>"), 1)
+        del StyleRegistry._styles["test-block"]
+
+if __name__ == '__main__':
+    unittest.main()
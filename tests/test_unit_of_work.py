@@ -0,0 +1,71 @@
+import unittest
+import json
+import os
+import shutil
+from src.data_manager import LocalJSONBackend
+from src.models import CowEvent, Expense
+
+def event(eid, cost=0.0):
+    return CowEvent(id=eid, date="2023-10-01", cow_id="Gauri", event_type="Vaccination", value="FMD", cost=cost, next_due_date=None, notes="")
+
+def expense(eid, amount):
+    return Expense(id=eid, date="2023-10-01", name="Cow Expense", description="", amount=amount, is_recurring=False, cow_id="Gauri")
+
+class TestUnitOfWork(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_data_uow"
+        self.dm = LocalJSONBackend(data_dir=self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_commits_across_collections_in_one_write(self):
+        self.dm.add_expense(expense("X0", 10))
+        due = self.dm.get_due_date_index()
+        commits = []
+        write_many = self.dm._write_many
+        self.dm._write_many = lambda updates: (commits.append(sorted(updates)), write_many(updates))
+        with self.dm.unit_of_work() as uow:
+            uow.add("cow_events", event("E1", cost=500))
+            uow.add("expenses", expense("X1", 500))
+            uow.update("expenses", expense("X0", 20))
+            uow.delete("cow_events", "missing")
+        self.assertEqual(commits, [["cow_events", "expenses"]])
+        self.assertEqual([e.id for e in self.dm.get_cow_events()], ["E1"])
+        self.assertEqual({e.id: e.amount for e in self.dm.get_expenses()}, {"X0": 20, "X1": 500})
+        self.assertIs(self.dm.get_due_date_index(), due)
+        self.assertEqual(os.listdir(self.test_dir).count(LocalJSONBackend.JOURNAL), 0)
+
+    def test_nothing_written_when_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            with self.dm.unit_of_work() as uow:
+                uow.add("cow_events", event("E1"))
+                raise RuntimeError("form validation failed")
+        self.assertEqual(self.dm.get_cow_events(), [])
+        with self.assertRaises(ValueError):
+            with self.dm.unit_of_work() as uow:
+                uow.add("buyers", None)
+
+    def test_recovery_rolls_committed_journal_forward(self):
+        files = self.dm.files
+        # Crash after the journal was written: both staged files are installed on restart
+        with open(files["cow_events"] + ".tmp", "w") as f:
+            json.dump([event("E1").__dict__], f)
+        with open(files["expenses"] + ".tmp", "w") as f:
+            json.dump([expense("X1", 500).__dict__], f)
+        with open(os.path.join(self.test_dir, LocalJSONBackend.JOURNAL), "w") as f:
+            json.dump(["cow_events", "expenses"], f)
+        dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.assertEqual(len(dm.get_cow_events()), 1)
+        self.assertEqual(len(dm.get_expenses()), 1)
+
+        # Crash before the journal: staged files are discarded
+        with open(files["cow_events"] + ".tmp", "w") as f:
+            json.dump([], f)
+        dm = LocalJSONBackend(data_dir=self.test_dir)
+        self.assertEqual(len(dm.get_cow_events()), 1)
+        self.assertFalse(os.path.exists(files["cow_events"] + ".tmp"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,5 +27,11 @@ class TestBuyerDelete(unittest.TestCase):
         # Verify deleted
         self.assertEqual(len(self.dm.get_buyers()), 0)
 
+    def test_delete_several_buyers(self):
+        for name in ("A", "B", "C"):
+            self.dm.add_buyer(Buyer(name=name, default_rate=50.0))
+        self.dm.delete_buyers(["A", "C"])
+        self.assertEqual([b.name for b in self.dm.get_buyers()], ["B"])
+
 if __name__ == '__main__':
     unittest.main()